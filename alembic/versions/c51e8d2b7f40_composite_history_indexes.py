@@ -0,0 +1,50 @@
+"""Composite indexes for recent-incident and past-plan lookups
+
+Revision ID: c51e8d2b7f40
+Revises: a39f60d0d637
+Create Date: 2026-10-17
+
+get_recent_similar is answered as a UNION of two index range scans, one per
+(source, created_at) and one per (severity, created_at), each covering the
+incident id so only the final top-N rows touch the heap. The plan lookup
+gets an (incident_id, status, created_at) index. The single-column source
+index is superseded by the composite one and dropped.
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c51e8d2b7f40"
+down_revision: Union[str, None] = "a39f60d0d637"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_incidents_source_created_at",
+        "incidents",
+        ["source", sa.text("created_at DESC")],
+        postgresql_include=["id"],
+    )
+    op.create_index(
+        "ix_incidents_severity_created_at",
+        "incidents",
+        ["severity", sa.text("created_at DESC")],
+        postgresql_include=["id"],
+    )
+    op.create_index(
+        "ix_remediation_plans_incident_status_created_at",
+        "remediation_plans",
+        ["incident_id", "status", sa.text("created_at DESC")],
+    )
+    op.drop_index("ix_incidents_source", table_name="incidents")
+
+
+def downgrade() -> None:
+    op.create_index("ix_incidents_source", "incidents", ["source"])
+    op.drop_index("ix_remediation_plans_incident_status_created_at", table_name="remediation_plans")
+    op.drop_index("ix_incidents_severity_created_at", table_name="incidents")
+    op.drop_index("ix_incidents_source_created_at", table_name="incidents")
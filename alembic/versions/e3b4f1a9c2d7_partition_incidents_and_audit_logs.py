@@ -0,0 +1,184 @@
+"""Range-partition incidents and audit_logs by time
+
+Revision ID: e3b4f1a9c2d7
+Revises: c51e8d2b7f40
+Create Date: 2026-10-17
+
+incidents (by created_at) and audit_logs (by timestamp) become native range
+partitioned tables with monthly partitions plus a DEFAULT partition.
+Partitions from the oldest existing row up to three months ahead are created
+here; PartitionMaintainer keeps creating and expiring them afterwards
+(app/infrastructure/database/partitions.py). The layout is pinned in this
+revision rather than read from the runtime settings, so the migration does
+the same thing wherever and whenever it runs; the maintainer matches
+partitions by their bounds, so a later PARTITION_INTERVAL of "day" only
+applies to ranges not covered yet.
+
+PostgreSQL requires every unique constraint on a partitioned table to
+contain the partition key, so the primary keys become (id, created_at) and
+(id, timestamp). Without a unique constraint on incidents.id alone,
+remediation_plans.incident_id can no longer be a foreign key; it is dropped,
+and partition expiry deletes the plans of dropped incidents instead.
+
+Existing rows are copied into the new tables inside the migration's
+transaction, so it holds an exclusive lock on both tables while it runs.
+"""
+from datetime import datetime, timezone
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e3b4f1a9c2d7"
+down_revision: Union[str, None] = "c51e8d2b7f40"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Pinned layout: monthly partitions named <table>_pYYYYMM, three months ahead.
+_PRECREATE_MONTHS = 3
+
+_INCIDENT_COLUMNS = (
+    "id, alert_id, status, source, severity, message, metadata_json, "
+    "enriched_context, rca_hypothesis, created_at, closed_at"
+)
+_AUDIT_COLUMNS = 'id, "timestamp", component, event, details'
+
+_INCIDENTS_DDL = """
+CREATE TABLE incidents (
+    id VARCHAR(36) NOT NULL,
+    alert_id VARCHAR(36) NOT NULL,
+    status VARCHAR DEFAULT 'OPEN',
+    source VARCHAR NOT NULL,
+    severity alertseverity NOT NULL,
+    message VARCHAR NOT NULL,
+    metadata_json JSONB DEFAULT '{{}}',
+    enriched_context JSONB DEFAULT '{{}}',
+    rca_hypothesis VARCHAR,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+    closed_at TIMESTAMP WITH TIME ZONE,
+    CONSTRAINT incidents_pkey PRIMARY KEY (id, created_at)
+) {partitioning}
+"""
+
+_AUDIT_LOGS_DDL = """
+CREATE TABLE audit_logs (
+    id VARCHAR(36) NOT NULL,
+    "timestamp" TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+    component VARCHAR NOT NULL,
+    event VARCHAR NOT NULL,
+    details JSONB NOT NULL,
+    CONSTRAINT audit_logs_pkey PRIMARY KEY ({key})
+) {partitioning}
+"""
+
+
+def _create_incident_indexes() -> None:
+    op.create_index("ix_incidents_alert_id", "incidents", ["alert_id"])
+    op.create_index("ix_incidents_status", "incidents", ["status"])
+    op.create_index("ix_incidents_created_at", "incidents", ["created_at"])
+    op.create_index(
+        "ix_incidents_source_created_at",
+        "incidents",
+        ["source", sa.text("created_at DESC")],
+        postgresql_include=["id"],
+    )
+    op.create_index(
+        "ix_incidents_severity_created_at",
+        "incidents",
+        ["severity", sa.text("created_at DESC")],
+        postgresql_include=["id"],
+    )
+
+
+def _create_audit_indexes() -> None:
+    op.create_index("ix_audit_logs_timestamp", "audit_logs", ["timestamp"])
+    op.create_index("ix_audit_logs_component", "audit_logs", ["component"])
+    op.create_index("ix_audit_logs_event", "audit_logs", ["event"])
+
+
+def _rename_to_legacy(table: str) -> None:
+    op.execute(f"ALTER TABLE {table} RENAME TO {table}_legacy")
+    op.execute(f"ALTER TABLE {table}_legacy RENAME CONSTRAINT {table}_pkey TO {table}_legacy_pkey")
+    # Free the index names for the new table.
+    for row in op.get_bind().execute(
+        sa.text("SELECT indexname FROM pg_indexes WHERE tablename = :table AND indexname LIKE 'ix_%'"),
+        {"table": f"{table}_legacy"},
+    ).all():
+        op.execute(f"DROP INDEX {row[0]}")
+
+
+def _month_start(moment: datetime) -> datetime:
+    return moment.astimezone(timezone.utc).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def _next_month(lower: datetime) -> datetime:
+    return lower.replace(year=lower.year + 1, month=1) if lower.month == 12 else lower.replace(month=lower.month + 1)
+
+
+def _create_partitions(table: str, key: str) -> None:
+    op.execute(f"CREATE TABLE IF NOT EXISTS {table}_default PARTITION OF {table} DEFAULT")
+    now = datetime.now(timezone.utc)
+    oldest = op.get_bind().execute(sa.text(f'SELECT min("{key}") FROM {table}_legacy')).scalar() or now
+    horizon = _month_start(now)
+    for _ in range(_PRECREATE_MONTHS):
+        horizon = _next_month(horizon)
+    lower = _month_start(min(oldest, now))
+    while lower <= horizon:
+        upper = _next_month(lower)
+        op.execute(
+            f"CREATE TABLE IF NOT EXISTS {table}_p{lower:%Y%m} PARTITION OF {table} "
+            f"FOR VALUES FROM ('{lower.isoformat()}') TO ('{upper.isoformat()}')"
+        )
+        lower = upper
+
+
+def upgrade() -> None:
+    op.drop_constraint("remediation_plans_incident_id_fkey", "remediation_plans", type_="foreignkey")
+
+    # --- incidents ---
+    _rename_to_legacy("incidents")
+    op.execute(_INCIDENTS_DDL.format(partitioning="PARTITION BY RANGE (created_at)"))
+    _create_partitions("incidents", "created_at")
+    op.execute(
+        f"INSERT INTO incidents ({_INCIDENT_COLUMNS}) "
+        f"SELECT {_INCIDENT_COLUMNS.replace('created_at', 'COALESCE(created_at, now())')} FROM incidents_legacy"
+    )
+    op.drop_table("incidents_legacy")
+    _create_incident_indexes()
+
+    # --- audit_logs ---
+    _rename_to_legacy("audit_logs")
+    op.execute(_AUDIT_LOGS_DDL.format(key='id, "timestamp"', partitioning='PARTITION BY RANGE ("timestamp")'))
+    _create_partitions("audit_logs", "timestamp")
+    op.execute(
+        f"INSERT INTO audit_logs ({_AUDIT_COLUMNS}) "
+        f"SELECT id, COALESCE(\"timestamp\", now()), component, event, details FROM audit_logs_legacy"
+    )
+    op.drop_table("audit_logs_legacy")
+    _create_audit_indexes()
+
+
+def downgrade() -> None:
+    # Detached partitions are left alone; only rows still attached come back.
+    _rename_to_legacy("audit_logs")
+    op.execute(_AUDIT_LOGS_DDL.format(key="id", partitioning=""))
+    op.execute(f"INSERT INTO audit_logs ({_AUDIT_COLUMNS}) SELECT {_AUDIT_COLUMNS} FROM audit_logs_legacy")
+    op.execute("DROP TABLE audit_logs_legacy CASCADE")
+    _create_audit_indexes()
+
+    _rename_to_legacy("incidents")
+    op.execute(_INCIDENTS_DDL.format(partitioning="").replace("PRIMARY KEY (id, created_at)", "PRIMARY KEY (id)"))
+    op.execute(f"INSERT INTO incidents ({_INCIDENT_COLUMNS}) SELECT {_INCIDENT_COLUMNS} FROM incidents_legacy")
+    op.execute("DROP TABLE incidents_legacy CASCADE")
+    _create_incident_indexes()
+
+    op.execute("DELETE FROM remediation_plans WHERE incident_id NOT IN (SELECT id FROM incidents)")
+    op.create_foreign_key(
+        "remediation_plans_incident_id_fkey",
+        "remediation_plans",
+        "incidents",
+        ["incident_id"],
+        ["id"],
+        ondelete="CASCADE",
+    )
@@ -0,0 +1,2 @@
+# Benchmarks package — each module is runnable with ``python -m app.bench.<name>``
+# and prints its results as JSON on stdout.
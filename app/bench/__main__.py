@@ -0,0 +1,4 @@
+"""``python -m app.bench`` runs the end-to-end pipeline benchmark."""
+from app.bench.pipeline import main
+
+main()
@@ -0,0 +1,142 @@
+"""
+Audit query benchmark: scanning the JSONL file vs the SQLite audit index.
+
+Writes ``--events`` AlertProcessed-shaped events spread evenly over
+``--days`` to a JSONL file, imports them into an AuditIndex (catch-up
+path), and runs the same filtered queries both ways:
+
+    scan   read every line, json.loads it and filter (what grepping audit.log
+           amounts to);
+    index  AuditIndex.query, first page of ``--limit`` and a follow-up page
+           through the cursor.
+
+    python -m app.bench.audit_index --events 1000000 --days 90
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from app.bench.pipeline import percentiles
+from app.core.entities import AuditLog
+from app.modules.audit import AuditIndex
+
+SOURCES = [f"service-{index:03d}" for index in range(200)]
+SEVERITIES = ["INFO", "WARNING", "CRITICAL", "FATAL"]
+RESULTS = ["EXECUTED", "BLOCKED", "PENDING_APPROVAL"]
+
+
+def _write_log(path: str, count: int, days: float, seed: int) -> datetime:
+    rng = random.Random(seed)
+    start = datetime.now(timezone.utc) - timedelta(days=days)
+    step = timedelta(days=days) / count
+    with open(path, "w") as f:
+        for index in range(count):
+            event = AuditLog(
+                component="Orchestrator",
+                event="AlertProcessed",
+                timestamp=start + step * index,
+                details={
+                    "alert": {
+                        "source": rng.choice(SOURCES),
+                        "severity": rng.choice(SEVERITIES),
+                        "message": "High latency detected",
+                    },
+                    "diagnosis": {"root_cause": "Connection pool exhausted", "confidence": 0.8},
+                    "result": rng.choice(RESULTS),
+                },
+            )
+            f.write(event.model_dump_json() + "\n")
+    return start
+
+
+def _scan(path: str, source: str, severity: str, since: datetime, until: datetime, limit: int) -> List[dict]:
+    matches = []
+    with open(path) as f:
+        for line in f:
+            entry = json.loads(line)
+            alert = entry["details"]["alert"]
+            if alert["source"] == source and alert["severity"] == severity and (
+                since <= datetime.fromisoformat(entry["timestamp"]) < until
+            ):
+                matches.append(entry)
+    return matches[::-1][:limit]
+
+
+def _queries(start: datetime, days: float, count: int, seed: int) -> List[Dict]:
+    rng = random.Random(seed + 1)
+    queries = []
+    for _ in range(count):
+        since = start + timedelta(days=rng.uniform(0, days * 0.9))
+        queries.append({
+            "source": rng.choice(SOURCES),
+            "severity": rng.choice(SEVERITIES),
+            "since": since,
+            "until": since + timedelta(days=days * 0.1),
+        })
+    return queries
+
+
+def run(args: argparse.Namespace) -> Dict:
+    workdir = tempfile.mkdtemp(prefix="sentinel-bench-")
+    path = os.path.join(workdir, "audit.log")
+    start = _write_log(path, args.events, args.days, args.seed)
+
+    index = AuditIndex(os.path.join(workdir, "audit_index.db"))
+    import_started = time.perf_counter()
+    imported = index.catch_up(path)
+    import_seconds = time.perf_counter() - import_started
+
+    queries = _queries(start, args.days, args.queries, args.seed)
+    first, follow, mismatches = [], [], 0
+    for query in queries:
+        started = time.perf_counter()
+        page = index.query(limit=args.limit, **query)
+        first.append(time.perf_counter() - started)
+        if page.next_cursor is not None:
+            started = time.perf_counter()
+            index.query(limit=args.limit, cursor=page.next_cursor, **query)
+            follow.append(time.perf_counter() - started)
+    scan = []
+    for query in queries[: args.scan_queries]:
+        started = time.perf_counter()
+        expected = _scan(path, limit=args.limit, **query)
+        scan.append(time.perf_counter() - started)
+        page = index.query(limit=args.limit, **query)
+        mismatches += [entry["id"] for entry in expected] != [entry["id"] for entry in page.entries]
+    return {
+        "benchmark": "audit_index",
+        "events": args.events,
+        "days": args.days,
+        "log_mb": round(os.path.getsize(path) / 1e6, 1),
+        "index_mb": round(os.path.getsize(index.db_path) / 1e6, 1),
+        "import_events_per_sec": round(imported / import_seconds, 1),
+        "scan_ms": percentiles(scan),
+        "index_first_page_ms": percentiles(first),
+        "index_next_page_ms": percentiles(follow),
+        "result_mismatches": mismatches,
+    }
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m app.bench.audit_index", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--events", type=int, default=200_000)
+    parser.add_argument("--days", type=float, default=90.0)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--scan-queries", type=int, default=3, help="Queries also answered by a full scan")
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=42)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = build_parser().parse_args(argv)
+    print(json.dumps(run(args), indent=2))
+
+
+if __name__ == "__main__":
+    main()
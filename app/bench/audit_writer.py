@@ -0,0 +1,119 @@
+"""
+Audit write-path benchmark: per-event open/append vs the group-commit writer.
+
+Writes the same AlertProcessed-shaped events (alert, diagnosis and plan
+details, as the orchestrator logs them) through
+
+    per_event     AuditService: aiofiles open/append/close per event;
+    group_commit  AuditWriter with each fsync policy;
+
+from ``--producers`` concurrent tasks, and reports events/sec until every
+event is on disk (AuditWriter.close()).
+
+    python -m app.bench.audit_writer --events 20000 --producers 8
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+from app.core.entities import AuditLog
+from app.modules.audit import AuditService, AuditWriter
+from app.modules.ingestion import AlertSimulator
+
+
+def _events(count: int, seed: int) -> List[AuditLog]:
+    simulator = AlertSimulator(seed=seed)
+    events = []
+    for _ in range(count):
+        alert = simulator._generate_random_alert()
+        events.append(
+            AuditLog(
+                component="Orchestrator",
+                event="AlertProcessed",
+                details={
+                    "alert": alert.model_dump(mode="json"),
+                    "diagnosis": {
+                        "alert_id": alert.id,
+                        "root_cause": "Connection pool exhausted after deploy",
+                        "confidence": 0.8,
+                        "suggested_actions": ["RESTART_SERVICE"],
+                        "analysis_path": "rule",
+                    },
+                    "plan": {"action_type": "RESTART_SERVICE", "risk_level": "MODERATE", "status": "EXECUTED"},
+                    "result": "EXECUTED",
+                },
+            )
+        )
+    return events
+
+
+async def _drive(sink, events: List[AuditLog], producers: int) -> float:
+    """Time for ``producers`` tasks to log every event (and the sink to close, if it can)."""
+    chunks = [events[i::producers] for i in range(producers)]
+
+    async def produce(chunk: List[AuditLog]) -> None:
+        for event in chunk:
+            await sink.log_event(event)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(produce(chunk) for chunk in chunks))
+    if isinstance(sink, AuditWriter):
+        await sink.close()
+    return time.perf_counter() - started
+
+
+async def run(args: argparse.Namespace) -> Dict:
+    workdir = tempfile.mkdtemp(prefix="sentinel-bench-")
+    events = _events(args.events, args.seed)
+    results = {}
+
+    path = os.path.join(workdir, "per_event.log")
+    elapsed = await _drive(AuditService(file_path=path), events, args.producers)
+    results["per_event"] = {"events_per_sec": round(len(events) / elapsed, 1)}
+
+    for policy in args.fsync:
+        path = os.path.join(workdir, f"group_{policy}.log")
+        writer = AuditWriter(file_path=path, fsync=policy, rotate_bytes=args.rotate_bytes)
+        elapsed = await _drive(writer, events, args.producers)
+        stats = writer.stats()
+        results[f"group_commit_{policy}"] = {
+            "events_per_sec": round(len(events) / elapsed, 1),
+            "avg_events_per_commit": stats["avg_events_per_commit"],
+            "fsyncs": stats["fsyncs"],
+            "rotations": stats["rotations"],
+        }
+
+    baseline = results["per_event"]["events_per_sec"]
+    for name, result in results.items():
+        result["speedup"] = round(result["events_per_sec"] / baseline, 1)
+    return {
+        "benchmark": "audit_writer",
+        "events": args.events,
+        "producers": args.producers,
+        "results": results,
+    }
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.bench.audit_writer", description=__doc__.split("\n\n")[0]
+    )
+    parser.add_argument("--events", type=int, default=20_000)
+    parser.add_argument("--producers", type=int, default=8, help="Concurrent logging tasks (pipeline workers)")
+    parser.add_argument("--fsync", nargs="+", choices=["none", "batch", "interval"], default=["none", "interval", "batch"])
+    parser.add_argument("--rotate-bytes", type=int, default=64 * 1024 * 1024)
+    parser.add_argument("--seed", type=int, default=42)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = build_parser().parse_args(argv)
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
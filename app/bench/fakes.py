@@ -0,0 +1,113 @@
+"""
+Deterministic stand-ins used by the benchmarks (and usable from tests).
+
+FakeChatModel duck-types the small slice of ChatAnthropic that LLMAnalyzer uses
+(``with_structured_output(...).ainvoke(messages)``) and answers after a seeded,
+configurable latency — no network, reproducible runs. Raw responses carry an
+approximate ``usage_metadata`` (about 4 characters per input token) so per-route
+token and cost accounting can be exercised.
+"""
+import asyncio
+import random
+from typing import Any, List, Optional
+
+from langchain_core.messages import AIMessage, BaseMessage
+
+
+class LatencyModel:
+    """Seeded log-normal latency distribution around ``median_ms``."""
+
+    def __init__(self, median_ms: float = 800.0, sigma: float = 0.3, seed: int = 0) -> None:
+        self.median_ms = median_ms
+        self.sigma = sigma
+        self._rng = random.Random(seed)
+
+    def sample(self) -> float:
+        """Return one latency sample in seconds."""
+        if self.median_ms <= 0:
+            return 0.0
+        return self.median_ms * self._rng.lognormvariate(0.0, self.sigma) / 1000.0
+
+
+class FakeChatModel:
+    """
+    Chat-model stand-in with a latency distribution and a provider-side
+    concurrency cap. Batched prompts (``=== ALERT [i] ===`` blocks) cost
+    ``1 + per_item_factor * (n - 1)`` times a single call.
+    """
+
+    def __init__(
+        self,
+        latency: Optional[LatencyModel] = None,
+        per_item_factor: float = 0.15,
+        max_concurrency: Optional[int] = None,
+    ) -> None:
+        self.latency = latency or LatencyModel()
+        self.per_item_factor = per_item_factor
+        self.calls = 0
+        self.items = 0
+        self._semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+
+    def with_structured_output(self, schema, include_raw: bool = False) -> "_FakeStructuredModel":
+        return _FakeStructuredModel(self, schema, include_raw)
+
+    async def _respond(self, messages: List[BaseMessage]) -> List[str]:
+        prompt = str(messages[-1].content)
+        alert_messages = [
+            line.split(":", 1)[1].strip()
+            for line in prompt.splitlines()
+            if line.startswith("  Message:")
+        ] or ["unknown"]
+        delay = self.latency.sample() * (1 + self.per_item_factor * (len(alert_messages) - 1))
+        if self._semaphore is not None:
+            async with self._semaphore:
+                await asyncio.sleep(delay)
+        else:
+            await asyncio.sleep(delay)
+        self.calls += 1
+        self.items += len(alert_messages)
+        return alert_messages
+
+
+class _FakeStructuredModel:
+    def __init__(self, model: FakeChatModel, schema, include_raw: bool) -> None:
+        self._model = model
+        self._schema = schema
+        self._include_raw = include_raw
+
+    async def ainvoke(self, messages: List[BaseMessage]) -> Any:
+        alert_messages = await self._model._respond(messages)
+        if "diagnoses" in self._schema.model_fields:
+            args = {
+                "diagnoses": [
+                    dict(_fake_diagnosis(message), alert_index=index)
+                    for index, message in enumerate(alert_messages)
+                ]
+            }
+        else:
+            args = _fake_diagnosis(alert_messages[0])
+        parsed = self._schema.model_validate(args)
+        if not self._include_raw:
+            return parsed
+        input_tokens = sum(len(str(m.content)) for m in messages) // 4
+        output_tokens = 150 * len(alert_messages)
+        raw = AIMessage(
+            content="",
+            tool_calls=[{"name": self._schema.__name__, "args": args, "id": "fake-call"}],
+            usage_metadata={
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens,
+                "total_tokens": input_tokens + output_tokens,
+            },
+        )
+        return {"raw": raw, "parsed": parsed, "parsing_error": None}
+
+
+def _fake_diagnosis(message: str) -> dict:
+    return {
+        "root_cause": f"Fake diagnosis for: {message}",
+        "confidence": 0.7,
+        "alternative_hypotheses": [],
+        "reasoning_trace": "Deterministic benchmark stand-in.",
+        "suggested_actions": ["NOTIFICATION"],
+    }
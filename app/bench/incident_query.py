@@ -0,0 +1,209 @@
+"""
+Recent-similar-incident query benchmark.
+
+Seeds a synthetic ``incidents`` table (1M rows by default, spread over
+``--days`` across ``--sources`` sources) into SQLite or any async SQLAlchemy
+URL, then times ``get_recent_similar`` twice:
+
+    before  the original ``source = ? OR severity = ?`` query with only the
+            initial single-column indexes;
+    after   the UNION form (``recent_similar_query``) with the composite
+            (source, created_at) / (severity, created_at) indexes.
+
+Both phases run the same seeded (source, severity) lookups and their result
+ids are compared. Reports p50/p95/p99 per phase as JSON.
+
+    python -m app.bench.incident_query --rows 1000000
+    python -m app.bench.incident_query --rows 10000000 --db-url postgresql+asyncpg://...
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, insert, or_, select, text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from app.bench.pipeline import percentiles
+from app.core.entities import AlertSeverity
+from app.infrastructure.database.models import Base, IncidentModel
+from app.infrastructure.database.repositories import recent_similar_query
+
+_NEW_INDEXES = [index for index in IncidentModel.__table__.indexes if index.name.endswith("_created_at")]
+# Plain DDL: an Index() on the model column would attach itself to the table metadata.
+_CREATE_LEGACY_INDEX = "CREATE INDEX ix_incidents_source ON incidents (source)"
+_DROP_LEGACY_INDEX = "DROP INDEX ix_incidents_source"
+# Skewed like real traffic: most alerts are WARNING/INFO.
+_SEVERITY_WEIGHTS = {
+    AlertSeverity.INFO: 40,
+    AlertSeverity.WARNING: 40,
+    AlertSeverity.CRITICAL: 15,
+    AlertSeverity.FATAL: 5,
+}
+
+
+def legacy_recent_similar_query(source: str, severity: AlertSeverity, cutoff: datetime, limit: int):
+    """The pre-UNION ``get_recent_similar`` statement, kept here for comparison."""
+    return (
+        select(IncidentModel)
+        .where(
+            and_(
+                or_(IncidentModel.source == source, IncidentModel.severity == severity),
+                IncidentModel.created_at >= cutoff,
+            )
+        )
+        .order_by(IncidentModel.created_at.desc())
+        .limit(limit)
+    )
+
+
+async def _seed(engine: AsyncEngine, args: argparse.Namespace, now: datetime) -> None:
+    rng = random.Random(args.seed)
+    severities = list(_SEVERITY_WEIGHTS)
+    weights = list(_SEVERITY_WEIGHTS.values())
+    span = args.days * 86400
+    statement = insert(IncidentModel.__table__)
+    for start in range(0, args.rows, args.batch):
+        rows = []
+        for _ in range(min(args.batch, args.rows - start)):
+            severity = rng.choices(severities, weights)[0]
+            rows.append(
+                {
+                    "id": str(uuid.UUID(int=rng.getrandbits(128))),
+                    "alert_id": str(uuid.UUID(int=rng.getrandbits(128))),
+                    "status": "CLOSED",
+                    "source": f"service-{rng.randrange(args.sources)}",
+                    "severity": severity,
+                    "message": f"{severity.value} condition detected",
+                    "metadata_json": {},
+                    "created_at": now - timedelta(seconds=rng.random() * span),
+                }
+            )
+        async with engine.begin() as conn:
+            await conn.execute(statement, rows)
+
+
+async def _analyze(engine: AsyncEngine) -> None:
+    async with engine.begin() as conn:
+        await conn.execute(text("ANALYZE incidents" if engine.dialect.name == "postgresql" else "ANALYZE"))
+
+
+async def _time_queries(
+    engine: AsyncEngine, build, lookups: List[Tuple[str, AlertSeverity]], cutoff: datetime, limit: int
+) -> Tuple[List[float], List[List[str]]]:
+    samples: List[float] = []
+    results: List[List[str]] = []
+    async with engine.connect() as conn:
+        for source, severity in lookups:
+            started = time.perf_counter()
+            rows = (await conn.execute(build(source, severity, cutoff, limit))).all()
+            samples.append(time.perf_counter() - started)
+            results.append(sorted(row.id for row in rows))
+    return samples, results
+
+
+async def _explain(engine: AsyncEngine, statement) -> List[str]:
+    prefix = "EXPLAIN" if engine.dialect.name == "postgresql" else "EXPLAIN QUERY PLAN"
+    compiled = statement.compile(engine, compile_kwargs={"literal_binds": True})
+    async with engine.connect() as conn:
+        rows = (await conn.execute(text(f"{prefix} {compiled}"))).all()
+    return [str(row[-1]) for row in rows]
+
+
+async def run(args: argparse.Namespace) -> Dict:
+    workdir = tempfile.mkdtemp(prefix="sentinel-bench-")
+    url = args.db_url or f"sqlite+aiosqlite:///{os.path.join(workdir, 'incidents.db')}"
+    engine = create_async_engine(url, echo=False)
+    now = datetime.now(timezone.utc)
+    cutoff = now - timedelta(hours=args.hours)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+        # Start from the initial migration's index layout.
+        for index in _NEW_INDEXES:
+            await conn.run_sync(index.drop)
+        await conn.execute(text(_CREATE_LEGACY_INDEX))
+
+    started = time.perf_counter()
+    await _seed(engine, args, now)
+    seed_seconds = time.perf_counter() - started
+    await _analyze(engine)
+
+    rng = random.Random(args.seed + 1)
+    lookups = [
+        (f"service-{rng.randrange(args.sources)}", rng.choice(list(AlertSeverity)))
+        for _ in range(args.queries)
+    ]
+    sample_source, sample_severity = lookups[0]
+
+    before, before_ids = await _time_queries(engine, legacy_recent_similar_query, lookups, cutoff, args.limit)
+    before_plan = await _explain(
+        engine, legacy_recent_similar_query(sample_source, sample_severity, cutoff, args.limit)
+    )
+
+    started = time.perf_counter()
+    async with engine.begin() as conn:
+        for index in _NEW_INDEXES:
+            await conn.run_sync(index.create)
+        await conn.execute(text(_DROP_LEGACY_INDEX))
+    index_seconds = time.perf_counter() - started
+    await _analyze(engine)
+
+    after, after_ids = await _time_queries(engine, recent_similar_query, lookups, cutoff, args.limit)
+    after_plan = await _explain(engine, recent_similar_query(sample_source, sample_severity, cutoff, args.limit))
+    await engine.dispose()
+
+    # Ties on created_at may legitimately resolve differently at the limit boundary.
+    mismatches = sum(1 for a, b in zip(before_ids, after_ids) if a != b)
+    before_ms = percentiles(before)
+    after_ms = percentiles(after)
+    return {
+        "benchmark": "incident_query",
+        "timestamp": now.isoformat(),
+        "dialect": engine.dialect.name,
+        "config": {key: value for key, value in vars(args).items() if key != "db_url"},
+        "seed_seconds": round(seed_seconds, 2),
+        "index_build_seconds": round(index_seconds, 2),
+        "latency_ms": {"before": before_ms, "after": after_ms},
+        "speedup_p50": round(before_ms["p50"] / after_ms["p50"], 1) if after_ms.get("p50") else None,
+        "result_mismatches": mismatches,
+        "plans": {"before": before_plan, "after": after_plan},
+    }
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.bench.incident_query", description=__doc__.split("\n\n")[0]
+    )
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--sources", type=int, default=1000)
+    parser.add_argument("--days", type=float, default=30.0, help="Spread created_at over this many days")
+    parser.add_argument("--hours", type=float, default=24.0, help="get_recent_similar window")
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--batch", type=int, default=10_000, help="Rows per insert batch")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--db-url", default=None, help="Any async SQLAlchemy URL (tables are recreated!)")
+    parser.add_argument("--output", default=None, help="Also write the JSON result to this file")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = build_parser().parse_args(argv)
+    result = asyncio.run(run(args))
+    output = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+"""
+End-to-end pipeline benchmark.
+
+Drives the full Ingest → Context → Analyze → Policy → Action → Audit flow
+(AlertQueue + AlertWorkerPool + AlertPipeline) with a seeded AlertSimulator,
+FakeChatModel standing in for Claude, and an SQLite database (or no database),
+then reports throughput, per-stage latency percentiles and memory high-water
+mark as JSON so results can be compared between releases.
+
+    python -m app.bench --alerts 2000 --workers 16 --llm-median-ms 50
+    python -m app.bench --analyzer rule --db none --output bench.json
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.bench.fakes import FakeChatModel, LatencyModel
+from app.core.config import settings
+from app.core.entities import Alert, Diagnosis, Incident, RemediationPlan, RiskLevel
+from app.infrastructure.database.models import Base
+from app.infrastructure.database.repositories import IncidentRepository, PlanRepository
+from app.infrastructure.database.write_behind import WriteBehindPersister
+from app.modules.action import ActionExecutor
+from app.modules.analysis import DiagnosisCache, EscalationPolicy, LLMAnalyzer, RuleBasedAnalyzer, TieredAnalyzer
+from app.modules.audit import AuditWriter
+from app.modules.context import ContextBuilderService, HistoryCache, IncidentHistoryStore
+from app.modules.ingestion import AlertDeduplicator, AlertQueue, AlertSimulator
+from app.modules.pipeline import AlertPipeline, AlertWorkerPool
+from app.modules.policy import RiskEvaluator
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    """p50/p95/p99/mean/max of latency samples (seconds in, milliseconds out)."""
+    if not samples:
+        return {"count": 0}
+    ordered = sorted(samples)
+
+    def pick(q: float) -> float:
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000
+
+    return {
+        "count": len(ordered),
+        "p50": round(pick(0.50), 3),
+        "p95": round(pick(0.95), 3),
+        "p99": round(pick(0.99), 3),
+        "mean": round(sum(ordered) / len(ordered) * 1000, 3),
+        "max": round(ordered[-1] * 1000, 3),
+    }
+
+
+class StageTimer:
+    """Wraps one async method per stage on a component instance and records its latency."""
+
+    def __init__(self) -> None:
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+
+    def wrap(self, stage: str, target, method: str):
+        original = getattr(target, method)
+        samples = self.samples[stage]
+
+        async def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return await original(*args, **kwargs)
+            finally:
+                samples.append(time.perf_counter() - started)
+
+        setattr(target, method, timed)
+        return target
+
+
+async def _seed_history(session_factory, simulator: AlertSimulator, per_source: int) -> None:
+    """Populate incidents and executed plans so context queries return real rows."""
+    async with session_factory() as session:
+        incidents = IncidentRepository(session)
+        plans = PlanRepository(session)
+        for _ in range(per_source * 5):
+            alert = simulator._generate_random_alert()
+            incident = await incidents.save(
+                Incident(
+                    alert_id=alert.id,
+                    source=alert.source,
+                    severity=alert.severity,
+                    message=alert.message,
+                    metadata=alert.metadata,
+                    status="CLOSED",
+                )
+            )
+            diagnosis = Diagnosis(
+                alert_id=alert.id, root_cause="Seeded history", confidence=0.5, suggested_actions=[]
+            )
+            await plans.save(
+                RemediationPlan(
+                    diagnosis=diagnosis,
+                    action_type="RESTART_SERVICE",
+                    risk_level=RiskLevel.MODERATE,
+                    requires_approval=False,
+                    status="EXECUTED",
+                ),
+                incident_id=incident.id,
+            )
+        await session.commit()
+
+
+async def run(args: argparse.Namespace) -> Dict:
+    simulator = AlertSimulator(seed=args.seed)
+    timer = StageTimer()
+    workdir = tempfile.mkdtemp(prefix="sentinel-bench-")
+
+    engine = None
+    session_factory = None
+    if args.db != "none":
+        url = args.db_url or f"sqlite+aiosqlite:///{os.path.join(workdir, 'bench.db')}"
+        engine = create_async_engine(url, echo=False)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        session_factory = async_sessionmaker(engine, expire_on_commit=False)
+        await _seed_history(session_factory, simulator, args.history_per_source)
+
+    fake_llm: Optional[FakeChatModel] = None
+    if args.analyzer in ("llm", "tiered"):
+        fake_llm = FakeChatModel(
+            latency=LatencyModel(median_ms=args.llm_median_ms, sigma=args.llm_sigma, seed=args.seed),
+            max_concurrency=args.llm_concurrency,
+        )
+        analyzer = LLMAnalyzer(
+            api_key="bench",
+            model="bench",
+            fallback_analyzer=RuleBasedAnalyzer(),
+            cache=DiagnosisCache() if args.cache else None,
+            llm=fake_llm,
+        )
+        if args.analyzer == "tiered":
+            analyzer = TieredAnalyzer(
+                RuleBasedAnalyzer(),
+                analyzer,
+                EscalationPolicy(
+                    min_confidence=settings.TIERED_MIN_CONFIDENCE,
+                    recurrence_threshold=settings.TIERED_RECURRENCE_THRESHOLD,
+                ),
+            )
+    else:
+        analyzer = RuleBasedAnalyzer()
+
+    history_cache = HistoryCache(ttl_seconds=args.history_cache_ttl) if args.history_cache_ttl > 0 else None
+    history_store = None
+    if args.history_store and session_factory is not None:
+        history_store = IncidentHistoryStore()
+        await history_store.warm_from(session_factory)
+    persister = None
+    if args.write_behind and session_factory is not None:
+        persister = WriteBehindPersister(session_factory)
+        persister.start()
+    context_builder = ContextBuilderService(session_factory, history_cache, history_store)
+    audit_writer = AuditWriter(file_path=os.path.join(workdir, "audit.log"))
+    pipeline = AlertPipeline(
+        context_builder=timer.wrap("context", context_builder, "build"),
+        analyzer=timer.wrap("analyze", analyzer, "analyze"),
+        risk_evaluator=timer.wrap("policy", RiskEvaluator(), "evaluate_risk"),
+        executor=timer.wrap("action", ActionExecutor(delay_seconds=args.action_ms / 1000.0), "execute_action"),
+        audit_service=timer.wrap("audit", audit_writer, "log_event"),
+        deduplicator=AlertDeduplicator(window_seconds=args.dedup_window) if args.dedup_window > 0 else None,
+        history_store=history_store,
+        persister=persister,
+    )
+
+    enqueued_at: Dict[str, float] = {}
+    end_to_end: List[float] = []
+
+    async def handler(alert: Alert) -> None:
+        await pipeline.process(alert)
+        end_to_end.append(time.perf_counter() - enqueued_at.pop(alert.id))
+
+    alerts = [simulator._generate_random_alert() for _ in range(args.alerts)]
+    queue = AlertQueue(maxsize=max(1, args.queue_size))
+    pool = AlertWorkerPool(handler=handler, concurrency=args.workers, queue=queue)
+
+    if args.trace_memory:
+        tracemalloc.start()
+    pool.start()
+    started = time.perf_counter()
+    for alert in alerts:
+        enqueued_at[alert.id] = time.perf_counter()
+        await queue.put(alert)
+    await pool.drain()
+    elapsed = time.perf_counter() - started
+    if persister is not None:
+        await persister.close()
+    await audit_writer.close()
+    traced_peak = tracemalloc.get_traced_memory()[1] if args.trace_memory else None
+    if args.trace_memory:
+        tracemalloc.stop()
+    if engine is not None:
+        await engine.dispose()
+
+    # ru_maxrss is KiB on Linux, bytes on macOS.
+    rss_divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return {
+        "benchmark": "pipeline",
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "config": vars(args),
+        "alerts": args.alerts,
+        "elapsed_seconds": round(elapsed, 4),
+        "alerts_per_sec": round(args.alerts / elapsed, 2),
+        "latency_ms": {
+            "end_to_end": percentiles(end_to_end),
+            "stages": {stage: percentiles(samples) for stage, samples in timer.samples.items()},
+        },
+        "llm_calls": fake_llm.calls if fake_llm is not None else 0,
+        "history_cache": history_cache.stats() if history_cache is not None else None,
+        "history_store": history_store.stats() if history_store is not None else None,
+        "write_behind": persister.stats() if persister is not None else None,
+        "memory": {
+            "rss_high_water_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / rss_divisor, 2),
+            "tracemalloc_peak_mb": round(traced_peak / 1024 / 1024, 2) if traced_peak is not None else None,
+        },
+    }
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m app.bench", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--alerts", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--queue-size", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--analyzer", choices=["llm", "tiered", "rule"], default="llm")
+    parser.add_argument("--llm-median-ms", type=float, default=50.0)
+    parser.add_argument("--llm-sigma", type=float, default=0.3)
+    parser.add_argument("--llm-concurrency", type=int, default=None, help="Fake provider concurrency cap")
+    parser.add_argument("--cache", action="store_true", help="Enable the diagnosis cache")
+    parser.add_argument("--action-ms", type=float, default=0.0, help="Simulated action execution time")
+    parser.add_argument("--dedup-window", type=float, default=0.0, help="Dedup window seconds (0 = off)")
+    parser.add_argument("--db", choices=["sqlite", "none"], default="sqlite")
+    parser.add_argument("--db-url", default=None, help="Override the SQLite URL (any async SQLAlchemy URL)")
+    parser.add_argument("--history-per-source", type=int, default=20)
+    parser.add_argument("--history-store", action="store_true", help="Serve context history from the in-memory store")
+    parser.add_argument("--history-cache-ttl", type=float, default=0.0, help="Context history cache TTL seconds (0 = off)")
+    parser.add_argument("--write-behind", action="store_true", help="Persist incidents/plans write-behind")
+    parser.add_argument("--trace-memory", action="store_true", help="Also report tracemalloc peak (slower)")
+    parser.add_argument("--output", default=None, help="Also write the JSON result to this file")
+    parser.add_argument("--log-level", default="ERROR")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = build_parser().parse_args(argv)
+    logging.getLogger().setLevel(args.log_level)
+    result = asyncio.run(run(args))
+    output = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
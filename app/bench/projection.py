@@ -0,0 +1,185 @@
+"""
+History read-path microbenchmark: ORM hydration vs Core column projection.
+
+Seeds an SQLite database with incidents (with realistic ``metadata_json``)
+and executed plans, then reads the same rows two ways and reports the cost
+per row:
+
+    orm         select(IncidentModel) / select(RemediationPlanModel), then the
+                validating pydantic constructors (the pre-projection path);
+    projection  the repository history reads (IncidentRepository.get_since,
+                PlanRepository.get_executed_with_source).
+
+    python -m app.bench.projection --rows 20000 --repeat 5
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.entities import (
+    ActionType,
+    AlertSeverity,
+    Diagnosis,
+    Incident,
+    RemediationPlan,
+    RiskLevel,
+)
+from app.infrastructure.database.models import Base, IncidentModel, RemediationPlanModel
+from app.infrastructure.database.repositories import IncidentRepository, PlanRepository
+
+
+async def _orm_incidents(session, cutoff: datetime) -> List[Incident]:
+    result = await session.execute(
+        select(IncidentModel).where(IncidentModel.created_at >= cutoff).order_by(IncidentModel.created_at)
+    )
+    return [
+        Incident(
+            id=m.id,
+            alert_id=m.alert_id,
+            source=m.source,
+            severity=m.severity,
+            message=m.message,
+            metadata=m.metadata_json or {},
+            status=m.status,
+            created_at=m.created_at,
+            closed_at=m.closed_at,
+        )
+        for m in result.scalars().all()
+    ]
+
+
+async def _orm_plans(session, limit: int) -> List[RemediationPlan]:
+    result = await session.execute(
+        select(IncidentModel.source, RemediationPlanModel)
+        .join(IncidentModel, RemediationPlanModel.incident_id == IncidentModel.id)
+        .where(RemediationPlanModel.status == "EXECUTED")
+        .order_by(RemediationPlanModel.created_at.desc())
+        .limit(limit)
+    )
+    plans = []
+    for source, m in result.all():
+        diagnosis = Diagnosis(
+            alert_id="",
+            root_cause=m.diagnosis_root_cause,
+            confidence=m.diagnosis_confidence,
+            alternative_hypotheses=[],
+            reasoning_trace="",
+            suggested_actions=[],
+        )
+        plans.append(
+            (
+                source,
+                RemediationPlan(
+                    id=m.id,
+                    diagnosis=diagnosis,
+                    action_type=m.action_type,
+                    risk_level=m.risk_level,
+                    requires_approval=m.requires_approval,
+                    status=m.status,
+                ),
+            )
+        )
+    return plans
+
+
+async def _seed(session_factory, rows: int, seed: int, now: datetime) -> None:
+    rng = random.Random(seed)
+    async with session_factory() as session:
+        for i in range(rows):
+            incident = IncidentModel(
+                alert_id=f"alert-{i}",
+                source=f"service-{rng.randrange(100)}",
+                severity=rng.choice(list(AlertSeverity)),
+                message="Latency above SLO on upstream dependency",
+                metadata_json={f"label_{k}": f"value-{rng.randrange(1000)}" for k in range(10)},
+                status="CLOSED",
+                created_at=now - timedelta(seconds=rng.random() * 3600),
+            )
+            session.add(incident)
+            session.add(
+                RemediationPlanModel(
+                    incident=incident,
+                    diagnosis_root_cause="Connection pool exhausted after deploy",
+                    diagnosis_confidence=0.8,
+                    action_type=ActionType.RESTART_SERVICE,
+                    risk_level=RiskLevel.MODERATE,
+                    requires_approval=False,
+                    status="EXECUTED",
+                )
+            )
+        await session.commit()
+
+
+async def _best_per_row(
+    session_factory, read: Callable[..., Awaitable[list]], repeat: int
+) -> Dict[str, float]:
+    best = float("inf")
+    count = 0
+    for _ in range(repeat):
+        # Fresh session each time so the ORM identity map starts empty.
+        async with session_factory() as session:
+            started = time.perf_counter()
+            count = len(await read(session))
+            best = min(best, time.perf_counter() - started)
+    return {"rows": count, "us_per_row": round(best / max(count, 1) * 1e6, 2)}
+
+
+async def run(args: argparse.Namespace) -> Dict:
+    workdir = tempfile.mkdtemp(prefix="sentinel-bench-")
+    engine = create_async_engine(f"sqlite+aiosqlite:///{os.path.join(workdir, 'projection.db')}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    now = datetime.now(timezone.utc)
+    await _seed(session_factory, args.rows, args.seed, now)
+    cutoff = now - timedelta(hours=2)
+
+    readers = {
+        "incidents": {
+            "orm": lambda s: _orm_incidents(s, cutoff),
+            "projection": lambda s: IncidentRepository(s).get_since(cutoff),
+        },
+        "plans": {
+            "orm": lambda s: _orm_plans(s, args.rows),
+            "projection": lambda s: PlanRepository(s).get_executed_with_source(limit=args.rows),
+        },
+    }
+    results = {}
+    for name, paths in readers.items():
+        orm = await _best_per_row(session_factory, paths["orm"], args.repeat)
+        projection = await _best_per_row(session_factory, paths["projection"], args.repeat)
+        results[name] = {
+            "orm": orm,
+            "projection": projection,
+            "speedup": round(orm["us_per_row"] / projection["us_per_row"], 1),
+        }
+    await engine.dispose()
+    return {"benchmark": "projection", "rows": args.rows, "repeat": args.repeat, "results": results}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.bench.projection", description=__doc__.split("\n\n")[0]
+    )
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=5, help="Report the best of N reads")
+    parser.add_argument("--seed", type=int, default=42)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = build_parser().parse_args(argv)
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Rule matching cost versus rule count: linear scan vs. CompiledRuleSet.
+
+Generates synthetic declarative rules (keywords, literal and glob sources,
+severities, metadata thresholds, a few regexes) ahead of COMMON_RULES, then
+matches the same simulator alerts with the old first-match linear scan and
+with the compiled index, checking both pick the same rule.
+
+    python -m app.bench.rules --rules 100 1000 10000 --alerts 2000
+"""
+import argparse
+import json
+import random
+import time
+from typing import List
+
+from app.core.entities import ActionType, AlertSeverity
+from app.modules.analysis.compiled import CompiledRuleSet
+from app.modules.analysis.rules import COMMON_RULES, DeclarativeRule, MetadataCondition, Rule
+from app.modules.ingestion import AlertSimulator
+
+
+def synthetic_rules(count: int, seed: int = 42) -> List[DeclarativeRule]:
+    rng = random.Random(seed)
+    severities = list(AlertSeverity)
+    rules = []
+    for i in range(count):
+        kind = i % 10
+        kwargs = {}
+        if kind < 6:
+            kwargs["keywords"] = [f"svc{i}-err", f"code-{i:05d}"]
+        elif kind < 8:
+            kwargs["sources"] = [f"host-{i}"]
+            kwargs["metadata"] = [MetadataCondition("cpu_usage", ">=", rng.randint(50, 99))]
+        elif kind < 9:
+            kwargs["severities"] = [rng.choice(severities)]
+            kwargs["metadata"] = [MetadataCondition("error_code", "==", 10000 + i)]
+        else:
+            kwargs["keywords"] = [f"job{i}"]
+            kwargs["pattern"] = rf"job{i} failed after \d+ retries"
+        rules.append(
+            DeclarativeRule(
+                name=f"synthetic-{i}",
+                root_cause_template="Synthetic rule",
+                suggested_actions=[ActionType.NOTIFICATION],
+                **kwargs,
+            )
+        )
+    return rules
+
+
+def _linear_match(rules: List[Rule], alert):
+    for rule in rules:
+        if rule.match(alert):
+            return rule
+    return None
+
+
+def _time(fn, alerts) -> float:
+    started = time.perf_counter()
+    for alert in alerts:
+        fn(alert)
+    return (time.perf_counter() - started) / len(alerts)
+
+
+def run(args: argparse.Namespace) -> dict:
+    random.seed(args.seed)
+    simulator = AlertSimulator(seed=args.seed)
+    alerts = [simulator._generate_random_alert() for _ in range(args.alerts)]
+    results = []
+    for count in args.rules:
+        rules = synthetic_rules(count, args.seed) + list(COMMON_RULES)
+        started = time.perf_counter()
+        compiled = CompiledRuleSet(rules)
+        compile_seconds = time.perf_counter() - started
+        for alert in alerts[:200]:
+            assert compiled.match(alert) is _linear_match(rules, alert), alert
+        linear = _time(lambda a: _linear_match(rules, a), alerts)
+        indexed = _time(compiled.match, alerts)
+        results.append(
+            {
+                "rules": len(rules),
+                "compile_ms": round(compile_seconds * 1000, 1),
+                "linear_us_per_alert": round(linear * 1e6, 2),
+                "compiled_us_per_alert": round(indexed * 1e6, 2),
+                "speedup": round(linear / indexed, 1),
+            }
+        )
+    return {"benchmark": "rules", "alerts": args.alerts, "results": results}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rules", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--alerts", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    print(json.dumps(run(args), indent=2))
+
+
+if __name__ == "__main__":
+    main()
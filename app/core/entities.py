@@ -30,6 +30,9 @@ class Alert(BaseModel):
     severity: AlertSeverity
     message: str
     metadata: Dict[str, Any] = Field(default_factory=dict)
+    # Number of identical alerts (same fingerprint) this one stands for after
+    # dedup coalescing. 1 for a fresh alert.
+    occurrences: int = Field(default=1, ge=1)
 
 class Diagnosis(BaseModel):
     alert_id: str
@@ -38,6 +41,9 @@ class Diagnosis(BaseModel):
     alternative_hypotheses: List[str] = Field(default_factory=list)
     reasoning_trace: str = ""
     suggested_actions: List[ActionType]
+    # Which analysis path produced this diagnosis (e.g. "rule", "rule_tier", "llm",
+    # "llm_cache", "rule_fallback", "rule_deadline"). Recorded in the audit trail.
+    analysis_path: Optional[str] = None
 
 class RemediationPlan(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
@@ -64,6 +70,9 @@ class EnrichedContext(BaseModel):
     alert: Alert
     recent_similar_incidents: List[Incident] = Field(default_factory=list)
     past_remediations_for_source: List[RemediationPlan] = Field(default_factory=list)
+    # Set by TieredAnalyzer when the rule tier hands the alert to the LLM
+    # (e.g. "no_rule_match", "low_confidence", "recurrence").
+    escalation_reason: Optional[str] = None
 
 
 class AuditLog(BaseModel):
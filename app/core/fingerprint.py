@@ -0,0 +1,19 @@
+"""
+Alert fingerprinting.
+
+Two alerts share a fingerprint when they come from the same source, at the same
+severity, with the same (case/whitespace-normalized) message and the same
+metadata *shape* (set of top-level keys — values such as cpu_usage=95 vs 97 are
+ignored). Used by the ingestion dedup window and by analysis caches.
+"""
+import hashlib
+
+from .entities import Alert
+
+
+def alert_fingerprint(alert: Alert) -> str:
+    """Return a stable 32-char hex fingerprint for the alert."""
+    message = " ".join(alert.message.lower().split())
+    shape = ",".join(sorted(alert.metadata))
+    raw = "\x1f".join((alert.source, alert.severity.value, message, shape))
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
@@ -4,11 +4,17 @@ SQLAlchemy ORM models for the Sentinel persistence layer.
 These are internal implementation details of the infrastructure layer.
 External code (core, modules) must never import from this file directly;
 all communication goes through the Repository interfaces.
+
+On PostgreSQL the schema is owned by the Alembic migrations: there,
+incidents and audit_logs are range-partitioned by time with the partition
+key in their primary keys, and remediation_plans.incident_id has no foreign
+key (see migration e3b4f1a9c2d7). These models describe the columns the
+application reads and writes, and create the plain tables used on SQLite.
 """
 import uuid
 from datetime import datetime, timezone
 
-from sqlalchemy import Boolean, Column, DateTime, Float, ForeignKey, String
+from sqlalchemy import JSON, Boolean, Column, DateTime, Float, ForeignKey, Index, String
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import DeclarativeBase, relationship
 from sqlalchemy import Enum as SQLEnum
@@ -16,6 +22,10 @@ from sqlalchemy import Enum as SQLEnum
 from app.core.entities import ActionType, AlertSeverity, RiskLevel
 
 
+# JSONB on PostgreSQL, plain JSON elsewhere (SQLite for tests and benchmarks).
+_JSONB = JSON().with_variant(JSONB(), "postgresql")
+
+
 class Base(DeclarativeBase):
     """Shared declarative base for all Sentinel ORM models."""
     pass
@@ -31,11 +41,11 @@ class IncidentModel(Base):
     id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     alert_id = Column(String(36), nullable=False, index=True)
     status = Column(String, default="OPEN", index=True)
-    source = Column(String, nullable=False, index=True)
+    source = Column(String, nullable=False)
     severity = Column(SQLEnum(AlertSeverity), nullable=False)
     message = Column(String, nullable=False)
-    metadata_json = Column(JSONB, default=dict)
-    enriched_context = Column(JSONB, default=dict)
+    metadata_json = Column(_JSONB, default=dict)
+    enriched_context = Column(_JSONB, default=dict)
     rca_hypothesis = Column(String, nullable=True)
     created_at = Column(
         DateTime(timezone=True),
@@ -44,6 +54,17 @@ class IncidentModel(Base):
     )
     closed_at = Column(DateTime(timezone=True), nullable=True)
 
+    # Composite indexes behind get_recent_similar's UNION form (see repositories);
+    # INCLUDE (id) makes each branch an index-only scan on PostgreSQL.
+    __table_args__ = (
+        Index(
+            "ix_incidents_source_created_at", source, created_at.desc(), postgresql_include=["id"]
+        ),
+        Index(
+            "ix_incidents_severity_created_at", severity, created_at.desc(), postgresql_include=["id"]
+        ),
+    )
+
     plans = relationship(
         "RemediationPlanModel",
         back_populates="incident",
@@ -76,6 +97,15 @@ class RemediationPlanModel(Base):
         default=lambda: datetime.now(timezone.utc),
     )
 
+    __table_args__ = (
+        Index(
+            "ix_remediation_plans_incident_status_created_at",
+            incident_id,
+            status,
+            created_at.desc(),
+        ),
+    )
+
     incident = relationship("IncidentModel", back_populates="plans")
 
 
@@ -94,4 +124,4 @@ class AuditLogModel(Base):
     )
     component = Column(String, nullable=False, index=True)
     event = Column(String, nullable=False, index=True)
-    details = Column(JSONB, nullable=False)
+    details = Column(_JSONB, nullable=False)
@@ -0,0 +1,311 @@
+"""
+Range-partition maintenance for the time-series tables (PostgreSQL only).
+
+After migration e3b4f1a9c2d7, ``incidents`` (by ``created_at``) and
+``audit_logs`` (by ``timestamp``) are natively range-partitioned, one
+partition per day or per month (``PARTITION_INTERVAL``), plus a DEFAULT
+partition for anything outside the created ranges. Partitions created here
+are named after their lower bound: ``incidents_p202610`` (month) or
+``audit_logs_p20261017`` (day).
+
+PartitionMaintainer runs periodically, in one transaction per table, and:
+
+    - pre-creates the current and the next ``precreate`` partitions, so rows
+      never land in the DEFAULT partition. Existing partitions are matched by
+      their actual bounds (``pg_get_expr(relpartbound)``), not their names,
+      so a range already covered by a differently sized partition is left
+      alone. Rows that did land in DEFAULT for a new range are moved into
+      the new partition as it is created;
+    - only when a retention is configured (it is off by default), detaches
+      partitions that lie entirely before ``now - retention`` and, unless
+      ``detach_only``, drops them (with the remediation plans of the dropped
+      incidents). A detached partition stays behind as a plain table for
+      archiving.
+
+Queries that filter on the partition key (``get_recent_similar``,
+``get_since`` and the ``since`` bound of the plan history reads) only touch
+the partitions for that range.
+"""
+import asyncio
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from app.core.logging import logger
+
+# Partitioned table -> partition key column.
+PARTITIONED_TABLES: Dict[str, str] = {"incidents": "created_at", "audit_logs": "timestamp"}
+INTERVALS = ("day", "month")
+
+
+def floor_bound(moment: datetime, interval: str) -> datetime:
+    """Lower bound of the partition that contains ``moment`` (UTC)."""
+    moment = moment.astimezone(timezone.utc)
+    if interval == "day":
+        return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    if interval == "month":
+        return moment.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    raise ValueError(f"interval must be one of {INTERVALS}, got {interval!r}")
+
+
+def next_bound(lower: datetime, interval: str) -> datetime:
+    if interval == "day":
+        return lower + timedelta(days=1)
+    if lower.month == 12:
+        return lower.replace(year=lower.year + 1, month=1)
+    return lower.replace(month=lower.month + 1)
+
+
+def partition_ranges(start: datetime, end: datetime, interval: str) -> Iterator[Tuple[datetime, datetime]]:
+    """Consecutive (lower, upper) partition bounds covering [start, end]."""
+    lower = floor_bound(start, interval)
+    while lower <= end:
+        upper = next_bound(lower, interval)
+        yield lower, upper
+        lower = upper
+
+
+def partition_name(table: str, lower: datetime, interval: str) -> str:
+    return f"{table}_p{lower:%Y%m%d}" if interval == "day" else f"{table}_p{lower:%Y%m}"
+
+
+def create_partition_sql(table: str, lower: datetime, upper: datetime, interval: str) -> str:
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(table, lower, interval)} PARTITION OF {table} "
+        f"FOR VALUES FROM ('{lower.isoformat()}') TO ('{upper.isoformat()}')"
+    )
+
+
+class PartitionBound(NamedTuple):
+    name: str
+    lower: Optional[datetime]  # None: MINVALUE (or the DEFAULT partition).
+    upper: Optional[datetime]  # None: MAXVALUE (or the DEFAULT partition).
+    is_default: bool = False
+
+    def overlaps(self, lower: datetime, upper: datetime) -> bool:
+        if self.is_default:
+            return False
+        return (self.lower is None or self.lower < upper) and (self.upper is None or lower < self.upper)
+
+
+_RANGE_BOUND = re.compile(r"FOR VALUES FROM \((.+)\) TO \((.+)\)")
+
+
+def _bound_value(value: str) -> Optional[datetime]:
+    value = value.strip()
+    if value in ("MINVALUE", "MAXVALUE"):
+        return None
+    moment = datetime.fromisoformat(value.strip("'"))
+    return moment if moment.tzinfo else moment.replace(tzinfo=timezone.utc)
+
+
+def parse_partition_bound(name: str, expression: str) -> PartitionBound:
+    """Bounds of a partition from its ``pg_get_expr(relpartbound, oid)`` text."""
+    if expression.strip() == "DEFAULT":
+        return PartitionBound(name, None, None, is_default=True)
+    match = _RANGE_BOUND.fullmatch(expression.strip())
+    if match is None:
+        raise ValueError(f"unsupported partition bound for {name}: {expression!r}")
+    return PartitionBound(name, _bound_value(match.group(1)), _bound_value(match.group(2)))
+
+
+async def partition_bounds(conn: AsyncConnection, table: str) -> List[PartitionBound]:
+    """Attached partitions of ``table`` with their bounds, ordered by name."""
+    result = await conn.execute(
+        text(
+            "SELECT child.relname, pg_get_expr(child.relpartbound, child.oid) FROM pg_inherits "
+            "JOIN pg_class parent ON pg_inherits.inhparent = parent.oid "
+            "JOIN pg_class child ON pg_inherits.inhrelid = child.oid "
+            "WHERE parent.relname = :table ORDER BY child.relname"
+        ),
+        {"table": table},
+    )
+    return [parse_partition_bound(name, expression) for name, expression in result]
+
+
+async def ensure_partitions(
+    conn: AsyncConnection, table: str, interval: str, start: datetime, end: datetime
+) -> List[str]:
+    """Create the missing partitions covering [start, end]; returns the names created."""
+    bounds = await partition_bounds(conn, table)
+    default = next((bound.name for bound in bounds if bound.is_default), None)
+    created = []
+    for lower, upper in partition_ranges(start, end, interval):
+        overlapping = [bound.name for bound in bounds if bound.overlaps(lower, upper)]
+        if overlapping:
+            exact = any(bound.lower == lower and bound.upper == upper for bound in bounds)
+            if not exact:
+                # E.g. PARTITION_INTERVAL changed: the old partitions keep covering their range.
+                logger.info(
+                    "Partition range already covered",
+                    extra={"table": table, "lower": lower.isoformat(), "partitions": overlapping},
+                )
+            continue
+        if default is not None and await _default_has_rows(conn, table, default, lower, upper):
+            await _create_from_default(conn, table, default, lower, upper, interval)
+        else:
+            await conn.execute(text(create_partition_sql(table, lower, upper, interval)))
+        created.append(partition_name(table, lower, interval))
+    return created
+
+
+async def _default_has_rows(
+    conn: AsyncConnection, table: str, default: str, lower: datetime, upper: datetime
+) -> bool:
+    key = PARTITIONED_TABLES[table]
+    result = await conn.execute(
+        text(f'SELECT EXISTS (SELECT 1 FROM {default} WHERE "{key}" >= :lower AND "{key}" < :upper)'),
+        {"lower": lower, "upper": upper},
+    )
+    return bool(result.scalar())
+
+
+async def _create_from_default(
+    conn: AsyncConnection, table: str, default: str, lower: datetime, upper: datetime, interval: str
+) -> None:
+    """
+    Create a partition for rows that already landed in DEFAULT.
+
+    PostgreSQL refuses to add a partition whose range has rows in the DEFAULT
+    partition, so the new table is filled with those rows first and attached
+    afterwards.
+    """
+    key = PARTITIONED_TABLES[table]
+    name = partition_name(table, lower, interval)
+    await conn.execute(text(f"CREATE TABLE {name} (LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"))
+    moved = await conn.execute(
+        text(
+            f'WITH moved AS (DELETE FROM {default} WHERE "{key}" >= :lower AND "{key}" < :upper RETURNING *) '
+            f"INSERT INTO {name} SELECT * FROM moved"
+        ),
+        {"lower": lower, "upper": upper},
+    )
+    await conn.execute(
+        text(
+            f"ALTER TABLE {table} ATTACH PARTITION {name} "
+            f"FOR VALUES FROM ('{lower.isoformat()}') TO ('{upper.isoformat()}')"
+        )
+    )
+    logger.info("Moved rows out of the default partition", extra={"partition": name, "rows": moved.rowcount})
+
+
+async def expire_partitions(
+    conn: AsyncConnection, table: str, cutoff: datetime, detach_only: bool = True
+) -> List[str]:
+    """Detach (and unless ``detach_only`` drop) partitions entirely older than ``cutoff``."""
+    expired = []
+    for bound in await partition_bounds(conn, table):
+        name = bound.name
+        if bound.is_default or bound.upper is None:
+            continue
+        if bound.upper <= cutoff:
+            await conn.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+            if not detach_only:
+                if table == "incidents":
+                    # What the dropped foreign key's ON DELETE CASCADE used to do.
+                    await conn.execute(
+                        text(f"DELETE FROM remediation_plans WHERE incident_id IN (SELECT id FROM {name})")
+                    )
+                await conn.execute(text(f"DROP TABLE {name}"))
+            expired.append(name)
+    return expired
+
+
+class PartitionMaintainer:
+    """Keeps future partitions created and expired ones detached/dropped, on a timer."""
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        interval: str = "month",
+        precreate: int = 3,
+        retention_days: Optional[Dict[str, float]] = None,
+        detach_only: bool = True,
+        run_interval_seconds: float = 3600.0,
+    ) -> None:
+        if interval not in INTERVALS:
+            raise ValueError(f"interval must be one of {INTERVALS}, got {interval!r}")
+        self._engine = engine
+        self.interval = interval
+        self.precreate = precreate
+        # Table -> days to keep; missing or 0 keeps everything.
+        self.retention_days = retention_days or {}
+        self.detach_only = detach_only
+        self.run_interval_seconds = run_interval_seconds
+        self._task: Optional[asyncio.Task] = None
+        self.last_run: Optional[dict] = None
+        self.failures = 0
+
+    async def run_once(self, now: Optional[datetime] = None) -> dict:
+        now = now or datetime.now(timezone.utc)
+        horizon = now
+        for _ in range(self.precreate):
+            horizon = next_bound(floor_bound(horizon, self.interval), self.interval)
+        report = {"created": [], "expired": [], "failed": []}
+        for table in PARTITIONED_TABLES:
+            # One transaction per table: its DDL locks only that table, and one
+            # table failing does not roll back the other's partitions.
+            try:
+                async with self._engine.begin() as conn:
+                    created = await ensure_partitions(conn, table, self.interval, now, horizon)
+                    expired = []
+                    days = self.retention_days.get(table)
+                    if days:
+                        expired = await expire_partitions(
+                            conn, table, now - timedelta(days=days), self.detach_only
+                        )
+            except Exception as exc:
+                self.failures += 1
+                report["failed"].append(table)
+                logger.warning(
+                    "Partition maintenance failed", extra={"table": table, "error": str(exc)[:200]}
+                )
+                continue
+            report["created"] += created
+            report["expired"] += expired
+        if report["created"] or report["expired"]:
+            # LogRecord reserves "created" (and "name", "msg", ...): extra keys must not clash.
+            logger.info(
+                "Partition maintenance",
+                extra={
+                    "partitions_created": report["created"],
+                    "partitions_expired": report["expired"],
+                    "tables_failed": report["failed"],
+                },
+            )
+        self.last_run = {"at": now.isoformat(), **report}
+        return report
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "interval": self.interval,
+            "retention_days": self.retention_days,
+            "detach_only": self.detach_only,
+            "last_run": self.last_run,
+            "failures": self.failures,
+        }
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception as exc:
+                self.failures += 1
+                logger.warning("Partition maintenance failed", extra={"error": str(exc)[:200]})
+            await asyncio.sleep(self.run_interval_seconds)
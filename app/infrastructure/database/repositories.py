@@ -6,10 +6,12 @@ All repositories accept and return Pydantic domain entities from app.core.entiti
 The translation between Pydantic entity ↔ SQLAlchemy model happens EXCLUSIVELY
 inside each repository method. External callers never import or touch SQLAlchemy models.
 """
+import json
 from datetime import datetime, timedelta, timezone
-from typing import List, Optional
+from typing import List, Optional, Sequence, Tuple
 
-from sqlalchemy import and_, or_, select
+from sqlalchemy import and_, insert, select, union
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.entities import AlertSeverity, AuditLog, Diagnosis, Incident, RemediationPlan
@@ -19,6 +21,100 @@ from app.infrastructure.database.models import (
     RemediationPlanModel,
 )
 
+# History reads (context building, the history store) use Core column
+# projections instead of full ORM objects: no identity map, no unit-of-work
+# state and no JSONB metadata_json decode. Projected incidents carry empty
+# metadata. Entities are still built with the validating constructors: on
+# pydantic-core that is cheaper per row than model_construct.
+_INCIDENT_HISTORY_COLUMNS = (
+    IncidentModel.id,
+    IncidentModel.alert_id,
+    IncidentModel.source,
+    IncidentModel.severity,
+    IncidentModel.message,
+    IncidentModel.status,
+    IncidentModel.created_at,
+    IncidentModel.closed_at,
+)
+_PLAN_HISTORY_COLUMNS = (
+    RemediationPlanModel.id,
+    RemediationPlanModel.diagnosis_root_cause,
+    RemediationPlanModel.diagnosis_confidence,
+    RemediationPlanModel.action_type,
+    RemediationPlanModel.risk_level,
+    RemediationPlanModel.requires_approval,
+    RemediationPlanModel.status,
+)
+
+
+def _incident_from_row(row) -> Incident:
+    """Build an Incident from an _INCIDENT_HISTORY_COLUMNS row."""
+    return Incident(
+        id=row.id,
+        alert_id=row.alert_id,
+        source=row.source,
+        severity=row.severity,
+        message=row.message,
+        metadata={},
+        status=row.status,
+        created_at=row.created_at,
+        closed_at=row.closed_at,
+    )
+
+
+def _plan_from_row(row) -> RemediationPlan:
+    """Build a RemediationPlan from a _PLAN_HISTORY_COLUMNS row.
+
+    NOTE: alert_id and suggested_actions are not stored in the DB at this stage.
+    They are reconstructed with safe defaults for context-building purposes.
+    """
+    diagnosis = Diagnosis(
+        alert_id="",
+        root_cause=row.diagnosis_root_cause,
+        confidence=row.diagnosis_confidence,
+        suggested_actions=[],
+    )
+    return RemediationPlan(
+        id=row.id,
+        diagnosis=diagnosis,
+        action_type=row.action_type,
+        risk_level=row.risk_level,
+        requires_approval=row.requires_approval,
+        status=row.status,
+    )
+
+
+def recent_similar_query(source: str, severity: AlertSeverity, cutoff: datetime, limit: int):
+    """
+    ``source = ? OR severity = ?`` newest-first, written as a UNION of two
+    top-N range scans over the (source, created_at) and (severity, created_at)
+    indexes. The OR form cannot use either index for both the filter and the
+    ORDER BY, so it scanned and sorted the whole time window. Only the final
+    ``limit`` ids are joined back to the table, projected to
+    _INCIDENT_HISTORY_COLUMNS.
+    """
+    def newest(condition):
+        return (
+            select(IncidentModel.id, IncidentModel.created_at)
+            .where(condition, IncidentModel.created_at >= cutoff)
+            .order_by(IncidentModel.created_at.desc())
+            .limit(limit)
+            .subquery()
+        )
+
+    by_source = newest(IncidentModel.source == source)
+    by_severity = newest(IncidentModel.severity == severity)
+    candidates = union(
+        select(by_source.c.id, by_source.c.created_at),
+        select(by_severity.c.id, by_severity.c.created_at),
+    ).subquery()
+    return (
+        select(*_INCIDENT_HISTORY_COLUMNS)
+        .join(candidates, IncidentModel.id == candidates.c.id)
+        .order_by(IncidentModel.created_at.desc())
+        .limit(limit)
+    )
+
 
 class IncidentRepository:
     """Persists and retrieves Incident domain entities."""
@@ -48,6 +144,26 @@ class IncidentRepository:
         await self.session.flush()
         return incident
 
+    async def save_many(self, incidents: Sequence[Incident]) -> None:
+        """Persist many Incident entities with one multi-row INSERT (no ORM objects)."""
+        await self.session.execute(
+            insert(IncidentModel),
+            [
+                {
+                    "id": incident.id,
+                    "alert_id": incident.alert_id,
+                    "source": incident.source,
+                    "severity": incident.severity,
+                    "message": incident.message,
+                    "metadata_json": incident.metadata,
+                    "status": incident.status,
+                    "created_at": incident.created_at,
+                    "closed_at": incident.closed_at,
+                }
+                for incident in incidents
+            ],
+        )
+
     async def get_by_id(self, incident_id: str) -> Optional[Incident]:
         """Retrieve an Incident entity by its ID, or None if not found."""
         result = await self.session.execute(
@@ -67,18 +183,43 @@ class IncidentRepository:
     ) -> List[Incident]:
         """Return incidents matching source OR severity within the last N hours."""
         cutoff = datetime.now(timezone.utc) - timedelta(hours=hours)
+        result = await self.session.execute(recent_similar_query(source, severity, cutoff, limit))
+        return [_incident_from_row(row) for row in result.all()]
+
+    async def get_recent(
+        self,
+        source: Optional[str] = None,
+        severity: Optional[AlertSeverity] = None,
+        hours: int = 24,
+        limit: int = 10,
+    ) -> List[Incident]:
+        """Newest incidents with this source and/or severity within the last N hours.
+
+        One half of ``get_recent_similar``: HistoryCache caches the by-source and
+        by-severity halves separately and merges them.
+        """
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=hours)
+        conditions = [IncidentModel.created_at >= cutoff]
+        if source is not None:
+            conditions.append(IncidentModel.source == source)
+        if severity is not None:
+            conditions.append(IncidentModel.severity == severity)
         result = await self.session.execute(
-            select(IncidentModel)
-            .where(
-                and_(
-                    or_(IncidentModel.source == source, IncidentModel.severity == severity),
-                    IncidentModel.created_at >= cutoff,
-                )
-            )
+            select(*_INCIDENT_HISTORY_COLUMNS)
+            .where(*conditions)
             .order_by(IncidentModel.created_at.desc())
             .limit(limit)
         )
-        return [self._to_entity(m) for m in result.scalars().all()]
+        return [_incident_from_row(row) for row in result.all()]
+
+    async def get_since(self, cutoff: datetime) -> List[Incident]:
+        """Return every incident created at or after ``cutoff``, oldest first."""
+        result = await self.session.execute(
+            select(*_INCIDENT_HISTORY_COLUMNS)
+            .where(IncidentModel.created_at >= cutoff)
+            .order_by(IncidentModel.created_at)
+        )
+        return [_incident_from_row(row) for row in result.all()]
 
     def _to_entity(self, db_model: IncidentModel) -> Incident:
         """Translate an ORM model to a Pydantic Incident entity."""
@@ -122,46 +263,61 @@ class PlanRepository:
         await self.session.flush()
         return plan
 
+    async def save_many(self, plans: Sequence[Tuple[str, RemediationPlan]]) -> None:
+        """Persist many (incident_id, plan) pairs with one multi-row INSERT."""
+        await self.session.execute(
+            insert(RemediationPlanModel),
+            [
+                {
+                    "id": plan.id,
+                    "incident_id": incident_id,
+                    "diagnosis_root_cause": plan.diagnosis.root_cause,
+                    "diagnosis_confidence": plan.diagnosis.confidence,
+                    "action_type": plan.action_type,
+                    "risk_level": plan.risk_level,
+                    "requires_approval": plan.requires_approval,
+                    "status": plan.status,
+                }
+                for incident_id, plan in plans
+            ],
+        )
+
     async def get_past_executed_for_source(
-        self, source: str, limit: int = 5
+        self, source: str, limit: int = 5, since: Optional[datetime] = None
     ) -> List[RemediationPlan]:
-        """Return the last N executed plans for incidents from the given source."""
+        """Return the last N executed plans for incidents from the given source.
+
+        ``since`` bounds the incidents' created_at, which lets PostgreSQL prune
+        the incidents partitions outside that range.
+        """
+        conditions = [IncidentModel.source == source, RemediationPlanModel.status == "EXECUTED"]
+        if since is not None:
+            conditions.append(IncidentModel.created_at >= since)
         result = await self.session.execute(
-            select(RemediationPlanModel)
+            select(*_PLAN_HISTORY_COLUMNS)
             .join(IncidentModel, RemediationPlanModel.incident_id == IncidentModel.id)
-            .where(
-                and_(
-                    IncidentModel.source == source,
-                    RemediationPlanModel.status == "EXECUTED",
-                )
-            )
+            .where(and_(*conditions))
             .order_by(RemediationPlanModel.created_at.desc())
             .limit(limit)
         )
-        return [self._to_entity(m) for m in result.scalars().all()]
-
-    def _to_entity(self, db_model: RemediationPlanModel) -> RemediationPlan:
-        """Translate an ORM model to a Pydantic RemediationPlan entity.
+        return [_plan_from_row(row) for row in result.all()]
 
-        NOTE: alert_id and suggested_actions are not stored in the DB at this stage.
-        They are reconstructed with safe defaults for context-building purposes.
-        """
-        diagnosis = Diagnosis(
-            alert_id="",
-            root_cause=db_model.diagnosis_root_cause,
-            confidence=db_model.diagnosis_confidence,
-            alternative_hypotheses=[],
-            reasoning_trace="",
-            suggested_actions=[],
-        )
-        return RemediationPlan(
-            id=db_model.id,
-            diagnosis=diagnosis,
-            action_type=db_model.action_type,
-            risk_level=db_model.risk_level,
-            requires_approval=db_model.requires_approval,
-            status=db_model.status,
+    async def get_executed_with_source(
+        self, limit: int = 10_000, since: Optional[datetime] = None
+    ) -> List[Tuple[str, RemediationPlan]]:
+        """Return the latest N executed plans across all sources as (source, plan), newest first."""
+        conditions = [RemediationPlanModel.status == "EXECUTED"]
+        if since is not None:
+            conditions.append(IncidentModel.created_at >= since)
+        result = await self.session.execute(
+            select(IncidentModel.source, *_PLAN_HISTORY_COLUMNS)
+            .select_from(RemediationPlanModel)
+            .join(IncidentModel, RemediationPlanModel.incident_id == IncidentModel.id)
+            .where(and_(*conditions))
+            .order_by(RemediationPlanModel.created_at.desc())
+            .limit(limit)
         )
+        return [(row.source, _plan_from_row(row)) for row in result.all()]
 
 
 class AuditRepository:
@@ -187,3 +343,48 @@ class AuditRepository:
         self.session.add(db_model)
         await self.session.flush()
         return audit_entity
+
+    async def log_events(self, audit_entities: Sequence[AuditLog], skip_existing: bool = False) -> None:
+        """
+        Persist many AuditLog entities with one multi-row INSERT.
+
+        With ``skip_existing``, ids already in the table are ignored (ON CONFLICT
+        DO NOTHING on PostgreSQL and SQLite), so a batch can be replayed safely.
+        """
+        statement = insert(AuditLogModel)
+        if skip_existing:
+            dialect = self.session.get_bind().dialect.name
+            if dialect == "postgresql":
+                statement = postgresql.insert(AuditLogModel).on_conflict_do_nothing()
+            elif dialect == "sqlite":
+                statement = sqlite.insert(AuditLogModel).on_conflict_do_nothing()
+        await self.session.execute(statement, [self._to_row(entity) for entity in audit_entities])
+
+    async def copy_events(self, audit_entities: Sequence[AuditLog]) -> None:
+        """
+        Persist many AuditLog entities with the PostgreSQL COPY protocol.
+
+        asyncpg only. JSONB goes through the codec SQLAlchemy registers on the
+        connection, which takes already-serialized JSON text.
+        """
+        connection = await self.session.connection()
+        raw = await connection.get_raw_connection()
+        columns = ("id", "timestamp", "component", "event", "details")
+        await raw.driver_connection.copy_records_to_table(
+            AuditLogModel.__tablename__,
+            columns=columns,
+            records=[
+                (e.id, e.timestamp, e.component, e.event, json.dumps(e.details))
+                for e in audit_entities
+            ],
+        )
+
+    @staticmethod
+    def _to_row(entity: AuditLog) -> dict:
+        return {
+            "id": entity.id,
+            "timestamp": entity.timestamp,
+            "component": entity.component,
+            "event": entity.event,
+            "details": entity.details,
+        }
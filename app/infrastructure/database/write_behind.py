@@ -0,0 +1,312 @@
+"""
+WriteBehindPersister: batched, off-the-hot-path persistence of pipeline records.
+
+The pipeline hands incidents, remediation plans and audit events to the
+persister and moves on; a background task writes them in batches, with one
+multi-row INSERT per table and one transaction per flush. A flush happens
+every ``flush_interval_seconds`` or as soon as ``max_batch`` records are
+waiting, whichever comes first.
+
+Records are flushed in arrival order, and inside a batch incidents are
+inserted before plans, so a plan's incident row always exists by the time the
+plan is written.
+
+Producers never wait on the database:
+
+    - The buffer is bounded at ``max_buffer`` records. When it is full, the
+      oldest record is dropped and counted as ``overflowed``. Plans whose
+      incident was dropped this way are dropped when they come up.
+    - If the database is unreachable (connection errors, timeouts), the batch
+      goes back to the front of the buffer and the breaker opens. Flushes
+      skip the database for ``retry_backoff_seconds``, and the pause doubles
+      on each consecutive failure up to ``max_backoff_seconds``.
+    - Any other failure (a bad record) is retried one table at a time. Only
+      the failing table's records are dropped, together with the plans of
+      dropped incidents, so one bad batch cannot wedge the queue.
+    - ``on_flushed(incidents, plans)`` runs after each successful commit. main.py
+      uses it to invalidate the context HistoryCache.
+    - ``close()`` stops the background task and flushes what is left (lifespan
+      shutdown).
+
+Also implements IAuditModule, so it can take the place of the per-event
+PostgresAuditService.
+"""
+import asyncio
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+from sqlalchemy.exc import InterfaceError, OperationalError
+
+from app.core.entities import AuditLog, Incident, RemediationPlan
+from app.core.interfaces import IAuditModule
+from app.core.logging import logger
+from app.core.metrics import registry
+from app.infrastructure.database.repositories import (
+    AuditRepository,
+    IncidentRepository,
+    PlanRepository,
+)
+
+FLUSH_SECONDS = registry.histogram(
+    "sentinel_write_behind_flush_seconds", "Time to write one write-behind batch (including retries)."
+)
+RECORDS_TOTAL = registry.counter(
+    "sentinel_write_behind_records_total", "Records handled by the write-behind persister, by outcome.",
+    ["outcome"],
+)
+
+_INCIDENT, _PLAN, _AUDIT = "incident", "plan", "audit"
+# Failures that mean "database unreachable" rather than "bad records".
+_UNAVAILABLE = (OSError, asyncio.TimeoutError, OperationalError, InterfaceError)
+# (source, plan) pairs, as PlanRepository.get_executed_with_source returns them.
+FlushCallback = Callable[[List[Incident], List[Tuple[str, RemediationPlan]]], None]
+
+
+def _records(incidents=(), plans=(), audits=()) -> List[Tuple[str, tuple]]:
+    """Buffer entries for the given records, incidents first."""
+    return (
+        [(_INCIDENT, (incident,)) for incident in incidents]
+        + [(_PLAN, plan) for plan in plans]
+        + [(_AUDIT, (log,)) for log in audits]
+    )
+
+
+class _Unwritten(Exception):
+    """The database went away partway through a per-table write."""
+
+    def __init__(self, error: BaseException, records: List[Tuple[str, tuple]]) -> None:
+        super().__init__(str(error))
+        self.error = error
+        self.records = records
+
+
+class WriteBehindPersister(IAuditModule):
+    """Buffers pipeline records and writes them in batched transactions."""
+
+    def __init__(
+        self,
+        session_factory: Callable,
+        max_batch: int = 500,
+        flush_interval_seconds: float = 0.5,
+        max_buffer: int = 10_000,
+        retry_backoff_seconds: float = 0.5,
+        max_backoff_seconds: float = 30.0,
+        on_flushed: Optional[FlushCallback] = None,
+    ) -> None:
+        self._session_factory = session_factory
+        self.max_batch = max_batch
+        self.flush_interval_seconds = flush_interval_seconds
+        self.max_buffer = max_buffer
+        self.retry_backoff_seconds = retry_backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self.on_flushed = on_flushed
+        self._buffer: Deque[Tuple[str, tuple]] = deque()
+        # Incidents dropped on overflow whose plans may still be buffered (ordered set).
+        self._orphaned: Dict[str, None] = {}
+        self._wake = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+        self._failures = 0
+        self._retry_at = 0.0
+        self._written = RECORDS_TOTAL.labels(outcome="written")
+        self._dropped = RECORDS_TOTAL.labels(outcome="dropped")
+        self._overflowed = RECORDS_TOTAL.labels(outcome="overflowed")
+        self.written = 0
+        self.dropped = 0
+        self.overflowed = 0
+        self.flushes = 0
+        self.retries = 0
+
+    # -- producers ---------------------------------------------------------
+
+    async def add_incident(self, incident: Incident) -> None:
+        self._put(_INCIDENT, (incident,))
+
+    async def add_plan(self, plan: RemediationPlan, incident_id: str, source: str) -> None:
+        self._put(_PLAN, (incident_id, source, plan))
+
+    async def log_event(self, log: AuditLog) -> None:
+        self._put(_AUDIT, (log,))
+
+    def _put(self, kind: str, record: tuple) -> None:
+        self._buffer.append((kind, record))
+        self._trim()
+        if len(self._buffer) >= self.max_batch:
+            self._wake.set()
+
+    def _trim(self) -> None:
+        """Drop the oldest records beyond ``max_buffer``."""
+        while len(self._buffer) > self.max_buffer:
+            kind, record = self._buffer.popleft()
+            if kind == _INCIDENT:
+                self._orphaned[record[0].id] = None
+                while len(self._orphaned) > self.max_buffer:
+                    del self._orphaned[next(iter(self._orphaned))]
+            elif kind == _PLAN:
+                self._orphaned.pop(record[0], None)
+            self.overflowed += 1
+            self._overflowed.inc()
+
+    # -- lifecycle ---------------------------------------------------------
+
+    def start(self) -> None:
+        if self._task is None:
+            self._closing = False
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        """Stop the background flusher and write everything still buffered."""
+        self._closing = True
+        self._wake.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+        # Last chance at shutdown: try the database even if the breaker is open.
+        self._retry_at = 0.0
+        await self.flush()
+        if self._buffer:
+            logger.error("Write-behind records lost at shutdown", extra={"records": len(self._buffer)})
+
+    async def _run(self) -> None:
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.flush_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                await self.flush()
+            except Exception as exc:  # on_flushed raising must not kill the flusher.
+                logger.error("Write-behind flush failed", extra={"error": str(exc)[:200]})
+
+    # -- flushing ----------------------------------------------------------
+
+    @property
+    def breaker_open(self) -> bool:
+        return time.monotonic() < self._retry_at
+
+    async def flush(self) -> None:
+        """Write every buffered record now, ``max_batch`` at a time (nothing while the breaker is open)."""
+        async with self._flush_lock:
+            while self._buffer and not self.breaker_open:
+                count = min(self.max_batch, len(self._buffer))
+                batch = [self._buffer.popleft() for _ in range(count)]
+                unwritten = await self._write(batch)
+                if unwritten:
+                    # Back in front, in order; the bound still applies.
+                    self._buffer.extendleft(reversed(unwritten))
+                    self._trim()
+                    return
+
+    async def _write(self, batch: List[Tuple[str, tuple]]) -> List[Tuple[str, tuple]]:
+        """Write one batch; returns the records to retry later because the database is unreachable."""
+        incidents = [record[0] for kind, record in batch if kind == _INCIDENT]
+        plans = [record for kind, record in batch if kind == _PLAN]
+        audits = [record[0] for kind, record in batch if kind == _AUDIT]
+        if self._orphaned:
+            kept = [plan for plan in plans if plan[0] not in self._orphaned]
+            for incident_id, _, _ in plans:
+                self._orphaned.pop(incident_id, None)
+            self._drop(len(plans) - len(kept), "plans of overflowed incidents")
+            plans = kept
+        started = time.perf_counter()
+        try:
+            await self._commit(incidents, plans, audits)
+        except _UNAVAILABLE as exc:
+            self._open_breaker(exc, len(batch))
+            return batch
+        except Exception as exc:
+            logger.warning(
+                "Write-behind batch rejected, writing tables separately",
+                extra={"records": len(batch), "error": str(exc)[:200]},
+            )
+            try:
+                incidents, plans, audits = await self._write_per_table(incidents, plans, audits)
+            except _Unwritten as unwritten:
+                self._open_breaker(unwritten.error, len(unwritten.records))
+                return unwritten.records
+        self._failures = 0
+        FLUSH_SECONDS.observe(time.perf_counter() - started)
+        self.flushes += 1
+        written = len(incidents) + len(plans) + len(audits)
+        self.written += written
+        self._written.inc(written)
+        if self.on_flushed is not None:
+            self.on_flushed(incidents, [(source, plan) for _, source, plan in plans])
+        return []
+
+    async def _commit(self, incidents: List[Incident], plans: List[tuple], audits: List[AuditLog]) -> None:
+        async with self._session_factory() as session:
+            if incidents:
+                await IncidentRepository(session).save_many(incidents)
+            if plans:
+                await PlanRepository(session).save_many([(incident_id, plan) for incident_id, _, plan in plans])
+            if audits:
+                await AuditRepository(session).log_events(audits)
+            await session.commit()
+
+    async def _write_per_table(self, incidents, plans, audits):
+        """One transaction per table; drops only the table that fails (and plans of dropped incidents).
+
+        Raises _Unwritten with the tables not yet committed if the database goes away midway.
+        """
+        if incidents:
+            try:
+                await self._commit(incidents, [], [])
+            except _UNAVAILABLE as exc:
+                raise _Unwritten(exc, _records(incidents, plans, audits))
+            except Exception as exc:
+                dropped = {incident.id for incident in incidents}
+                kept = [plan for plan in plans if plan[0] not in dropped]
+                self._drop(len(incidents) + len(plans) - len(kept), "incidents", exc)
+                incidents, plans = [], kept
+        if plans:
+            try:
+                await self._commit([], plans, [])
+            except _UNAVAILABLE as exc:
+                raise _Unwritten(exc, _records(plans=plans, audits=audits))
+            except Exception as exc:
+                self._drop(len(plans), "plans", exc)
+                plans = []
+        if audits:
+            try:
+                await self._commit([], [], audits)
+            except _UNAVAILABLE as exc:
+                raise _Unwritten(exc, _records(audits=audits))
+            except Exception as exc:
+                self._drop(len(audits), "audit events", exc)
+                audits = []
+        return incidents, plans, audits
+
+    def _open_breaker(self, exc: BaseException, records: int) -> None:
+        self._failures += 1
+        self.retries += 1
+        pause = min(self.max_backoff_seconds, self.retry_backoff_seconds * 2 ** (self._failures - 1))
+        self._retry_at = time.monotonic() + pause
+        logger.warning(
+            "Write-behind database unavailable, pausing flushes",
+            extra={"records": records, "pause_seconds": pause, "error": str(exc)[:200]},
+        )
+
+    def _drop(self, count: int, what: str, exc: Optional[BaseException] = None) -> None:
+        if not count:
+            return
+        self.dropped += count
+        self._dropped.inc(count)
+        logger.error(
+            "Write-behind records dropped",
+            extra={"records": count, "table": what, "error": str(exc)[:200] if exc else None},
+        )
+
+    def stats(self) -> dict:
+        return {
+            "buffered": len(self._buffer),
+            "written": self.written,
+            "dropped": self.dropped,
+            "overflowed": self.overflowed,
+            "flushes": self.flushes,
+            "retries": self.retries,
+            "breaker_open": self.breaker_open,
+        }
@@ -1,19 +1,30 @@
 import asyncio
-import json
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, BackgroundTasks
-from fastapi.responses import HTMLResponse
+from datetime import datetime
+from typing import Any, List, Optional
+from fastapi import Body, FastAPI, HTTPException, Query, Request
+from fastapi.responses import HTMLResponse, JSONResponse, PlainTextResponse
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 
 from .core.config import settings
 from .core.logging import logger
-from .core.entities import Alert, AuditLog
-from .modules.ingestion import AlertSimulator
-from .modules.analysis import RuleBasedAnalyzer, LLMAnalyzer
+from .core.metrics import registry as metrics_registry
+from .core.entities import Alert, AlertSeverity
+from .modules.ingestion import AlertSimulator, AlertQueue, AdmissionResult, AlertDeduplicator
+from .modules.ingestion.batch import BatchItemResult, enqueue_alerts, iter_ndjson, validate_alerts
+from .modules.analysis import RuleBasedAnalyzer, LLMAnalyzer, DiagnosisCache, EscalationPolicy, TieredAnalyzer
+from .modules.analysis.llm_analyzer import anthropic_client_factory
+from .modules.analysis.prompt import PromptBuilder
+from .modules.analysis.resilience import AdaptiveRateLimiter, CircuitBreaker
+from .modules.analysis.routing import ModelRoute, ModelRouter
 from .modules.policy import RiskEvaluator
 from .modules.action import ActionExecutor
-from .modules.audit import AuditService
-from .modules.context import ContextBuilderService
+from .modules.audit import AuditIndex, AuditLogReader, AuditWriter
+from .modules.audit.db_service import BufferedPostgresAuditService
+from .modules.context import ContextBuilderService, HistoryCache, IncidentHistoryStore
+from .modules.pipeline import AlertPipeline, AlertWorkerPool
+from .infrastructure.database.partitions import PartitionMaintainer
+from .infrastructure.database.write_behind import WriteBehindPersister
 
 # ---------------------------------------------------------------------------
 # DB session factory (lazy — only connects on first use)
@@ -28,78 +39,333 @@ _AsyncSessionLocal = async_sessionmaker(_engine, expire_on_commit=False)
 simulator = AlertSimulator()
 risk_evaluator = RiskEvaluator()
 executor = ActionExecutor()
-audit_service = AuditService()
+alert_queue = AlertQueue(
+    maxsize=settings.ALERT_QUEUE_MAXSIZE,
+    watermarks=settings.ALERT_SHED_WATERMARKS,
+)
+deduplicator = (
+    AlertDeduplicator(
+        window_seconds=settings.DEDUP_WINDOW_SECONDS,
+        max_entries=settings.DEDUP_MAX_ENTRIES,
+    )
+    if settings.DEDUP_WINDOW_SECONDS > 0
+    else None
+)
+
+history_cache = (
+    HistoryCache(
+        ttl_seconds=settings.CONTEXT_CACHE_TTL_SECONDS,
+        max_entries=settings.CONTEXT_CACHE_MAX_ENTRIES,
+    )
+    if settings.CONTEXT_CACHE_TTL_SECONDS > 0
+    else None
+)
+history_store = (
+    IncidentHistoryStore(
+        window_seconds=settings.HISTORY_STORE_WINDOW_SECONDS,
+        bucket_seconds=settings.HISTORY_STORE_BUCKET_SECONDS,
+        max_per_key=settings.HISTORY_STORE_MAX_PER_KEY,
+        max_sources=settings.HISTORY_STORE_MAX_SOURCES,
+    )
+    if settings.HISTORY_STORE_ENABLED
+    else None
+)
+
+
+def _invalidate_written_history(incidents, plans) -> None:
+    """Drop cached context history made stale by a write-behind flush."""
+    if history_cache is None:
+        return
+    for source, severity in {(incident.source, incident.severity) for incident in incidents}:
+        history_cache.invalidate_incident(source, severity)
+    for source in {source for source, _ in plans}:
+        history_cache.invalidate_source(source)
+
+
+persister = (
+    WriteBehindPersister(
+        session_factory=_AsyncSessionLocal,
+        max_batch=settings.WRITE_BEHIND_MAX_BATCH,
+        flush_interval_seconds=settings.WRITE_BEHIND_FLUSH_INTERVAL_SECONDS,
+        max_buffer=settings.WRITE_BEHIND_MAX_BUFFER,
+        retry_backoff_seconds=settings.WRITE_BEHIND_RETRY_BACKOFF_SECONDS,
+        max_backoff_seconds=settings.WRITE_BEHIND_MAX_BACKOFF_SECONDS,
+        on_flushed=_invalidate_written_history,
+    )
+    if settings.WRITE_BEHIND_ENABLED
+    else None
+)
+# Native partitions exist on PostgreSQL only (see the partitioning migration).
+partition_maintainer = (
+    PartitionMaintainer(
+        _engine,
+        interval=settings.PARTITION_INTERVAL,
+        precreate=settings.PARTITION_PRECREATE,
+        retention_days={
+            "incidents": settings.INCIDENT_RETENTION_DAYS,
+            "audit_logs": settings.AUDIT_RETENTION_DAYS,
+        },
+        detach_only=settings.PARTITION_DETACH_ONLY,
+        run_interval_seconds=settings.PARTITION_MAINTENANCE_INTERVAL_SECONDS,
+    )
+    if settings.PARTITION_MAINTENANCE_ENABLED and _engine.dialect.name == "postgresql"
+    else None
+)
+audit_index = (
+    AuditIndex(
+        settings.AUDIT_QUERY_INDEX_PATH,
+        catch_up_path=settings.AUDIT_FILE_PATH if settings.AUDIT_BACKEND != "database" else None,
+        max_pending=settings.AUDIT_QUERY_INDEX_MAX_PENDING,
+    )
+    if settings.AUDIT_QUERY_INDEX_ENABLED
+    else None
+)
+if settings.AUDIT_BACKEND == "database":
+    audit_service = BufferedPostgresAuditService(
+        session_factory=_AsyncSessionLocal,
+        spool_path=settings.AUDIT_DB_SPOOL_PATH,
+        max_batch=settings.AUDIT_DB_MAX_BATCH,
+        flush_interval_seconds=settings.AUDIT_DB_FLUSH_INTERVAL_SECONDS,
+        max_buffer=settings.AUDIT_DB_MAX_BUFFER,
+        replay_interval_seconds=settings.AUDIT_DB_REPLAY_INTERVAL_SECONDS,
+        on_committed=audit_index.add if audit_index is not None else None,
+    )
+else:
+    audit_service = AuditWriter(
+        file_path=settings.AUDIT_FILE_PATH,
+        max_batch=settings.AUDIT_MAX_BATCH,
+        queue_maxsize=settings.AUDIT_QUEUE_MAXSIZE,
+        fsync=settings.AUDIT_FSYNC,
+        fsync_interval_seconds=settings.AUDIT_FSYNC_INTERVAL_SECONDS,
+        rotate_bytes=settings.AUDIT_ROTATE_BYTES,
+        rotate_seconds=settings.AUDIT_ROTATE_SECONDS,
+        compress=settings.AUDIT_COMPRESS,
+        on_committed=audit_index.add if audit_index is not None else None,
+    )
+# Pages of the audit file for the /audit dashboard.
+audit_reader = AuditLogReader(settings.AUDIT_FILE_PATH, index_every=settings.AUDIT_INDEX_EVERY)
 
-context_builder = ContextBuilderService(session_factory=_AsyncSessionLocal)
+context_builder = ContextBuilderService(
+    session_factory=_AsyncSessionLocal,
+    history_cache=history_cache,
+    history_store=history_store,
+    verify_rate=settings.HISTORY_STORE_VERIFY_RATE,
+    plan_lookback_days=settings.CONTEXT_PLAN_LOOKBACK_DAYS,
+)
 
-# Choose analyzer: LLM if API key is set, otherwise rule-based fallback only.
-_rule_analyzer = RuleBasedAnalyzer()
+# Choose analyzer: rule tier escalating to the LLM if an API key is set,
+# otherwise rule-based only.
+_rule_analyzer = RuleBasedAnalyzer(
+    rules_path=settings.RULES_PATH or None,
+    reload_interval_seconds=settings.RULES_RELOAD_INTERVAL_SECONDS,
+)
+diagnosis_cache = (
+    DiagnosisCache(
+        max_entries=settings.DIAGNOSIS_CACHE_MAX_ENTRIES,
+        ttl_seconds=settings.DIAGNOSIS_CACHE_TTL_SECONDS,
+        max_bytes=settings.DIAGNOSIS_CACHE_MAX_BYTES,
+        persist_path=settings.DIAGNOSIS_CACHE_PATH,
+    )
+    if settings.DIAGNOSIS_CACHE_ENABLED
+    else None
+)
+llm_analyzer = None
 if settings.ANTHROPIC_API_KEY:
-    analyzer = LLMAnalyzer(
+    llm_analyzer = LLMAnalyzer(
         api_key=settings.ANTHROPIC_API_KEY,
         model=settings.LLM_MODEL,
         fallback_analyzer=_rule_analyzer,
+        cache=diagnosis_cache,
+        batch_window_seconds=settings.LLM_BATCH_WINDOW_MS / 1000.0,
+        batch_max_size=settings.LLM_BATCH_MAX_SIZE,
+        deadlines=settings.LLM_DEADLINE_SECONDS,
+        audit=audit_service,
+        breaker=(
+            CircuitBreaker(
+                window_size=settings.LLM_BREAKER_WINDOW_SIZE,
+                min_calls=settings.LLM_BREAKER_MIN_CALLS,
+                failure_rate_threshold=settings.LLM_BREAKER_FAILURE_RATE,
+                slow_call_seconds=settings.LLM_BREAKER_SLOW_CALL_SECONDS,
+                slow_call_rate_threshold=settings.LLM_BREAKER_SLOW_CALL_RATE,
+                open_seconds=settings.LLM_BREAKER_OPEN_SECONDS,
+            )
+            if settings.LLM_BREAKER_ENABLED
+            else None
+        ),
+        limiter=AdaptiveRateLimiter(
+            max_concurrency=settings.LLM_MAX_CONCURRENCY,
+            rate_per_second=settings.LLM_RATE_PER_SECOND,
+            min_rate_per_second=settings.LLM_MIN_RATE_PER_SECOND,
+        ),
+        prompt_builder=PromptBuilder(section_token_budget=settings.LLM_PROMPT_TOKEN_BUDGET),
+        router=ModelRouter(
+            routes=[ModelRoute.from_dict(route) for route in settings.LLM_ROUTES],
+            default=ModelRoute(
+                "default",
+                settings.LLM_MODEL,
+                max_tokens=settings.LLM_MAX_TOKENS,
+                input_cost_per_mtok=settings.LLM_INPUT_COST_PER_MTOK,
+                output_cost_per_mtok=settings.LLM_OUTPUT_COST_PER_MTOK,
+            ),
+            client_factory=anthropic_client_factory(settings.ANTHROPIC_API_KEY),
+        ),
+    )
+    if settings.TIERED_ANALYSIS_ENABLED:
+        analyzer = TieredAnalyzer(
+            rule_analyzer=_rule_analyzer,
+            llm_analyzer=llm_analyzer,
+            policy=EscalationPolicy(
+                min_confidence=settings.TIERED_MIN_CONFIDENCE,
+                escalate_rules=settings.TIERED_ESCALATE_RULES,
+                authoritative_rules=settings.TIERED_AUTHORITATIVE_RULES,
+                recurrence_threshold=settings.TIERED_RECURRENCE_THRESHOLD,
+            ),
+        )
+    else:
+        analyzer = llm_analyzer
+    logger.info(
+        "LLM Brain active",
+        extra={"model": settings.LLM_MODEL, "tiered": settings.TIERED_ANALYSIS_ENABLED},
     )
-    logger.info("LLM Brain active", extra={"model": settings.LLM_MODEL})
 else:
     analyzer = _rule_analyzer
     logger.info("LLM Brain inactive (no ANTHROPIC_API_KEY) — using rule engine")
 
 
+pipeline = AlertPipeline(
+    context_builder=context_builder,
+    analyzer=analyzer,
+    risk_evaluator=risk_evaluator,
+    executor=executor,
+    audit_service=audit_service,
+    deduplicator=deduplicator,
+    history_store=history_store,
+    persister=persister,
+)
+
+
 async def processing_loop():
-    """Background task to process alerts from the simulator."""
+    """Background task feeding simulator alerts into the worker pool queue."""
     logger.info("Starting processing loop...")
     async for alert in simulator.get_alerts():
-        await process_alert(alert)
+        await worker_pool.submit(alert)
+
+
+async def dedup_expiry_loop():
+    """Audit folded repeats whose dedup window expired after flapping stopped."""
+    while True:
+        await asyncio.sleep(settings.DEDUP_WINDOW_SECONDS)
+        try:
+            await pipeline.report_expired_repeats()
+        except Exception as exc:
+            logger.error("Dedup expiry report failed", extra={"error": str(exc)[:200]})
 
 
 async def process_alert(alert: Alert):
-    """
-    Main orchestration flow: Ingest → EnrichContext → Analyze → Policy → Action → Audit.
-    Any unhandled exception is caught and logged so the loop stays alive.
-    """
-    try:
-        # 0. Log Ingestion
-        logger.info(f"Received alert: {alert.source}", extra={"alert_id": alert.id})
-
-        # 0.5 Build enriched context (queries DB for historical incidents/plans)
-        context = await context_builder.build(alert)
-
-        # 1. Analyze
-        diagnosis = await analyzer.analyze(context)
-
-        # 2. Policy / Risk
-        plan = await risk_evaluator.evaluate_risk(diagnosis)
-
-        # 3. Action (if auto-approved)
-        if not plan.requires_approval:
-            success = await executor.execute_action(plan)
-            result = "EXECUTED" if success else "FAILED"
-        else:
-            result = "PENDING_APPROVAL"
-            logger.info("Action requires approval", extra={"plan_id": plan.id})
-
-        # 4. Audit
-        log_entry = AuditLog(
-            component="Orchestrator",
-            event="AlertProcessed",
-            details={
-                "alert": alert.model_dump(mode="json"),
-                "diagnosis": diagnosis.model_dump(mode="json"),
-                "plan": plan.model_dump(mode="json"),
-                "result": result,
-            },
-        )
-        await audit_service.log_event(log_entry)
+    """Run one alert through the pipeline: Ingest → EnrichContext → Analyze → Policy → Action → Audit."""
+    await pipeline.process(alert)
+
 
-    except Exception as e:
-        logger.error(f"Error processing alert: {e}", exc_info=True)
+# N concurrent workers consume the shared bounded queue so one slow alert
+# (LLM round-trip, action sleep) no longer stalls every alert behind it.
+worker_pool = AlertWorkerPool(
+    handler=process_alert,
+    concurrency=settings.WORKER_COUNT,
+    queue=alert_queue,
+)
+
+
+# ---------------------------------------------------------------------------
+# Scrape-time metrics: read from the components' own counters only when
+# /metrics is requested, so they add nothing to the per-alert hot path.
+# ---------------------------------------------------------------------------
+metrics_registry.callback(
+    "sentinel_queue_depth", "Alerts waiting in the ingestion queue.", "gauge", alert_queue.qsize
+)
+metrics_registry.callback(
+    "sentinel_queue_dropped_total",
+    "Alerts dropped by the ingestion queue, by severity and reason.",
+    "counter",
+    lambda: {
+        (severity, reason): count
+        for reason in ("shed", "evicted", "rejected")
+        for severity, count in alert_queue.stats()[reason].items()
+    },
+    labelnames=("severity", "reason"),
+)
+metrics_registry.callback(
+    "sentinel_workers_busy", "Workers currently processing an alert.", "gauge",
+    lambda: worker_pool.stats()["busy"],
+)
+if diagnosis_cache is not None:
+    metrics_registry.callback(
+        "sentinel_diagnosis_cache_lookups_total",
+        "Diagnosis cache lookups, by outcome.",
+        "counter",
+        lambda: {("hit",): diagnosis_cache.hits, ("miss",): diagnosis_cache.misses},
+        labelnames=("outcome",),
+    )
+if history_cache is not None:
+    metrics_registry.callback(
+        "sentinel_history_cache_lookups_total",
+        "Context history cache lookups, by outcome.",
+        "counter",
+        lambda: {
+            ("hit",): history_cache.hits,
+            ("miss",): history_cache.misses,
+            ("coalesced",): history_cache.coalesced,
+        },
+        labelnames=("outcome",),
+    )
+if persister is not None:
+    metrics_registry.callback(
+        "sentinel_write_behind_buffered", "Records waiting for the next write-behind flush.", "gauge",
+        lambda: persister.stats()["buffered"],
+    )
+metrics_registry.callback(
+    "sentinel_audit_queue_depth", "Audit events waiting to be written.", "gauge",
+    lambda: audit_service.stats()["queued"],
+)
+if llm_analyzer is not None:
+    metrics_registry.callback(
+        "sentinel_llm_circuit_open", "1 while the LLM circuit breaker is open.", "gauge",
+        lambda: 1.0 if (llm_analyzer.stats()["breaker"] or {}).get("state") == "OPEN" else 0.0,
+    )
+    metrics_registry.callback(
+        "sentinel_llm_calls_in_flight", "Claude API calls currently in flight.", "gauge",
+        lambda: (llm_analyzer.stats()["limiter"] or {}).get("in_flight", 0),
+    )
+if isinstance(analyzer, TieredAnalyzer):
+    metrics_registry.callback(
+        "sentinel_analysis_escalations_total",
+        "Alerts the rule tier escalated to the LLM, by reason.",
+        "counter",
+        lambda: {(reason,): count for reason, count in analyzer.stats()["escalations"].items()},
+        labelnames=("reason",),
+    )
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Manage background processing loop lifecycle with the FastAPI app."""
+    """Manage worker pool and processing loop lifecycle with the FastAPI app."""
+    if diagnosis_cache is not None:
+        diagnosis_cache.load()
+    if history_store is not None:
+        try:
+            await history_store.warm_from(_AsyncSessionLocal)
+        except Exception as exc:
+            # Stays cold: context building keeps querying the DB (and degrades as before).
+            logger.warning("History store warm-up failed", extra={"error": str(exc)[:200]})
+    if persister is not None:
+        persister.start()
+    if audit_index is not None:
+        audit_index.start()
+    audit_service.start()
+    if partition_maintainer is not None:
+        partition_maintainer.start()
+    worker_pool.start()
     task = asyncio.create_task(processing_loop())
+    dedup_task = asyncio.create_task(dedup_expiry_loop()) if deduplicator is not None else None
     yield
     simulator._running = False
     task.cancel()
@@ -107,6 +373,27 @@ async def lifespan(app: FastAPI):
         await task
     except asyncio.CancelledError:
         logger.info("Processing loop stopped")
+    # Graceful drain: let queued alerts finish before the workers are cancelled.
+    await worker_pool.drain(timeout=settings.SHUTDOWN_DRAIN_TIMEOUT_SECONDS)
+    if dedup_task is not None:
+        dedup_task.cancel()
+        try:
+            await dedup_task
+        except asyncio.CancelledError:
+            pass
+        # Before the audit service closes: report repeats still folded in open windows.
+        await pipeline.report_expired_repeats(everything=True)
+    if persister is not None:
+        # After the drain, so records from the last alerts are written too.
+        await persister.close()
+    await audit_service.close()
+    if audit_index is not None:
+        # After the audit service, so its last batches are indexed too.
+        await audit_index.close()
+    if partition_maintainer is not None:
+        await partition_maintainer.close()
+    if diagnosis_cache is not None:
+        diagnosis_cache.save()
 
 
 app = FastAPI(title="Sentinel", lifespan=lifespan)
@@ -123,23 +410,44 @@ async def root():
     }
 
 
+@app.get("/status")
+async def status():
+    """Runtime status: ingestion queue counters and per-worker utilization."""
+    return {
+        "queue": alert_queue.stats(),
+        "workers": worker_pool.stats(),
+        "dedup": deduplicator.stats() if deduplicator is not None else None,
+        "diagnosis_cache": diagnosis_cache.stats() if diagnosis_cache is not None else None,
+        "history_cache": history_cache.stats() if history_cache is not None else None,
+        "history_store": history_store.stats() if history_store is not None else None,
+        "write_behind": persister.stats() if persister is not None else None,
+        "audit": audit_service.stats(),
+        "audit_index": audit_index.stats() if audit_index is not None else None,
+        "partitions": partition_maintainer.stats() if partition_maintainer is not None else None,
+        "tiers": analyzer.stats() if isinstance(analyzer, TieredAnalyzer) else None,
+        "llm": llm_analyzer.stats() if llm_analyzer is not None else None,
+    }
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus text-format metrics: stage latency histograms, counters and gauges."""
+    return PlainTextResponse(
+        metrics_registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
 @app.get("/audit", response_class=HTMLResponse)
-async def view_audit_log():
-    """Render the last 50 audit log entries as a formatted HTML page."""
-    entries: list[dict] = []
+async def view_audit_log(
+    before: Optional[str] = Query(None, description="Older-page cursor, or an ISO timestamp to jump to"),
+    limit: int = Query(50, ge=1, le=1000),
+):
+    """Render a page of audit log entries, newest first, as a formatted HTML page."""
     try:
-        with open(settings.AUDIT_FILE_PATH, "r") as f:
-            lines = f.readlines()
-        for line in reversed(lines[-50:]):
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                entries.append(json.loads(line))
-            except json.JSONDecodeError:
-                entries.append({"raw": line})
-    except FileNotFoundError:
-        pass
+        page = await asyncio.to_thread(audit_reader.page, limit, before)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="before must be a cursor or an ISO-8601 timestamp")
+    entries = page.entries
 
     def _render_entry(entry: dict) -> str:
         timestamp = entry.get("timestamp", "")
@@ -163,6 +471,8 @@ async def view_audit_log():
         )
 
     rows = "".join(_render_entry(e) for e in entries) if entries else "<p>No logs yet.</p>"
+    if page.older is not None:
+        rows += f"<p><a href='/audit?before={page.older}&limit={limit}'>Older entries</a></p>"
 
     html_content = f"""<!DOCTYPE html>
 <html>
@@ -177,6 +487,7 @@ async def view_audit_log():
       .evt {{ color: #0f0; font-weight: bold; }}
       .src {{ color: #e6c07b; }}
       .res {{ color: #98c379; font-weight: bold; }}
+      a    {{ color: #58a6ff; }}
       .sev {{ padding: 1px 5px; border-radius: 3px; font-size: 0.8em; }}
       .sev-CRITICAL {{ background:#c0392b; color:#fff; }}
       .sev-FATAL    {{ background:#8e44ad; color:#fff; }}
@@ -192,8 +503,115 @@ async def view_audit_log():
     return html_content
 
 
+@app.get("/audit/query")
+async def query_audit_log(
+    source: Optional[str] = None,
+    severity: Optional[AlertSeverity] = None,
+    result: Optional[str] = None,
+    component: Optional[str] = None,
+    event: Optional[str] = None,
+    since: Optional[datetime] = Query(None, description="Inclusive lower bound (ISO-8601)"),
+    until: Optional[datetime] = Query(None, description="Exclusive upper bound (ISO-8601)"),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+):
+    """Filtered audit events as JSON, newest first, from the local audit index."""
+    if audit_index is None:
+        raise HTTPException(status_code=503, detail="Audit query index is disabled")
+    try:
+        page = await asyncio.to_thread(
+            audit_index.query,
+            source=source,
+            severity=severity.value if severity is not None else None,
+            result=result,
+            component=component,
+            event=event,
+            since=since,
+            until=until,
+            limit=limit,
+            cursor=cursor,
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return {"items": page.entries, "next_cursor": page.next_cursor}
+
+
+def _admission_error(result: AdmissionResult) -> HTTPException:
+    """Map a queue admission failure to 429 (shed) or 503 (full) with a retry hint."""
+    status_code = 429 if result is AdmissionResult.SHED else 503
+    return HTTPException(
+        status_code=status_code,
+        detail={"message": f"Alert {result.value.lower()} — ingestion queue under pressure",
+                "queue_depth": alert_queue.qsize()},
+        headers={"Retry-After": str(settings.ALERT_RETRY_AFTER_SECONDS)},
+    )
+
+
 @app.post("/simulate")
-async def trigger_simulation(alert: Alert, background_tasks: BackgroundTasks):
-    """Manually inject an alert into the processing pipeline."""
-    background_tasks.add_task(process_alert, alert)
+async def trigger_simulation(alert: Alert):
+    """Manually inject an alert into the bounded processing queue."""
+    result = alert_queue.offer(alert)
+    if result is not AdmissionResult.ACCEPTED:
+        raise _admission_error(result)
     return {"message": "Alert injected", "alert_id": alert.id}
+
+
+def _batch_response(results: List[BatchItemResult]) -> JSONResponse:
+    """Summarize per-item outcomes; add Retry-After if anything was shed or rejected."""
+    results.sort(key=lambda r: r.index)
+    queued = sum(1 for r in results if r.status == "queued")
+    throttled = sum(1 for r in results if r.status in ("shed", "rejected"))
+    headers = {"Retry-After": str(settings.ALERT_RETRY_AFTER_SECONDS)} if throttled else None
+    return JSONResponse(
+        content={
+            "queued": queued,
+            "throttled": throttled,
+            "invalid": len(results) - queued - throttled,
+            "items": [r.model_dump(exclude_none=True) for r in results],
+        },
+        headers=headers,
+    )
+
+
+@app.post("/alerts/batch")
+async def ingest_alert_batch(items: List[Any] = Body(...)):
+    """Validate a JSON array of alerts in bulk and enqueue them in one step."""
+    if len(items) > settings.ALERT_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch exceeds {settings.ALERT_BATCH_MAX_ITEMS} items",
+        )
+    valid, invalid = validate_alerts(items)
+    return _batch_response(invalid + enqueue_alerts(alert_queue, valid))
+
+
+@app.post("/alerts/stream")
+async def ingest_alert_stream(request: Request):
+    """
+    Ingest an NDJSON body (one alert per line), parsed incrementally.
+
+    Lines are validated and enqueued in chunks of ALERT_STREAM_CHUNK_ITEMS so the
+    body is never buffered whole.
+    """
+    results: List[BatchItemResult] = []
+    pending: List[Any] = []
+    pending_start = 0
+
+    def flush() -> None:
+        valid, invalid = validate_alerts(pending, start_index=pending_start)
+        results.extend(invalid)
+        results.extend(enqueue_alerts(alert_queue, valid))
+        pending.clear()
+
+    async for index, obj, error in iter_ndjson(request.stream()):
+        if error is not None:
+            flush()
+            results.append(BatchItemResult(index=index, status="invalid", error=error))
+            pending_start = index + 1
+            continue
+        pending.append(obj)
+        if len(pending) >= settings.ALERT_STREAM_CHUNK_ITEMS:
+            flush()
+            pending_start = index + 1
+    flush()
+    return _batch_response(results)
@@ -8,6 +8,10 @@ class ActionExecutor(IActionModule):
     Executes remediation plans. In MVP, this mostly logs the actions.
     """
 
+    def __init__(self, delay_seconds: float = 1.0):
+        # Simulated execution time per action.
+        self.delay_seconds = delay_seconds
+
     async def execute_action(self, plan: RemediationPlan) -> bool:
         if plan.requires_approval and plan.status != "APPROVED":
             logger.warning(
@@ -20,7 +24,7 @@ class ActionExecutor(IActionModule):
         
         try:
             # Simulate execution time
-            await asyncio.sleep(1)
+            await asyncio.sleep(self.delay_seconds)
             
             # Mock Implementation logic
             if plan.action_type == ActionType.RESTART_SERVICE:
@@ -1,4 +1,6 @@
 from .engine import RuleBasedAnalyzer
 from .llm_analyzer import LLMAnalyzer
+from .cache import DiagnosisCache
+from .tiered import EscalationPolicy, TieredAnalyzer
 
-__all__ = ["RuleBasedAnalyzer", "LLMAnalyzer"]
+__all__ = ["RuleBasedAnalyzer", "LLMAnalyzer", "DiagnosisCache", "TieredAnalyzer", "EscalationPolicy"]
@@ -0,0 +1,96 @@
+"""
+MicroBatcher: gathers items submitted within a short window into one batch call.
+
+Under load, per-request overhead and per-call latency dominate LLM cost. The
+batcher holds each submitted item for at most ``window_seconds`` (or until
+``max_batch_size`` items are waiting), hands the whole batch to an async handler
+and resolves each caller's future with its own slot of the result.
+
+The handler must return one entry per item, in order; an entry that is an
+Exception instance is raised to that item's caller only, so one bad item does
+not fail the rest of the batch. If the batch task itself is cancelled (e.g.
+at shutdown), every caller still waiting is cancelled with it.
+"""
+import asyncio
+from typing import Awaitable, Callable, Generic, List, Optional, Set, Tuple, TypeVar, Union
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+BatchHandler = Callable[[List[T]], Awaitable[List[Union[R, BaseException]]]]
+
+
+class MicroBatcher(Generic[T, R]):
+    """Time/size-bounded batching of awaitable calls."""
+
+    def __init__(
+        self,
+        handler: BatchHandler,
+        window_seconds: float = 0.05,
+        max_batch_size: int = 8,
+    ) -> None:
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be >= 1")
+        self._handler = handler
+        self._window = window_seconds
+        self._max_batch_size = max_batch_size
+        self._pending: List[Tuple[T, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._running: Set[asyncio.Task] = set()
+        self.batches = 0
+        self.items = 0
+
+    async def submit(self, item: T) -> R:
+        """Queue an item for the next batch and wait for its individual result."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= self._max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self._window, self._flush)
+        return await future
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "avg_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+            "pending": len(self._pending),
+        }
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        self.batches += 1
+        self.items += len(batch)
+        task = asyncio.ensure_future(self._run(batch))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    async def _run(self, batch: List[Tuple[T, asyncio.Future]]) -> None:
+        try:
+            try:
+                results = await self._handler([item for item, _ in batch])
+                if len(results) != len(batch):
+                    raise RuntimeError(
+                        f"Batch handler returned {len(results)} results for {len(batch)} items"
+                    )
+            except Exception as exc:
+                results = [exc] * len(batch)
+            for (_, future), result in zip(batch, results):
+                if future.done():  # Caller was cancelled while waiting.
+                    continue
+                if isinstance(result, BaseException):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+        finally:
+            # Cancelled (or failed with a BaseException) before resolving: no caller waits forever.
+            for _, future in batch:
+                if not future.done():
+                    future.cancel()
@@ -0,0 +1,163 @@
+"""
+DiagnosisCache: bounded TTL + LRU cache of LLM diagnoses.
+
+Recurring alerts produce effectively identical prompts, and each used to cost a
+full Claude round-trip. The cache key is a normalized hash of the alert
+fingerprint plus the history the context was built from (distinct incidents and
+remediations, ignoring ids and exact repeat counts), so a recurring alert with
+unchanged history is answered from memory in microseconds.
+
+Bounded three ways: entry count, approximate serialized size, and TTL. Entries
+can optionally be persisted to a JSON file so warm restarts keep the cache.
+"""
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+from ...core.entities import Diagnosis, EnrichedContext
+from ...core.fingerprint import alert_fingerprint
+from ...core.logging import logger
+
+
+def diagnosis_cache_key(context: EnrichedContext) -> str:
+    """Normalized hash of the alert fingerprint and its historical context."""
+    incidents = sorted(
+        {
+            (inc.source, inc.severity.value, inc.status, " ".join(inc.message.lower().split()))
+            for inc in context.recent_similar_incidents
+        }
+    )
+    remediations = sorted(
+        {
+            (plan.status, plan.action_type.value, plan.diagnosis.root_cause)
+            for plan in context.past_remediations_for_source
+        }
+    )
+    raw = json.dumps(
+        [alert_fingerprint(context.alert), incidents, remediations], separators=(",", ":")
+    )
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class DiagnosisCache:
+    """
+    In-memory LRU of Diagnosis objects with TTL and a byte budget.
+
+    ``get()`` returns a copy re-stamped with the caller's alert_id so cached
+    entries are never mutated by downstream stages.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: float = 300.0,
+        max_bytes: int = 8 * 1024 * 1024,
+        persist_path: Optional[str] = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._max_entries = max_entries
+        self._ttl = ttl_seconds
+        self._max_bytes = max_bytes
+        self._persist_path = persist_path or None
+        self._clock = clock
+        # key -> (expires_at, diagnosis, approx_size_bytes); most recently used last.
+        self._entries: "OrderedDict[str, Tuple[float, Diagnosis, int]]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str, alert_id: str) -> Optional[Diagnosis]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, diagnosis, _ = entry
+        if expires_at <= self._clock():
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return diagnosis.model_copy(update={"alert_id": alert_id}, deep=True)
+
+    def put(self, key: str, diagnosis: Diagnosis, expires_at: Optional[float] = None) -> None:
+        size = len(diagnosis.model_dump_json())
+        if size > self._max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        if expires_at is None:
+            expires_at = self._clock() + self._ttl
+        self._entries[key] = (expires_at, diagnosis.model_copy(deep=True), size)
+        self._bytes += size
+        while len(self._entries) > self._max_entries or self._bytes > self._max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+    def save(self) -> None:
+        """Write unexpired entries to ``persist_path`` (atomic replace). No-op if unset."""
+        if not self._persist_path:
+            return
+        now = self._clock()
+        payload = [
+            {"key": key, "expires_at": expires_at, "diagnosis": diagnosis.model_dump(mode="json")}
+            for key, (expires_at, diagnosis, _) in self._entries.items()
+            if expires_at > now
+        ]
+        tmp_path = f"{self._persist_path}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(payload, f)
+            os.replace(tmp_path, self._persist_path)
+            logger.info("Diagnosis cache saved", extra={"entries": len(payload)})
+        except OSError as exc:
+            logger.error(f"Failed to save diagnosis cache: {exc}")
+
+    def load(self) -> int:
+        """Load unexpired entries from ``persist_path``. Returns the number loaded."""
+        if not self._persist_path or not os.path.exists(self._persist_path):
+            return 0
+        try:
+            with open(self._persist_path, "r") as f:
+                payload = json.load(f)
+        except (OSError, ValueError) as exc:
+            logger.warning(f"Ignoring unreadable diagnosis cache file: {exc}")
+            return 0
+        now = self._clock()
+        loaded = 0
+        # File is in LRU order, so re-inserting preserves recency.
+        for item in payload:
+            try:
+                if item["expires_at"] > now:
+                    self.put(item["key"], Diagnosis.model_validate(item["diagnosis"]), item["expires_at"])
+                    loaded += 1
+            except (KeyError, TypeError, ValueError):
+                continue
+        logger.info("Diagnosis cache loaded", extra={"entries": loaded})
+        return loaded
+
+    def _remove(self, key: str) -> None:
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
@@ -0,0 +1,142 @@
+"""
+CompiledRuleSet: a rule list compiled into a single match index.
+
+RuleBasedAnalyzer used to walk every rule and let each condition lowercase the
+message again, so the cost of a miss grew linearly with the rule count. Here
+all keywords of all DeclarativeRules go into one Aho-Corasick automaton that
+scans the lowercased message once and yields the rules whose keywords occur.
+Keyword-less rules are dispatched by exact source, by an equality condition
+on a metadata field, or by severity; only
+rules with glob sources (and opaque lambda Rules) are checked for every
+alert. The surviving candidates are then checked in their original order,
+so the first matching rule still wins exactly as before.
+
+A compiled set is immutable; reloading builds a new one and swaps the
+reference, so readers never see a half-built index.
+"""
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from ...core.entities import Alert
+from .rules import DeclarativeRule, MetadataCondition, Rule
+
+_GLOB_CHARS = frozenset("*?[")
+
+
+class KeywordAutomaton:
+    """Aho-Corasick automaton mapping every keyword occurrence to its payload ids."""
+
+    def __init__(self, keywords: Iterable[Tuple[str, int]]):
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[Set[int]] = [set()]
+        for keyword, payload in keywords:
+            node = 0
+            for char in keyword:
+                nxt = goto[node].get(char)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[node][char] = nxt
+                    goto.append({})
+                    outputs.append(set())
+                node = nxt
+            outputs[node].add(payload)
+
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in goto[node].items():
+                queue.append(child)
+                state = fail[node]
+                while state and char not in goto[state]:
+                    state = fail[state]
+                fail[child] = goto[state].get(char, 0)
+                outputs[child] |= outputs[fail[child]]
+
+        self._goto = goto
+        self._fail = fail
+        self._outputs = [frozenset(o) for o in outputs]
+
+    def search(self, text: str) -> Set[int]:
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        found: Set[int] = set()
+        node = 0
+        for char in text:
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if outputs[node]:
+                found |= outputs[node]
+        return found
+
+
+class CompiledRuleSet:
+    """Indexes rules once; match() returns the first rule (in list order) that matches."""
+
+    def __init__(self, rules: Sequence[Rule]):
+        self.rules: Tuple[Rule, ...] = tuple(rules)
+        keywords: List[Tuple[str, int]] = []
+        by_source: Dict[str, List[int]] = {}
+        by_metadata: Dict[str, Dict[object, List[int]]] = {}
+        by_severity: Dict[object, List[int]] = {}
+        unanchored: List[int] = []
+
+        for index, rule in enumerate(self.rules):
+            if not isinstance(rule, DeclarativeRule):
+                unanchored.append(index)
+            elif rule.keywords:
+                keywords.extend((keyword, index) for keyword in rule.keywords)
+            elif rule.sources and not any(_GLOB_CHARS & set(glob) for glob in rule.sources):
+                for source in rule.sources:
+                    by_source.setdefault(source, []).append(index)
+            elif (condition := _equality_condition(rule)) is not None:
+                by_metadata.setdefault(condition.key, {}).setdefault(condition.value, []).append(index)
+            elif rule.severities:
+                for severity in rule.severities:
+                    by_severity.setdefault(severity, []).append(index)
+            else:
+                unanchored.append(index)
+
+        self._automaton = KeywordAutomaton(keywords)
+        self._by_source = by_source
+        self._by_metadata = by_metadata
+        self._by_severity = by_severity
+        self._unanchored = tuple(unanchored)
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def candidates(self, alert: Alert) -> List[int]:
+        found = self._automaton.search(alert.message.lower())
+        found.update(self._by_source.get(alert.source, ()))
+        metadata = alert.metadata
+        for key, table in self._by_metadata.items():
+            value = metadata.get(key)
+            if value is not None:
+                try:
+                    found.update(table.get(value, ()))
+                except TypeError:  # Unhashable metadata value.
+                    pass
+        found.update(self._by_severity.get(alert.severity, ()))
+        found.update(self._unanchored)
+        return sorted(found)
+
+    def match(self, alert: Alert) -> Optional[Rule]:
+        rules = self.rules
+        for index in self.candidates(alert):
+            rule = rules[index]
+            if isinstance(rule, DeclarativeRule):
+                # Keyword rules only become candidates through the automaton,
+                # so only the remaining criteria need checking here.
+                if rule.matches_residual(alert):
+                    return rule
+            elif rule.match(alert):
+                return rule
+        return None
+
+
+def _equality_condition(rule: DeclarativeRule) -> Optional[MetadataCondition]:
+    for condition in rule.metadata:
+        if condition.op == "==" and isinstance(condition.value, (str, int, float, bool)):
+            return condition
+    return None
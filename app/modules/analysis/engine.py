@@ -1,29 +1,90 @@
-from typing import List
+import os
+import time
+from typing import Callable, List, Optional, Tuple
 from ...core.interfaces import IAnalysisModule
 from ...core.entities import EnrichedContext, Diagnosis, ActionType
 from ...core.logging import logger
-from .rules import COMMON_RULES, Rule
+from .compiled import CompiledRuleSet
+from .rules import COMMON_RULES, Rule, load_rules_file
 
 
 class RuleBasedAnalyzer(IAnalysisModule):
-    """Analyzes alerts using a set of static rules to determine root cause."""
+    """
+    Analyzes alerts using a set of static rules to determine root cause.
 
-    def __init__(self, rules: List[Rule] = None):
-        self.rules = rules or COMMON_RULES
+    Rules are compiled into a CompiledRuleSet index. With ``rules_path`` the
+    set is loaded from a JSON file and, when ``reload_interval_seconds`` > 0,
+    re-checked at most that often; a changed file is compiled off to the side
+    and swapped in atomically. A file that fails to parse keeps the old set.
+    """
+
+    def __init__(
+        self,
+        rules: List[Rule] = None,
+        rules_path: Optional[str] = None,
+        reload_interval_seconds: float = 0.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.rules_path = rules_path
+        self.reload_interval_seconds = reload_interval_seconds
+        self._clock = clock
+        self._file_stamp: Optional[Tuple[float, int]] = None
+        self._next_check = 0.0
+        self._compiled = CompiledRuleSet(rules or COMMON_RULES)
+        if rules_path:
+            self.reload()
+
+    @property
+    def rules(self) -> Tuple[Rule, ...]:
+        return self._compiled.rules
+
+    def reload(self) -> bool:
+        """Re-read ``rules_path`` if it changed. Returns True when a new set was swapped in."""
+        try:
+            stat = os.stat(self.rules_path)
+        except OSError as e:
+            logger.error(f"Rules file unavailable: {e}", extra={"path": self.rules_path})
+            return False
+        stamp = (stat.st_mtime, stat.st_size)
+        if stamp == self._file_stamp:
+            return False
+        try:
+            compiled = CompiledRuleSet(load_rules_file(self.rules_path))
+        except Exception as e:
+            logger.error(f"Rules file rejected, keeping current rules: {e}", extra={"path": self.rules_path})
+            return False
+        self._file_stamp = stamp
+        self._compiled = compiled
+        logger.info("Rules reloaded", extra={"path": self.rules_path, "rule_count": len(compiled)})
+        return True
+
+    def _maybe_reload(self) -> None:
+        now = self._clock()
+        if now >= self._next_check:
+            self._next_check = now + self.reload_interval_seconds
+            self.reload()
 
     async def analyze(self, context: EnrichedContext) -> Diagnosis:
         """Evaluate rules against the alert inside the enriched context."""
+        return self.evaluate(context)[1]
+
+    def evaluate(self, context: EnrichedContext) -> Tuple[Optional[Rule], Diagnosis]:
+        """Like analyze(), but also returns the matched rule (None for the fallback diagnosis)."""
+        if self.rules_path and self.reload_interval_seconds > 0:
+            self._maybe_reload()
+
         alert = context.alert
-        for rule in self.rules:
-            if rule.match(alert):
-                logger.info(f"Alert matched rule: {rule.name}", extra={"alert_id": alert.id})
-                return rule.create_diagnosis(alert)
+        rule = self._compiled.match(alert)
+        if rule is not None:
+            logger.info(f"Alert matched rule: {rule.name}", extra={"alert_id": alert.id})
+            return rule, rule.create_diagnosis(alert)
 
         # Fallback if no rule matches
         logger.warning("No rule matched alert", extra={"alert_id": alert.id, "alert_message": alert.message})
-        return Diagnosis(
+        return None, Diagnosis(
             alert_id=alert.id,
             root_cause="Unknown Anomaly",
             confidence=0.0,
             suggested_actions=[ActionType.MANUAL_INTERVENTION],
+            analysis_path="rule",
         )
@@ -3,16 +3,33 @@ LLMAnalyzer: Root Cause Analysis powered by Claude via LangChain.
 
 Uses langchain-anthropic with with_structured_output() for reliable Pydantic extraction.
 Falls back to an injected IAnalysisModule (e.g. RuleBasedAnalyzer) on any error.
+Successful LLM diagnoses are memoized in an optional DiagnosisCache, and
+concurrent identical analyses are coalesced into a single in-flight call.
+Optionally, alerts arriving within a short window are micro-batched into one
+structured-output request, and a per-severity deadline races the rule engine
+against the LLM so slow API calls cannot stall urgent alerts. Every API call
+goes through an optional circuit breaker and adaptive rate limiter, using the
+model a ModelRouter picks for the alert (severity, source, rule miss), with
+token-budgeted prompts from PromptBuilder.
 """
-from typing import List
+import asyncio
+import time
+from collections import Counter
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
 
 from langchain_anthropic import ChatAnthropic
-from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.language_models import BaseChatModel
 from pydantic import BaseModel, Field
 
-from ...core.entities import ActionType, Diagnosis, EnrichedContext
-from ...core.interfaces import IAnalysisModule
+from ...core.entities import ActionType, AlertSeverity, AuditLog, Diagnosis, EnrichedContext
+from ...core.interfaces import IAnalysisModule, IAuditModule
 from ...core.logging import logger
+from .batching import MicroBatcher
+from .cache import DiagnosisCache, diagnosis_cache_key
+from .prompt import BuiltPrompt, PromptBuilder
+from .resilience import AdaptiveRateLimiter, CircuitBreaker, CircuitOpenError
+from .routing import ModelRoute, ModelRouter
 
 
 class _LLMDiagnosisOutput(BaseModel):
@@ -42,12 +59,27 @@ class _LLMDiagnosisOutput(BaseModel):
     )
 
 
-_SYSTEM_PROMPT = (
-    "You are SENTINEL, a Senior Site Reliability Engineer Agent. "
-    "Your job is strict causal root-cause analysis — not probabilistic guessing. "
-    "Always construct a causal chain of events and consider past remediation history "
-    "before suggesting actions."
-)
+class _LLMBatchItem(_LLMDiagnosisOutput):
+    """One diagnosis inside a batched response, tied back to its ALERT [i] block."""
+
+    alert_index: int = Field(description="Index i of the ALERT [i] block this diagnosis answers")
+
+
+class _LLMBatchOutput(BaseModel):
+    """Structured-output schema for a micro-batched request."""
+
+    diagnoses: List[_LLMBatchItem] = Field(
+        description="Exactly one diagnosis per ALERT [i] block in the prompt"
+    )
+
+
+def anthropic_client_factory(api_key: str) -> Callable[[ModelRoute], BaseChatModel]:
+    """ModelRouter client factory building one ChatAnthropic client per route."""
+
+    def build(route: ModelRoute) -> BaseChatModel:
+        return ChatAnthropic(model=route.model, api_key=api_key, max_tokens=route.max_tokens)
+
+    return build
 
 
 class LLMAnalyzer(IAnalysisModule):
@@ -58,29 +90,368 @@ class LLMAnalyzer(IAnalysisModule):
         api_key: str,
         model: str,
         fallback_analyzer: IAnalysisModule,
+        cache: Optional[DiagnosisCache] = None,
+        batch_window_seconds: float = 0.0,
+        batch_max_size: int = 1,
+        llm: Optional[BaseChatModel] = None,
+        deadlines: Optional[Dict[AlertSeverity, float]] = None,
+        audit: Optional[IAuditModule] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        limiter: Optional[AdaptiveRateLimiter] = None,
+        router: Optional[ModelRouter] = None,
+        prompt_builder: Optional[PromptBuilder] = None,
     ) -> None:
-        self._llm = ChatAnthropic(model=model, api_key=api_key, max_tokens=1024)
-        self._structured_llm = self._llm.with_structured_output(_LLMDiagnosisOutput)
+        # Without a router every alert goes to ``model``. ``llm`` lets tests and
+        # benchmarks inject a stand-in chat model.
+        self._router = router or ModelRouter(
+            routes=[],
+            default=ModelRoute("default", model),
+            client_factory=(lambda route: llm) if llm is not None else anthropic_client_factory(api_key),
+        )
+        self._prompts = prompt_builder or PromptBuilder()
+        # Route name -> (single, batch) structured-output wrappers of its client.
+        self._structured: Dict[str, Tuple[Any, Any]] = {}
         self._fallback = fallback_analyzer
+        self._cache = cache
+        # Single-flight: key -> shared task for the LLM call currently in flight.
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._coalesced = 0
+        # Per-severity latency budgets (seconds). Severities without one wait for the LLM.
+        self._deadlines = {AlertSeverity(k): v for k, v in (deadlines or {}).items() if v > 0}
+        # Late LLM answers (after a deadline miss) are recorded here for comparison.
+        self._audit = audit
+        self._background: Set[asyncio.Task] = set()
+        self._paths: Counter = Counter()
+        self._breaker = breaker
+        self._limiter = limiter
+        # Micro-batching is enabled only with a positive window and batch size > 1.
+        # Alerts are only batched with others bound for the same route.
+        self._batching = batch_window_seconds > 0 and batch_max_size > 1
+        self._batch_window_seconds = batch_window_seconds
+        self._batch_max_size = batch_max_size
+        self._batchers: Dict[str, MicroBatcher] = {}
 
     async def analyze(self, context: EnrichedContext) -> Diagnosis:
-        """Analyze an enriched context. Falls back to rule engine on any error."""
+        """
+        Analyze an enriched context. Falls back to rule engine on any error.
+
+        The returned Diagnosis records which path produced it in ``analysis_path``:
+        "llm", "llm_cache", "rule_fallback" (LLM failed), "rule_deadline"
+        (LLM missed the severity's latency budget) or "rule_circuit_open".
+        """
+        key = diagnosis_cache_key(context)
+        if self._cache is not None:
+            cached = self._cache.get(key, context.alert.id)
+            if cached is not None:
+                cached.analysis_path = "llm_cache"
+                return self._count(cached)
+
+        if self._breaker is not None and self._breaker.rejecting():
+            # Degraded endpoint (or its probe slots are taken): skip the LLM
+            # instead of paying its timeout.
+            diagnosis = await self._fallback.analyze(context)
+            diagnosis.analysis_path = "rule_circuit_open"
+            return self._count(diagnosis)
+
+        deadline = self._deadlines.get(context.alert.severity)
+        if deadline is not None:
+            return self._count(await self._analyze_with_deadline(key, context, deadline))
+
         try:
-            return await self._call_llm(context)
+            diagnosis = await self._call_llm_once(key, context)
         except Exception as exc:
-            logger.warning(
-                "LLM analysis failed — falling back to rule engine",
-                extra={"error": str(exc)[:200], "alert_id": context.alert.id},
+            diagnosis = await self._fallback.analyze(context)
+            diagnosis.analysis_path = self._fallback_path(context, exc)
+            return self._count(diagnosis)
+        self._remember(key, diagnosis)
+        return self._count(diagnosis)
+
+    def stats(self) -> dict:
+        """Runtime counters for the status endpoint."""
+        return {
+            "inflight": len(self._inflight),
+            "coalesced": self._coalesced,
+            "batching": (
+                {name: batcher.stats() for name, batcher in self._batchers.items()}
+                if self._batching
+                else None
+            ),
+            "routes": self._router.stats(),
+            "paths": dict(self._paths),
+            "breaker": self._breaker.stats() if self._breaker is not None else None,
+            "limiter": self._limiter.stats() if self._limiter is not None else None,
+        }
+
+    async def _analyze_with_deadline(
+        self, key: str, context: EnrichedContext, deadline: float
+    ) -> Diagnosis:
+        """
+        Race the LLM against the deadline with the rule engine running speculatively.
+
+        If the LLM answers in time its diagnosis wins. Otherwise the rule result
+        is returned immediately; the LLM call keeps running and its late answer
+        is written to the audit trail (and the cache) for comparison.
+        """
+        started = time.monotonic()
+        llm_task = asyncio.ensure_future(self._call_llm_once(key, context))
+        rule_task = asyncio.ensure_future(self._fallback.analyze(context))
+        try:
+            await asyncio.wait({llm_task}, timeout=deadline)
+        except asyncio.CancelledError:
+            llm_task.cancel()
+            rule_task.cancel()
+            raise
+
+        if llm_task.done() and not llm_task.cancelled() and llm_task.exception() is None:
+            rule_task.cancel()
+            diagnosis = llm_task.result()
+            self._remember(key, diagnosis)
+            return diagnosis
+
+        rule_diagnosis = await rule_task
+        if llm_task.done():
+            rule_diagnosis.analysis_path = self._fallback_path(
+                context,
+                llm_task.exception() if not llm_task.cancelled() else asyncio.CancelledError(),
             )
-            return await self._fallback.analyze(context)
+            return rule_diagnosis
+
+        rule_diagnosis.analysis_path = "rule_deadline"
+        logger.warning(
+            "LLM missed deadline — using rule engine result",
+            extra={
+                "alert_id": context.alert.id,
+                "severity": context.alert.severity.value,
+                "deadline_seconds": deadline,
+            },
+        )
+        self._spawn(self._record_late_answer(key, context, rule_diagnosis, llm_task, deadline, started))
+        return rule_diagnosis
+
+    async def _record_late_answer(
+        self,
+        key: str,
+        context: EnrichedContext,
+        rule_diagnosis: Diagnosis,
+        llm_task: asyncio.Task,
+        deadline: float,
+        started: float,
+    ) -> None:
+        """Wait for the losing LLM call and audit its answer next to the rule result."""
+        details: Dict[str, Any] = {
+            "alert_id": context.alert.id,
+            "winner": "rule_deadline",
+            "deadline_seconds": deadline,
+            "rule_diagnosis": rule_diagnosis.model_dump(mode="json"),
+        }
+        try:
+            llm_diagnosis = await llm_task
+            self._remember(key, llm_diagnosis)
+            details["llm_diagnosis"] = llm_diagnosis.model_dump(mode="json")
+        except Exception as exc:
+            details["llm_error"] = str(exc)[:200]
+        details["llm_latency_seconds"] = round(time.monotonic() - started, 3)
+        if self._audit is not None:
+            await self._audit.log_event(
+                AuditLog(component="LLMAnalyzer", event="LateLLMDiagnosis", details=details)
+            )
+
+    def _remember(self, key: str, diagnosis: Diagnosis) -> None:
+        # Only LLM answers are cached; fallback results are cheap and degraded.
+        if self._cache is not None:
+            self._cache.put(key, diagnosis)
+
+    def _count(self, diagnosis: Diagnosis) -> Diagnosis:
+        self._paths[diagnosis.analysis_path] += 1
+        return diagnosis
+
+    def _spawn(self, coro) -> None:
+        task = asyncio.ensure_future(coro)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    @classmethod
+    def _fallback_path(cls, context: EnrichedContext, exc: BaseException) -> str:
+        """Path label for a rule result standing in for a failed LLM call."""
+        if isinstance(exc, CircuitOpenError):
+            # Lost the race for a HALF_OPEN probe slot: the LLM was never called.
+            return "rule_circuit_open"
+        cls._log_llm_failure(context, exc)
+        return "rule_fallback"
+
+    @staticmethod
+    def _log_llm_failure(context: EnrichedContext, exc: BaseException) -> None:
+        logger.warning(
+            "LLM analysis failed — falling back to rule engine",
+            extra={"error": str(exc)[:200], "alert_id": context.alert.id},
+        )
+
+    async def _call_llm_once(self, key: str, context: EnrichedContext) -> Diagnosis:
+        """
+        Coalesce concurrent identical analyses into one LLM call.
+
+        The first caller for ``key`` starts the call as a standalone task; later
+        callers await the same task and receive a copy stamped with their own
+        alert_id. A failure is raised to every waiter, so each one takes the
+        same rule-engine fallback path as the first caller. The shared task is
+        shielded so one caller being cancelled does not cancel it for the rest.
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._call_llm(context))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t, k=key: self._on_call_done(k, t))
+            return await asyncio.shield(task)
+
+        self._coalesced += 1
+        diagnosis = await asyncio.shield(task)
+        return diagnosis.model_copy(update={"alert_id": context.alert.id}, deep=True)
+
+    def _on_call_done(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark the exception retrieved even if every waiter was cancelled.
+        if not task.cancelled():
+            task.exception()
 
     async def _call_llm(self, context: EnrichedContext) -> Diagnosis:
+        """Call the Claude API (directly or via the route's micro-batcher) for one alert."""
+        route = self._router.route(context)
+        if self._batching:
+            return await self._batcher_for(route).submit(context)
+        return await self._call_llm_single(route, context)
+
+    def _batcher_for(self, route: ModelRoute) -> MicroBatcher:
+        batcher = self._batchers.get(route.name)
+        if batcher is None:
+            batcher = self._batchers[route.name] = MicroBatcher(
+                partial(self._call_llm_batch, route),
+                window_seconds=self._batch_window_seconds,
+                max_batch_size=self._batch_max_size,
+            )
+        return batcher
+
+    def _structured_for(self, route: ModelRoute) -> Tuple[Any, Any]:
+        """The route's structured-output wrappers, built once per route."""
+        wrappers = self._structured.get(route.name)
+        if wrappers is None:
+            client = self._router.client(route)
+            # include_raw exposes token usage and lets a partially invalid
+            # batch be salvaged item by item.
+            wrappers = self._structured[route.name] = (
+                client.with_structured_output(_LLMDiagnosisOutput, include_raw=True),
+                client.with_structured_output(_LLMBatchOutput, include_raw=True),
+            )
+        return wrappers
+
+    async def _call_llm_single(self, route: ModelRoute, context: EnrichedContext) -> Diagnosis:
         """Call the Claude API and return a structured Diagnosis."""
-        messages = [
-            SystemMessage(content=_SYSTEM_PROMPT),
-            HumanMessage(content=self._build_prompt(context)),
-        ]
-        llm_output: _LLMDiagnosisOutput = await self._structured_llm.ainvoke(messages)
+        prompt = self._prompts.build(context)
+        self._log_prompt(prompt, route, [context])
+        response: Dict[str, Any] = await self._invoke(self._structured_for(route)[0], prompt.messages, route)
+        llm_output: Optional[_LLMDiagnosisOutput] = response.get("parsed")
+        if llm_output is None:
+            raise ValueError(f"Unparseable LLM response: {response.get('parsing_error')}")
+        return self._to_diagnosis(context, llm_output)
+
+    async def _call_llm_batch(
+        self, route: ModelRoute, contexts: List[EnrichedContext]
+    ) -> List[Union[Diagnosis, Exception]]:
+        """
+        Analyze several alerts in one structured-output request.
+
+        Returns one entry per context: a Diagnosis, or an exception for alerts
+        the response did not cover or that failed validation — those callers
+        fall back to the rule engine individually.
+        """
+        if len(contexts) == 1:
+            return [await self._call_llm_single(route, contexts[0])]
+
+        prompt = self._prompts.build_batch(contexts)
+        self._log_prompt(prompt, route, contexts)
+        response: Dict[str, Any] = await self._invoke(self._structured_for(route)[1], prompt.messages, route)
+        items = self._parse_batch_items(response)
+
+        results: List[Union[Diagnosis, Exception]] = []
+        for index, context in enumerate(contexts):
+            item = items.get(index)
+            if isinstance(item, _LLMBatchItem):
+                results.append(self._to_diagnosis(context, item))
+            else:
+                results.append(item or ValueError(f"Batch response missing ALERT [{index}]"))
+        return results
+
+    async def _invoke(self, runnable, messages: List[Any], route: ModelRoute) -> Any:
+        """Perform one API call through the circuit breaker and rate limiter."""
+        if self._breaker is not None and not self._breaker.allow():
+            raise CircuitOpenError("LLM circuit is open")
+        try:
+            if self._limiter is None:
+                return await self._timed_invoke(runnable, messages, route)
+            async with self._limiter.slot():
+                return await self._timed_invoke(runnable, messages, route)
+        except BaseException as exc:
+            # _timed_invoke records every Exception; a cancelled call has no
+            # outcome, but a HALF_OPEN probe slot must not leak with it.
+            if self._breaker is not None and not isinstance(exc, Exception):
+                self._breaker.release()
+            raise
+
+    async def _timed_invoke(self, runnable, messages: List[Any], route: ModelRoute) -> Any:
+        started = time.monotonic()
+        try:
+            result = await runnable.ainvoke(messages)
+        except Exception as exc:
+            if self._limiter is not None and _is_rate_limited(exc):
+                self._limiter.on_throttled(_retry_after(exc))
+            if self._breaker is not None:
+                self._breaker.record_failure(time.monotonic() - started)
+            self._router.record(route, started, ok=False)
+            raise
+        if self._limiter is not None:
+            self._limiter.on_success()
+        if self._breaker is not None:
+            self._breaker.record_success(time.monotonic() - started)
+        raw = result.get("raw") if isinstance(result, dict) else None
+        self._router.record(route, started, ok=True, usage=getattr(raw, "usage_metadata", None))
+        return result
+
+    def _parse_batch_items(self, response: Dict[str, Any]) -> Dict[int, Any]:
+        """Map alert_index -> parsed item (or the per-item validation error)."""
+        parsed: Optional[_LLMBatchOutput] = response.get("parsed")
+        if parsed is not None:
+            return {item.alert_index: item for item in parsed.diagnoses}
+
+        # Whole-batch validation failed: salvage whichever items are valid.
+        raw = response.get("raw")
+        tool_calls = getattr(raw, "tool_calls", None) or []
+        if not tool_calls:
+            raise ValueError(f"Unparseable batch response: {response.get('parsing_error')}")
+        items: Dict[int, Any] = {}
+        for raw_item in tool_calls[0].get("args", {}).get("diagnoses", []):
+            if not isinstance(raw_item, dict) or not isinstance(raw_item.get("alert_index"), int):
+                continue
+            try:
+                items[raw_item["alert_index"]] = _LLMBatchItem.model_validate(raw_item)
+            except ValueError as exc:
+                items[raw_item["alert_index"]] = exc
+        return items
+
+    @staticmethod
+    def _log_prompt(prompt: BuiltPrompt, route: ModelRoute, contexts: List[EnrichedContext]) -> None:
+        logger.debug(
+            "LLM prompt built",
+            extra={
+                "alert_ids": [context.alert.id for context in contexts],
+                "route": route.name,
+                "prompt_tokens": prompt.tokens,
+                "build_ms": round(prompt.build_seconds * 1000, 3),
+                "history_omitted": prompt.omitted,
+            },
+        )
+
+    @staticmethod
+    def _to_diagnosis(context: EnrichedContext, llm_output: _LLMDiagnosisOutput) -> Diagnosis:
         return Diagnosis(
             alert_id=context.alert.id,
             root_cause=llm_output.root_cause,
@@ -88,44 +459,21 @@ class LLMAnalyzer(IAnalysisModule):
             alternative_hypotheses=llm_output.alternative_hypotheses,
             reasoning_trace=llm_output.reasoning_trace,
             suggested_actions=llm_output.suggested_actions,
+            analysis_path="llm",
         )
 
-    def _build_prompt(self, context: EnrichedContext) -> str:
-        """Build the causal-RCA prompt from the enriched context."""
-        recent_str = self._format_incidents(context.recent_similar_incidents)
-        past_str = self._format_remediations(context.past_remediations_for_source)
-        return (
-            f"ALERT RECEIVED:\n"
-            f"  Source:   {context.alert.source}\n"
-            f"  Severity: {context.alert.severity}\n"
-            f"  Message:  {context.alert.message}\n"
-            f"  Metadata: {context.alert.metadata}\n\n"
-            f"HISTORICAL CONTEXT:\n"
-            f"  Recent similar incidents (last 24 h):\n{recent_str}\n\n"
-            f"  Past executed remediations for this source:\n{past_str}\n\n"
-            f"INSTRUCTIONS FOR CAUSAL ANALYSIS:\n"
-            f"1. Construct a causal chain of events — do NOT rely on correlation alone.\n"
-            f"2. Evaluate alternative hypotheses (e.g. memory leak vs. traffic spike vs. query loop).\n"
-            f"3. If a past remediation (e.g. RESTART_SERVICE) was executed recently and the alert recurred, "
-            f"do NOT suggest the same action — escalate or find the real root cause.\n"
-            f"4. Provide a detailed reasoning_trace documenting your step-by-step logic.\n"
-            f"5. Set confidence between 0.0 and 1.0 — keep it low if telemetry is insufficient.\n"
-            f"6. Suggest actions only from: "
-            f"[RESTART_SERVICE, CLEAR_CACHE, SCALE_UP, BLOCK_IP, NOTIFICATION, MANUAL_INTERVENTION]."
-        )
 
-    def _format_incidents(self, incidents: list) -> str:
-        if not incidents:
-            return "    None."
-        return "\n".join(
-            f"    - [{inc.status}] {inc.source}: {inc.message} (severity={inc.severity})"
-            for inc in incidents
-        )
+def _is_rate_limited(exc: BaseException) -> bool:
+    """True for HTTP 429 responses (anthropic.RateLimitError and friends)."""
+    return getattr(exc, "status_code", None) == 429 or type(exc).__name__ == "RateLimitError"
 
-    def _format_remediations(self, plans: list) -> str:
-        if not plans:
-            return "    None."
-        return "\n".join(
-            f"    - [{plan.status}] {plan.action_type}: {plan.diagnosis.root_cause}"
-            for plan in plans
-        )
+
+def _retry_after(exc: BaseException) -> Optional[float]:
+    """Retry-After header of a throttled response, in seconds, if present."""
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,255 @@
+"""
+PromptBuilder: token-budgeted RCA prompts with a cacheable static prefix.
+
+The prompt used to carry the raw ``alert.metadata`` repr and every recent
+incident and remediation verbatim, so its size (and the LLM's latency) grew
+with history. Here each alert section has a hard token budget:
+
+    - the alert message and metadata share ``_ALERT_BUDGET_SHARE`` of the
+      budget; metadata is rendered as sorted ``key=value`` pairs with long
+      values cut and a ``(+N more keys)`` marker once its share is used up;
+    - identical incidents / remediations are collapsed into one ``Nx`` line;
+    - history is ranked by relevance to the current alert (same source, same
+      severity, message overlap, recency) and filled greedily up to the
+      budget, with a ``(+N more omitted)`` line for the rest.
+
+Ranking ties break on the rendered line itself, so the same context always
+yields the same prompt (which also keeps DiagnosisCache/single-flight keys and
+provider-side caching effective).
+
+The system prompt and the analysis instructions form one static system
+message, byte-identical across calls and marked with ``cache_control`` so
+Anthropic prompt caching can reuse it; only the human message varies.
+
+Token counts are estimated at ~4 characters per token; no tokenizer needed.
+"""
+import math
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from langchain_core.messages import HumanMessage, SystemMessage
+
+from ...core.entities import EnrichedContext, Incident, RemediationPlan
+from ...core.metrics import registry
+
+PROMPT_TOKENS = registry.histogram(
+    "sentinel_llm_prompt_tokens",
+    "Estimated tokens per LLM prompt.",
+    buckets=(250, 500, 1000, 2000, 4000, 8000, 16000, 32000),
+)
+PROMPT_BUILD_SECONDS = registry.histogram(
+    "sentinel_llm_prompt_build_seconds",
+    "Time spent building one LLM prompt.",
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025),
+)
+
+SYSTEM_PROMPT = (
+    "You are SENTINEL, a Senior Site Reliability Engineer Agent. "
+    "Your job is strict causal root-cause analysis — not probabilistic guessing. "
+    "Always construct a causal chain of events and consider past remediation history "
+    "before suggesting actions."
+)
+
+INSTRUCTIONS = (
+    "INSTRUCTIONS FOR CAUSAL ANALYSIS:\n"
+    "1. Construct a causal chain of events — do NOT rely on correlation alone.\n"
+    "2. Evaluate alternative hypotheses (e.g. memory leak vs. traffic spike vs. query loop).\n"
+    "3. If a past remediation (e.g. RESTART_SERVICE) was executed recently and the alert recurred, "
+    "do NOT suggest the same action — escalate or find the real root cause.\n"
+    "4. Provide a detailed reasoning_trace documenting your step-by-step logic.\n"
+    "5. Set confidence between 0.0 and 1.0 — keep it low if telemetry is insufficient.\n"
+    "6. Suggest actions only from: "
+    "[RESTART_SERVICE, CLEAR_CACHE, SCALE_UP, BLOCK_IP, NOTIFICATION, MANUAL_INTERVENTION].\n"
+    "7. History lines prefixed with Nx stand for N identical entries."
+)
+
+_MAX_MESSAGE_CHARS = 1000
+_MAX_METADATA_VALUE_CHARS = 120
+# Fraction of section_token_budget for the alert's message and metadata; the
+# message takes at most half of it, metadata the rest.
+_ALERT_BUDGET_SHARE = 0.25
+_CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token)."""
+    return math.ceil(len(text) / _CHARS_PER_TOKEN)
+
+
+class BuiltPrompt:
+    """Messages for one LLM call plus what it cost to build them."""
+
+    __slots__ = ("messages", "tokens", "build_seconds", "omitted")
+
+    def __init__(self, messages: List[Any], tokens: int, build_seconds: float, omitted: int) -> None:
+        self.messages = messages
+        self.tokens = tokens
+        self.build_seconds = build_seconds
+        self.omitted = omitted
+
+
+class PromptBuilder:
+    """Builds single and batched RCA prompts within ``section_token_budget`` per alert."""
+
+    def __init__(self, section_token_budget: int = 1500) -> None:
+        self.section_token_budget = section_token_budget
+        static = f"{SYSTEM_PROMPT}\n\n{INSTRUCTIONS}"
+        self.system_message = SystemMessage(
+            content=[{"type": "text", "text": static, "cache_control": {"type": "ephemeral"}}]
+        )
+        self._static_tokens = estimate_tokens(static)
+
+    def build(self, context: EnrichedContext) -> BuiltPrompt:
+        started = time.perf_counter()
+        section, omitted = self.alert_section(context)
+        return self._finish([self.system_message, HumanMessage(content=section)], started, omitted)
+
+    def build_batch(self, contexts: Sequence[EnrichedContext]) -> BuiltPrompt:
+        started = time.perf_counter()
+        parts = [
+            f"You will analyze {len(contexts)} INDEPENDENT alerts. Treat each ALERT [i] block "
+            f"on its own and return exactly one diagnosis per block, with alert_index = i.\n\n"
+        ]
+        omitted = 0
+        for index, context in enumerate(contexts):
+            section, section_omitted = self.alert_section(context)
+            parts.append(f"=== ALERT [{index}] ===\n{section}")
+            omitted += section_omitted
+        return self._finish([self.system_message, HumanMessage(content="".join(parts))], started, omitted)
+
+    def alert_section(self, context: EnrichedContext) -> Tuple[str, int]:
+        """The per-alert text and how many history lines were dropped to fit the budget."""
+        alert = context.alert
+        alert_chars = int(self.section_token_budget * _ALERT_BUDGET_SHARE) * _CHARS_PER_TOKEN
+        message = _clip(alert.message, min(_MAX_MESSAGE_CHARS, alert_chars // 2))
+        header = (
+            f"ALERT RECEIVED:\n"
+            f"  Source:   {_clip(alert.source, 200)}\n"
+            f"  Severity: {alert.severity.value}\n"
+            f"  Message:  {message}\n"
+            f"  Metadata: {_format_metadata(alert.metadata, alert_chars - len(message))}\n"
+            f"  Occurrences since last analysis: {alert.occurrences}\n"
+        )
+        if context.escalation_reason:
+            header += f"  Escalated by rule engine: {_clip(context.escalation_reason, 200)}\n"
+        header += "\nHISTORICAL CONTEXT:\n"
+        incidents_title = "  Recent similar incidents (last 24 h):\n"
+        remediations_title = "\n  Past executed remediations for this source:\n"
+
+        remaining = max(0, self.section_token_budget - estimate_tokens(
+            header + incidents_title + remediations_title
+        ))
+        incident_lines = _incident_lines(context)
+        remediation_lines = _remediation_lines(context)
+        # Remediations get at least half the history budget; incidents may use
+        # whatever remediations do not need.
+        remediation_need = sum(estimate_tokens(line) for line in remediation_lines)
+        incident_block, incident_used, incident_omitted = _fill(
+            incident_lines, max(remaining // 2, remaining - remediation_need)
+        )
+        remediation_block, _, remediation_omitted = _fill(remediation_lines, remaining - incident_used)
+        section = (
+            f"{header}{incidents_title}{incident_block}\n"
+            f"{remediations_title}{remediation_block}\n\n"
+        )
+        return section, incident_omitted + remediation_omitted
+
+    def _finish(self, messages: List[Any], started: float, omitted: int) -> BuiltPrompt:
+        tokens = self._static_tokens + estimate_tokens(messages[-1].content)
+        elapsed = time.perf_counter() - started
+        PROMPT_TOKENS.observe(tokens)
+        PROMPT_BUILD_SECONDS.observe(elapsed)
+        return BuiltPrompt(messages, tokens, elapsed, omitted)
+
+
+def _clip(text: str, limit: int) -> str:
+    return text if len(text) <= limit else text[: limit - 1] + "…"
+
+
+def _format_metadata(metadata: Dict[str, Any], limit: int) -> str:
+    """Sorted ``key=value`` pairs within ``limit`` characters, then a count of the keys left out."""
+    if not metadata:
+        return "none"
+    pairs: List[str] = []
+    used = 0
+    keys = sorted(metadata, key=str)
+    for key in keys:
+        value = metadata[key]
+        pair = f"{_clip(str(key), _MAX_METADATA_VALUE_CHARS)}={_clip(str(value), _MAX_METADATA_VALUE_CHARS)}"
+        if used + len(pair) + 2 > limit:
+            break
+        pairs.append(pair)
+        used += len(pair) + 2
+    left_out = len(keys) - len(pairs)
+    if left_out:
+        pairs.append(f"(+{left_out} more keys)")
+    return ", ".join(pairs)
+
+
+def _words(text: str) -> frozenset:
+    return frozenset(text.lower().split())
+
+
+def _incident_lines(context: EnrichedContext) -> List[str]:
+    """Collapsed incident lines, most relevant first."""
+    alert = context.alert
+    alert_words = _words(alert.message)
+    groups: Dict[Tuple[str, str, str, str], List[Incident]] = {}
+    for incident in context.recent_similar_incidents:
+        key = (
+            incident.source,
+            incident.severity.value,
+            incident.status,
+            " ".join(incident.message.split()),
+        )
+        groups.setdefault(key, []).append(incident)
+
+    ranked = []
+    for (source, severity, status, message), members in groups.items():
+        words = _words(message)
+        overlap = len(words & alert_words) / len(words | alert_words) if words else 0.0
+        latest = max(incident.created_at for incident in members).timestamp()
+        line = _counted(len(members), f"[{status}] {source}: {_clip(message, 200)} (severity={severity})")
+        score = (source == alert.source, severity == alert.severity.value, round(overlap, 3), latest, len(members))
+        ranked.append((score, line))
+    ranked.sort(key=lambda item: (tuple(-v for v in item[0]), item[1]))
+    return [line for _, line in ranked]
+
+
+def _remediation_lines(context: EnrichedContext) -> List[str]:
+    """Collapsed remediation lines: most repeated first, then overlap with the alert."""
+    alert_words = _words(context.alert.message)
+    counts: Counter = Counter()
+    for plan in context.past_remediations_for_source:
+        counts[(plan.status, plan.action_type.value, " ".join(plan.diagnosis.root_cause.split()))] += 1
+
+    ranked = []
+    for (status, action, root_cause), count in counts.items():
+        overlap = len(_words(root_cause) & alert_words)
+        line = _counted(count, f"[{status}] {action}: {_clip(root_cause, 200)}")
+        ranked.append(((-count, -overlap), line))
+    ranked.sort()
+    return [line for _, line in ranked]
+
+
+def _counted(count: int, text: str) -> str:
+    return f"    - {count}x {text}" if count > 1 else f"    - {text}"
+
+
+def _fill(lines: List[str], budget: int) -> Tuple[str, int, int]:
+    """Take lines in order while they fit ``budget`` tokens: (block, tokens used, omitted)."""
+    if not lines:
+        return "    None.", 0, 0
+    taken: List[str] = []
+    used = 0
+    for line in lines:
+        cost = estimate_tokens(line) + 1
+        if used + cost > budget:
+            break
+        taken.append(line)
+        used += cost
+    omitted = len(lines) - len(taken)
+    if omitted:
+        taken.append(f"    (+{omitted} more omitted)")
+    return "\n".join(taken), used, omitted
@@ -0,0 +1,227 @@
+"""
+Resilience primitives for calls to the Claude API.
+
+CircuitBreaker
+    Tracks the outcome and latency of recent calls. When the failure rate or
+    slow-call rate over the window crosses its threshold the circuit OPENs and
+    LLMAnalyzer sends alerts straight to the rule engine instead of paying the
+    full timeout on a degraded endpoint. After ``open_seconds`` it goes
+    HALF_OPEN and lets a few probe calls through; a healthy probe closes it.
+
+AdaptiveRateLimiter
+    A concurrency cap plus a token bucket whose refill rate adapts AIMD-style:
+    each success nudges the rate up, each 429 halves it (and honours any
+    Retry-After), so we converge on what the provider currently accepts.
+"""
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from enum import Enum
+from typing import AsyncIterator, Callable, Deque, Dict, Optional, Tuple
+
+
+class CircuitState(str, Enum):
+    CLOSED = "CLOSED"
+    OPEN = "OPEN"
+    HALF_OPEN = "HALF_OPEN"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the LLM while the circuit is open."""
+
+
+class CircuitBreaker:
+    """Error-rate and latency driven circuit breaker (closed / open / half-open)."""
+
+    def __init__(
+        self,
+        window_size: int = 20,
+        min_calls: int = 5,
+        failure_rate_threshold: float = 0.5,
+        slow_call_seconds: float = 10.0,
+        slow_call_rate_threshold: float = 0.5,
+        open_seconds: float = 30.0,
+        half_open_max_calls: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._min_calls = min_calls
+        self._failure_rate_threshold = failure_rate_threshold
+        self._slow_call_seconds = slow_call_seconds
+        self._slow_call_rate_threshold = slow_call_rate_threshold
+        self._open_seconds = open_seconds
+        self._half_open_max_calls = half_open_max_calls
+        self._clock = clock
+        # (failed, slow) per recent call.
+        self._window: Deque[Tuple[bool, bool]] = deque(maxlen=window_size)
+        self._state = CircuitState.CLOSED
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self.times_opened = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> CircuitState:
+        if self._state is CircuitState.OPEN and self._clock() - self._opened_at >= self._open_seconds:
+            self._state = CircuitState.HALF_OPEN
+            self._probes_in_flight = 0
+        return self._state
+
+    def is_open(self) -> bool:
+        """True while calls should skip the LLM entirely (does not consume a probe)."""
+        return self.state is CircuitState.OPEN
+
+    def rejecting(self) -> bool:
+        """True while ``allow`` would refuse: OPEN, or HALF_OPEN with every probe slot taken."""
+        state = self.state
+        return state is CircuitState.OPEN or (
+            state is CircuitState.HALF_OPEN and self._probes_in_flight >= self._half_open_max_calls
+        )
+
+    def allow(self) -> bool:
+        """Ask permission for one call. In HALF_OPEN only a few probes are let through."""
+        state = self.state
+        if state is CircuitState.CLOSED:
+            return True
+        if state is CircuitState.HALF_OPEN and self._probes_in_flight < self._half_open_max_calls:
+            self._probes_in_flight += 1
+            return True
+        self.rejected += 1
+        return False
+
+    def record_success(self, duration: float) -> None:
+        self._record(failed=False, slow=duration >= self._slow_call_seconds)
+
+    def record_failure(self, duration: float) -> None:
+        self._record(failed=True, slow=duration >= self._slow_call_seconds)
+
+    def release(self) -> None:
+        """Give back the probe slot of an allowed call that ended without an outcome (cancelled)."""
+        if self.state is CircuitState.HALF_OPEN:
+            self._probes_in_flight = max(0, self._probes_in_flight - 1)
+
+    def stats(self) -> Dict:
+        calls = len(self._window)
+        return {
+            "state": self.state.value,
+            "window_calls": calls,
+            "failure_rate": round(self._rate(0), 4) if calls else 0.0,
+            "slow_call_rate": round(self._rate(1), 4) if calls else 0.0,
+            "times_opened": self.times_opened,
+            "rejected": self.rejected,
+        }
+
+    def _record(self, failed: bool, slow: bool) -> None:
+        state = self.state
+        if state is CircuitState.HALF_OPEN:
+            self._probes_in_flight = max(0, self._probes_in_flight - 1)
+            if failed or slow:
+                self._open()
+            else:
+                self._state = CircuitState.CLOSED
+                self._window.clear()
+            return
+        self._window.append((failed, slow))
+        if state is CircuitState.CLOSED and len(self._window) >= self._min_calls:
+            if (
+                self._rate(0) >= self._failure_rate_threshold
+                or self._rate(1) >= self._slow_call_rate_threshold
+            ):
+                self._open()
+
+    def _rate(self, field: int) -> float:
+        return sum(1 for outcome in self._window if outcome[field]) / len(self._window)
+
+    def _open(self) -> None:
+        self._state = CircuitState.OPEN
+        self._opened_at = self._clock()
+        self._window.clear()
+        self.times_opened += 1
+
+
+class AdaptiveRateLimiter:
+    """Concurrency limiter + token bucket with AIMD rate adaptation on 429s."""
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        rate_per_second: float = 5.0,
+        min_rate_per_second: float = 0.5,
+        max_rate_per_second: Optional[float] = None,
+        increase_step: float = 0.1,
+        decrease_factor: float = 0.5,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._max_concurrency = max_concurrency
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._rate = rate_per_second
+        self._min_rate = min_rate_per_second
+        self._max_rate = max_rate_per_second or rate_per_second * 4
+        self._increase_step = increase_step
+        self._decrease_factor = decrease_factor
+        self._clock = clock
+        self._tokens = 1.0
+        self._last_refill = clock()
+        self._paused_until = 0.0
+        self._in_flight = 0
+        self._waiting = 0
+        self.throttled = 0
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold one concurrency slot and one rate token for the duration of a call."""
+        self._waiting += 1
+        try:
+            await self._semaphore.acquire()
+            try:
+                await self._take_token()
+            except BaseException:
+                self._semaphore.release()
+                raise
+        finally:
+            self._waiting -= 1
+        self._in_flight += 1
+        try:
+            yield
+        finally:
+            self._in_flight -= 1
+            self._semaphore.release()
+
+    def on_success(self) -> None:
+        self._rate = min(self._max_rate, self._rate + self._increase_step)
+
+    def on_throttled(self, retry_after: Optional[float] = None) -> None:
+        self.throttled += 1
+        self._rate = max(self._min_rate, self._rate * self._decrease_factor)
+        if retry_after:
+            self._paused_until = max(self._paused_until, self._clock() + retry_after)
+
+    def stats(self) -> Dict:
+        self._refill()
+        return {
+            "in_flight": self._in_flight,
+            "max_concurrency": self._max_concurrency,
+            "waiting": self._waiting,
+            "rate_per_second": round(self._rate, 3),
+            "tokens": round(self._tokens, 3),
+            "throttled": self.throttled,
+        }
+
+    async def _take_token(self) -> None:
+        while True:
+            now = self._clock()
+            if now < self._paused_until:
+                await asyncio.sleep(self._paused_until - now)
+                continue
+            self._refill()
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return
+            await asyncio.sleep((1.0 - self._tokens) / self._rate)
+
+    def _refill(self) -> None:
+        now = self._clock()
+        # Burst capacity follows the current rate (at least one token).
+        capacity = max(1.0, self._rate)
+        self._tokens = min(capacity, self._tokens + (now - self._last_refill) * self._rate)
+        self._last_refill = now
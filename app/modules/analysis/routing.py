@@ -0,0 +1,162 @@
+"""
+ModelRouter: picks the model (and max_tokens budget) for each LLM analysis.
+
+A single large model used to handle everything from INFO latency blips to
+FATAL outages. Routes are matched in order on severity, source glob and
+whether the rule tier found no match (``EnrichedContext.escalation_reason``);
+the first route that matches wins, otherwise the default route is used. Each
+route's chat client is created once on first use and reused, and per-route
+call counts, latency, token usage and estimated cost are kept for the status
+endpoint. The p95 of the last ``LATENCY_WINDOW`` successful calls is the
+figure to size LLM_DEADLINE_SECONDS against.
+"""
+import math
+import time
+from collections import deque
+from fnmatch import fnmatchcase
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence
+
+from ...core.entities import AlertSeverity, EnrichedContext
+
+
+class ModelRoute:
+    """One routing-table entry. Empty criteria match everything."""
+
+    def __init__(
+        self,
+        name: str,
+        model: str,
+        max_tokens: int = 1024,
+        severities: Sequence[AlertSeverity] = (),
+        sources: Sequence[str] = (),
+        rule_miss: Optional[bool] = None,
+        input_cost_per_mtok: float = 0.0,
+        output_cost_per_mtok: float = 0.0,
+    ):
+        self.name = name
+        self.model = model
+        self.max_tokens = max_tokens
+        self.severities = frozenset(AlertSeverity(s) for s in severities)
+        self.sources = tuple(sources)
+        # True: only alerts no rule matched; False: only rule-matched ones; None: either.
+        self.rule_miss = rule_miss
+        self.input_cost_per_mtok = input_cost_per_mtok
+        self.output_cost_per_mtok = output_cost_per_mtok
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ModelRoute":
+        return cls(**data)
+
+    def matches(self, context: EnrichedContext) -> bool:
+        alert = context.alert
+        if self.severities and alert.severity not in self.severities:
+            return False
+        if self.sources and not any(fnmatchcase(alert.source, glob) for glob in self.sources):
+            return False
+        if self.rule_miss is not None:
+            if (context.escalation_reason == "no_rule_match") != self.rule_miss:
+                return False
+        return True
+
+
+LATENCY_WINDOW = 200
+
+
+class _RouteStats:
+    __slots__ = (
+        "calls", "failures", "latency_sum", "latency_max", "recent", "input_tokens", "output_tokens", "cost_usd",
+    )
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.failures = 0
+        self.latency_sum = 0.0
+        self.latency_max = 0.0
+        # Latencies of the most recent successful calls, for the p95.
+        self.recent: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.cost_usd = 0.0
+
+
+class ModelRouter:
+    """Routing table plus one pooled client per route."""
+
+    def __init__(
+        self,
+        routes: Sequence[ModelRoute],
+        default: ModelRoute,
+        client_factory: Callable[[ModelRoute], Any],
+    ) -> None:
+        self.routes: List[ModelRoute] = list(routes)
+        self.default = default
+        self._client_factory = client_factory
+        self._clients: Dict[str, Any] = {}
+        self._stats: Dict[str, _RouteStats] = {}
+
+    def route(self, context: EnrichedContext) -> ModelRoute:
+        for route in self.routes:
+            if route.matches(context):
+                return route
+        return self.default
+
+    def client(self, route: ModelRoute) -> Any:
+        """The route's chat model, created by ``client_factory`` on first use."""
+        client = self._clients.get(route.name)
+        if client is None:
+            client = self._clients[route.name] = self._client_factory(route)
+        return client
+
+    def record(
+        self,
+        route: ModelRoute,
+        started: float,
+        ok: bool,
+        usage: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Account one API call against ``route``; ``started`` is a time.monotonic() value."""
+        stats = self._stats.get(route.name)
+        if stats is None:
+            stats = self._stats[route.name] = _RouteStats()
+        latency = time.monotonic() - started
+        stats.calls += 1
+        stats.latency_sum += latency
+        stats.latency_max = max(stats.latency_max, latency)
+        if ok:
+            stats.recent.append(latency)
+        else:
+            stats.failures += 1
+        if usage:
+            input_tokens = usage.get("input_tokens", 0)
+            output_tokens = usage.get("output_tokens", 0)
+            stats.input_tokens += input_tokens
+            stats.output_tokens += output_tokens
+            stats.cost_usd += (
+                input_tokens * route.input_cost_per_mtok + output_tokens * route.output_cost_per_mtok
+            ) / 1_000_000
+
+    def stats(self) -> Dict[str, dict]:
+        result = {}
+        for route in self.routes + [self.default]:
+            stats = self._stats.get(route.name)
+            if stats is None:
+                continue
+            result[route.name] = {
+                "model": route.model,
+                "calls": stats.calls,
+                "failures": stats.failures,
+                "latency_avg_seconds": round(stats.latency_sum / stats.calls, 4),
+                "latency_max_seconds": round(stats.latency_max, 4),
+                "latency_p95_seconds": _p95(stats.recent),
+                "input_tokens": stats.input_tokens,
+                "output_tokens": stats.output_tokens,
+                "cost_usd": round(stats.cost_usd, 6),
+            }
+        return result
+
+
+def _p95(latencies: Sequence[float]) -> Optional[float]:
+    if not latencies:
+        return None
+    ordered = sorted(latencies)
+    return round(ordered[math.ceil(0.95 * len(ordered)) - 1], 4)
@@ -1,6 +1,10 @@
+import json
+import operator
+import re
 from collections import defaultdict
-from typing import List, Optional, Callable
-from ...core.entities import Alert, Diagnosis, ActionType
+from fnmatch import fnmatchcase
+from typing import Any, Dict, List, Optional, Callable, Sequence
+from ...core.entities import Alert, AlertSeverity, Diagnosis, ActionType
 
 class Rule:
     def __init__(
@@ -8,12 +12,15 @@ class Rule:
         name: str, 
         condition: Callable[[Alert], bool], 
         root_cause_template: str,
-        suggested_actions: List[ActionType]
+        suggested_actions: List[ActionType],
+        confidence: float = 1.0,
     ):
         self.name = name
         self.condition = condition
         self.root_cause_template = root_cause_template
         self.suggested_actions = suggested_actions
+        # Below 1.0 the TieredAnalyzer may escalate a match to the LLM.
+        self.confidence = confidence
 
     def match(self, alert: Alert) -> bool:
         return self.condition(alert)
@@ -24,33 +31,147 @@ class Rule:
         return Diagnosis(
             alert_id=alert.id,
             root_cause=self.root_cause_template.format_map(safe_metadata),
-            confidence=1.0,  # Rules are deterministic in this MVP
-            suggested_actions=self.suggested_actions
+            confidence=self.confidence,
+            suggested_actions=self.suggested_actions,
+            analysis_path="rule",
         )
 
+
+_COMPARATORS = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+
+class MetadataCondition:
+    """A threshold on one metadata field, e.g. ``cpu_usage >= 90``."""
+
+    __slots__ = ("key", "op", "value", "_compare")
+
+    def __init__(self, key: str, op: str, value: Any):
+        if op not in _COMPARATORS:
+            raise ValueError(f"Unknown metadata operator {op!r}")
+        self.key = key
+        self.op = op
+        self.value = value
+        self._compare = _COMPARATORS[op]
+
+    def test(self, metadata: Dict[str, Any]) -> bool:
+        if self.key not in metadata:
+            return False
+        try:
+            return bool(self._compare(metadata[self.key], self.value))
+        except TypeError:  # e.g. "high" >= 90
+            return False
+
+
+class DeclarativeRule(Rule):
+    """
+    A rule described by data instead of a lambda, so it can be loaded from a
+    file and compiled into a CompiledRuleSet index.
+
+    Every populated criterion must hold (AND); within ``keywords`` and
+    ``sources`` any entry may match (OR). Keywords are case-insensitive
+    substrings of the message, ``sources`` are fnmatch-style globs.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        root_cause_template: str,
+        suggested_actions: List[ActionType],
+        keywords: Sequence[str] = (),
+        pattern: Optional[str] = None,
+        sources: Sequence[str] = (),
+        severities: Sequence[AlertSeverity] = (),
+        metadata: Sequence[MetadataCondition] = (),
+        confidence: float = 1.0,
+    ):
+        self.keywords = tuple(k.lower() for k in keywords)
+        self.pattern = re.compile(pattern, re.IGNORECASE) if pattern else None
+        self.sources = tuple(sources)
+        self.severities = frozenset(severities)
+        self.metadata = tuple(metadata)
+        super().__init__(name, self._matches, root_cause_template, suggested_actions, confidence)
+
+    def _matches(self, alert: Alert) -> bool:
+        message = alert.message.lower()
+        if self.keywords and not any(k in message for k in self.keywords):
+            return False
+        return self.matches_residual(alert)
+
+    def matches_residual(self, alert: Alert) -> bool:
+        """Every criterion except keywords, which the compiled index has already checked."""
+        if self.severities and alert.severity not in self.severities:
+            return False
+        if self.sources and not any(fnmatchcase(alert.source, glob) for glob in self.sources):
+            return False
+        if self.pattern is not None and self.pattern.search(alert.message) is None:
+            return False
+        return all(condition.test(alert.metadata) for condition in self.metadata)
+
+
+def rule_from_dict(data: Dict[str, Any]) -> DeclarativeRule:
+    """Build a DeclarativeRule from its JSON form (see load_rules_file)."""
+    return DeclarativeRule(
+        name=data["name"],
+        root_cause_template=data["root_cause"],
+        suggested_actions=[ActionType(a) for a in data["actions"]],
+        keywords=data.get("keywords", ()),
+        pattern=data.get("pattern"),
+        sources=data.get("sources", ()),
+        severities=[AlertSeverity(s) for s in data.get("severities", ())],
+        metadata=[
+            MetadataCondition(c["key"], c["op"], c["value"]) for c in data.get("metadata", ())
+        ],
+        confidence=data.get("confidence", 1.0),
+    )
+
+
+def load_rules_file(path: str) -> List[DeclarativeRule]:
+    """
+    Load rules from a JSON file holding a list of objects like::
+
+        {"name": "High CPU", "keywords": ["cpu"], "sources": ["web-*"],
+         "metadata": [{"key": "cpu_usage", "op": ">=", "value": 90}],
+         "root_cause": "CPU saturation on {component}", "actions": ["SCALE_UP"]}
+
+    Raises on malformed input so a bad edit never replaces a working rule set.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, list):
+        raise ValueError("Rules file must contain a JSON list of rules")
+    return [rule_from_dict(item) for item in data]
+
+
 # Pre-defined rules library
 COMMON_RULES = [
-    Rule(
+    DeclarativeRule(
         name="High CPU",
-        condition=lambda a: "cpu" in a.message.lower(),
+        keywords=["cpu"],
         root_cause_template="CPU saturation on {component} at {cpu_usage}%",
         suggested_actions=[ActionType.SCALE_UP, ActionType.RESTART_SERVICE]
     ),
-    Rule(
+    DeclarativeRule(
         name="Memory Leak",
-        condition=lambda a: "memory" in a.message.lower(),
+        keywords=["memory"],
         root_cause_template="Memory leak detected in {component}",
         suggested_actions=[ActionType.RESTART_SERVICE]
     ),
-    Rule(
+    DeclarativeRule(
         name="Disk Space",
-        condition=lambda a: "disk" in a.message.lower() or "space" in a.message.lower(),
+        keywords=["disk", "space"],
         root_cause_template="Disk {mount} nearly full",
         suggested_actions=[ActionType.CLEAR_CACHE, ActionType.NOTIFICATION]
     ),
-    Rule(
+    DeclarativeRule(
         name="DB Connection",
-        condition=lambda a: "connection" in a.message.lower(),
+        keywords=["connection"],
         root_cause_template="Database unavailable (Code {error_code})",
         suggested_actions=[ActionType.RESTART_SERVICE, ActionType.MANUAL_INTERVENTION]
     )
@@ -0,0 +1,109 @@
+"""
+TieredAnalyzer: rule engine first, LLM only when the rules are not enough.
+
+With an API key configured every alert used to go to Claude, including the
+ones RuleBasedAnalyzer already diagnoses deterministically. Here the rule
+tier runs first and an EscalationPolicy decides whether its answer stands:
+
+    - no rule matched                              → escalate ("no_rule_match")
+    - the rule is listed in ``escalate_rules``      → escalate ("rule_policy")
+    - the rule is listed in ``authoritative_rules`` → rule decides
+    - confidence below the severity's minimum       → escalate ("low_confidence")
+    - >= ``recurrence_threshold`` recent incidents  → escalate ("recurrence")
+      from the alert's own source
+    - otherwise                                     → rule decides
+
+Rule-tier decisions carry ``analysis_path="rule_tier"``; escalated alerts are
+analyzed by the LLM with ``EnrichedContext.escalation_reason`` set, so both the
+prompt and the audit trail say why the LLM was consulted.
+"""
+from collections import Counter
+from typing import Dict, Iterable, Optional
+
+from ...core.entities import AlertSeverity, Diagnosis, EnrichedContext
+from ...core.interfaces import IAnalysisModule
+from ...core.logging import logger
+from .engine import RuleBasedAnalyzer
+from .rules import Rule
+
+
+class EscalationPolicy:
+    """Decides whether a rule-tier result is authoritative or goes to the LLM."""
+
+    def __init__(
+        self,
+        min_confidence: Optional[Dict[AlertSeverity, float]] = None,
+        escalate_rules: Iterable[str] = (),
+        authoritative_rules: Iterable[str] = (),
+        recurrence_threshold: int = 0,
+    ):
+        self.min_confidence = {
+            AlertSeverity(severity): value for severity, value in (min_confidence or {}).items()
+        }
+        self.escalate_rules = frozenset(escalate_rules)
+        self.authoritative_rules = frozenset(authoritative_rules)
+        self.recurrence_threshold = recurrence_threshold
+
+    def escalation_reason(
+        self, context: EnrichedContext, rule: Optional[Rule], diagnosis: Diagnosis
+    ) -> Optional[str]:
+        """None when the rule tier's diagnosis should stand, else why it should not."""
+        if rule is None:
+            return "no_rule_match"
+        if rule.name in self.escalate_rules:
+            return "rule_policy"
+        if rule.name in self.authoritative_rules:
+            return None
+        if diagnosis.confidence < self.min_confidence.get(context.alert.severity, 0.0):
+            return "low_confidence"
+        if self.recurrence_threshold > 0:
+            # recent_similar_incidents matches source OR severity; only the same
+            # source recurring says the rule's fix is not holding.
+            source = context.alert.source
+            recurring = sum(1 for incident in context.recent_similar_incidents if incident.source == source)
+            if recurring >= self.recurrence_threshold:
+                return "recurrence"
+        return None
+
+
+class TieredAnalyzer(IAnalysisModule):
+    """Rule tier first; escalates to the LLM tier only when the policy says so."""
+
+    def __init__(
+        self,
+        rule_analyzer: RuleBasedAnalyzer,
+        llm_analyzer: IAnalysisModule,
+        policy: Optional[EscalationPolicy] = None,
+    ):
+        self.rule_analyzer = rule_analyzer
+        self.llm_analyzer = llm_analyzer
+        self.policy = policy or EscalationPolicy()
+        self._decided = Counter()
+        self._escalations = Counter()
+
+    async def analyze(self, context: EnrichedContext) -> Diagnosis:
+        rule, diagnosis = self.rule_analyzer.evaluate(context)
+        reason = self.policy.escalation_reason(context, rule, diagnosis)
+        if reason is None:
+            self._decided["rule"] += 1
+            diagnosis.analysis_path = "rule_tier"
+            return diagnosis
+
+        self._decided["llm"] += 1
+        self._escalations[reason] += 1
+        logger.info(
+            "Escalating alert to LLM",
+            extra={
+                "alert_id": context.alert.id,
+                "reason": reason,
+                "rule": rule.name if rule is not None else None,
+            },
+        )
+        context.escalation_reason = reason
+        return await self.llm_analyzer.analyze(context)
+
+    def stats(self) -> dict:
+        return {
+            "decided_by": dict(self._decided),
+            "escalations": dict(self._escalations),
+        }
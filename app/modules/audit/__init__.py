@@ -1,3 +1,6 @@
+from .index import AuditIndex, AuditQueryPage
+from .reader import AuditLogReader, AuditPage
 from .service import AuditService
+from .writer import AuditWriter
 
-__all__ = ["AuditService"]
+__all__ = ["AuditIndex", "AuditLogReader", "AuditQueryPage", "AuditPage", "AuditService", "AuditWriter"]
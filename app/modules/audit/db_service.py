@@ -8,13 +8,28 @@ that Postgres is involved — it only calls IAuditModule.log_event().
 
 Coexists with the file-based AuditService (service.py). Both implement
 IAuditModule and can be swapped via dependency injection in main.py.
+
+BufferedPostgresAuditService is the batching mode used by main.py when
+AUDIT_BACKEND="database": bulk writes off the alert path, with a JSONL
+spool while the database is unreachable.
 """
+import asyncio
+import os
+from collections import deque
+from contextlib import suppress
+from typing import Callable, Deque, List, Optional, Tuple
+
+from sqlalchemy.exc import InterfaceError, OperationalError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.entities import AuditLog
 from app.core.interfaces import IAuditModule
+from app.core.logging import logger
 from app.infrastructure.database.repositories import AuditRepository
 
+# Errors meaning "the database is unreachable", as opposed to "it rejected this batch".
+_UNAVAILABLE = (OSError, asyncio.TimeoutError, OperationalError, InterfaceError)
+
 
 class PostgresAuditService(IAuditModule):
     """
@@ -30,3 +45,274 @@ class PostgresAuditService(IAuditModule):
     async def log_event(self, log: AuditLog) -> None:
         """Persist the audit event to the database via AuditRepository."""
         await self._repository.log_event(log)
+
+
+class BufferedPostgresAuditService(IAuditModule):
+    """
+    Batching IAuditModule: buffers events and bulk-writes them in the background.
+
+    ``log_event`` appends to a bounded in-memory buffer and returns. A flusher
+    task writes up to ``max_batch`` events per transaction, using COPY on
+    asyncpg and a multi-row INSERT elsewhere. It flushes every
+    ``flush_interval_seconds`` or as soon as ``max_batch`` events are waiting.
+    When the database falls behind and the buffer reaches ``max_buffer``,
+    ``log_event`` waits.
+
+    When a write fails, the batch is appended to the JSONL ``spool_path``
+    and the service goes degraded. While degraded, batches go straight to the
+    spool, so alerts do not wait on connection timeouts. Every
+    ``replay_interval_seconds`` the spool is replayed into the database; once
+    that succeeds, writes go to the database again. Replays skip ids that are
+    already stored, so a replay interrupted by a crash can simply run again.
+
+    The replay reads the spool one batch at a time in a worker thread and
+    holds the flush lock only while it writes a batch, so ``flush`` keeps
+    draining the buffer between batches. A batch the database rejects (as
+    opposed to being unreachable) is retried event by event. Events still
+    rejected, and spool lines that no longer parse, go to
+    ``<spool_path>.quarantine``, so one bad event cannot keep the service
+    degraded.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable,
+        spool_path: str,
+        max_batch: int = 1000,
+        flush_interval_seconds: float = 0.5,
+        max_buffer: int = 50_000,
+        replay_interval_seconds: float = 30.0,
+        use_copy: Optional[bool] = None,
+        on_committed: Optional[Callable[[List[AuditLog]], None]] = None,
+    ) -> None:
+        self._session_factory = session_factory
+        self.spool_path = spool_path
+        self.max_batch = max_batch
+        self.flush_interval_seconds = flush_interval_seconds
+        self.max_buffer = max_buffer
+        self.replay_interval_seconds = replay_interval_seconds
+        # None: COPY when the engine's driver is asyncpg (decided on first write).
+        self.use_copy = use_copy
+        # Called with each batch once it is stored or spooled (e.g. AuditIndex.add).
+        self.on_committed = on_committed
+        self._buffer: Deque[AuditLog] = deque()
+        self._wake = asyncio.Event()
+        self._space = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._flusher: Optional[asyncio.Task] = None
+        self._replayer: Optional[asyncio.Task] = None
+        self._closing = False
+        self.degraded = False
+        self.written = 0
+        self.spooled = 0
+        self.replayed = 0
+        self.quarantined = 0
+        # Bytes of the .replaying file already stored by this process.
+        self._replay_offset = 0
+        self.batches = 0
+        self.waits = 0
+
+    async def log_event(self, log: AuditLog) -> None:
+        while len(self._buffer) >= self.max_buffer:
+            self.waits += 1
+            self._space.clear()
+            self._wake.set()
+            await self._space.wait()
+        self._buffer.append(log)
+        if len(self._buffer) >= self.max_batch:
+            self._wake.set()
+
+    def start(self) -> None:
+        if self._flusher is None:
+            self._closing = False
+            self._flusher = asyncio.create_task(self._flush_loop())
+            self._replayer = asyncio.create_task(self._replay_loop())
+
+    async def close(self) -> None:
+        """Stop the background tasks and flush what is buffered (to the DB or the spool)."""
+        self._closing = True
+        self._wake.set()
+        if self._replayer is not None:
+            # An interrupted replay is safe: its file is picked up again next start.
+            self._replayer.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._replayer
+            self._replayer = None
+        if self._flusher is not None:
+            await self._flusher
+            self._flusher = None
+        await self.flush()
+
+    async def _flush_loop(self) -> None:
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.flush_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            await self.flush()
+
+    async def _replay_loop(self) -> None:
+        while True:
+            await self.replay()
+            await asyncio.sleep(self.replay_interval_seconds)
+
+    async def flush(self) -> None:
+        """Write every buffered event now, ``max_batch`` per transaction."""
+        async with self._flush_lock:
+            while self._buffer:
+                count = min(self.max_batch, len(self._buffer))
+                batch = [self._buffer.popleft() for _ in range(count)]
+                self._space.set()
+                if not self.degraded:
+                    try:
+                        await self._write(batch)
+                        self.written += len(batch)
+                        self.batches += 1
+                        self._notify(batch)
+                        continue
+                    except Exception as exc:
+                        self.degraded = True
+                        logger.warning(
+                            "Audit database unreachable — spooling to file",
+                            extra={"spool_path": self.spool_path, "error": str(exc)[:200]},
+                        )
+                await asyncio.to_thread(self._spool, batch)
+                self.spooled += len(batch)
+                self._notify(batch)
+
+    async def replay(self) -> None:
+        """Move spooled events into the database; leaves degraded mode on success."""
+        if not os.path.exists(self.spool_path) and not os.path.exists(self._replaying_path):
+            self.degraded = False
+            return
+        replayed = 0
+        try:
+            if not os.path.exists(self._replaying_path):
+                async with self._flush_lock:
+                    # New failures spool into a fresh file while this one is replayed.
+                    os.replace(self.spool_path, self._replaying_path)
+                self._replay_offset = 0
+            while True:
+                batch, unreadable, offset = await asyncio.to_thread(
+                    _read_batch, self._replaying_path, self._replay_offset, self.max_batch
+                )
+                if offset == self._replay_offset:
+                    break
+                if unreadable:
+                    await self._quarantine(unreadable, "unreadable spool lines")
+                if batch:
+                    async with self._flush_lock:
+                        rejected = await self._replay_batch(batch)
+                    replayed += len(batch) - rejected
+                self._replay_offset = offset
+            os.remove(self._replaying_path)
+            self._replay_offset = 0
+        except Exception as exc:
+            self.replayed += replayed
+            self.degraded = True
+            logger.warning("Audit spool replay failed", extra={"error": str(exc)[:200]})
+            return
+        self.replayed += replayed
+        self.degraded = os.path.exists(self.spool_path)
+        logger.info("Audit spool replayed", extra={"events": replayed})
+
+    async def _replay_batch(self, batch: List[AuditLog]) -> int:
+        """Store one spooled batch; returns how many events were quarantined instead."""
+        try:
+            await self._write(batch, skip_existing=True)
+            return 0
+        except _UNAVAILABLE:
+            raise
+        except Exception as exc:
+            logger.warning(
+                "Audit spool batch rejected — retrying event by event",
+                extra={"events": len(batch), "error": str(exc)[:200]},
+            )
+        rejected = []
+        for log in batch:
+            try:
+                await self._write([log], skip_existing=True)
+            except _UNAVAILABLE:
+                raise
+            except Exception:
+                rejected.append(log.model_dump_json())
+        if rejected:
+            await self._quarantine(rejected, "events rejected by the database")
+        return len(rejected)
+
+    async def _quarantine(self, lines: List[str], reason: str) -> None:
+        await asyncio.to_thread(self._append, self._quarantine_path, lines)
+        self.quarantined += len(lines)
+        logger.error(
+            "Audit events quarantined",
+            extra={"events": len(lines), "reason": reason, "path": self._quarantine_path},
+        )
+
+    @property
+    def _replaying_path(self) -> str:
+        return self.spool_path + ".replaying"
+
+    @property
+    def _quarantine_path(self) -> str:
+        return self.spool_path + ".quarantine"
+
+    async def _write(self, batch: List[AuditLog], skip_existing: bool = False) -> None:
+        async with self._session_factory() as session:
+            repository = AuditRepository(session)
+            if self.use_copy is None:
+                self.use_copy = session.get_bind().dialect.driver == "asyncpg"
+            if self.use_copy and not skip_existing:
+                await repository.copy_events(batch)
+            else:
+                await repository.log_events(batch, skip_existing=skip_existing)
+            await session.commit()
+
+    def _notify(self, batch: List[AuditLog]) -> None:
+        if self.on_committed is None:
+            return
+        try:
+            self.on_committed(batch)
+        except Exception as exc:
+            logger.error("Audit commit callback failed", extra={"error": str(exc)[:200]})
+
+    def _spool(self, batch: List[AuditLog]) -> None:
+        self._append(self.spool_path, [log.model_dump_json() for log in batch])
+
+    @staticmethod
+    def _append(path: str, lines: List[str]) -> None:
+        with open(path, "a", encoding="utf-8") as f:
+            f.write("".join(line + "\n" for line in lines))
+
+    def stats(self) -> dict:
+        return {
+            "queued": len(self._buffer),
+            "degraded": self.degraded,
+            "written": self.written,
+            "batches": self.batches,
+            "spooled": self.spooled,
+            "replayed": self.replayed,
+            "quarantined": self.quarantined,
+            "producer_waits": self.waits,
+        }
+
+
+def _read_batch(path: str, offset: int, size: int) -> Tuple[List[AuditLog], List[str], int]:
+    """Up to ``size`` events from ``offset``: (events, unparsable lines, offset after them)."""
+    events: List[AuditLog] = []
+    unreadable: List[str] = []
+    with open(path, "rb") as f:
+        f.seek(offset)
+        while len(events) < size:
+            raw = f.readline()
+            if not raw:
+                break
+            offset += len(raw)
+            line = raw.decode("utf-8", "replace").strip()
+            if not line:
+                continue
+            try:
+                events.append(AuditLog.model_validate_json(line))
+            except ValueError:
+                unreadable.append(line)
+    return events, unreadable, offset
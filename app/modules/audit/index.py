@@ -0,0 +1,399 @@
+"""
+AuditIndex: local SQLite index behind the GET /audit/query API.
+
+Every audit event is stored once more in one SQLite table: the filterable
+fields (alert source, severity and message, result, component, event,
+timestamp) as columns, and the JSON line as-is. Each filter column has a
+composite index with the timestamp, so a filtered, time-bounded page is one
+index range scan, newest first, however many months of events are stored.
+
+The index is fed as events are written. The audit services call ``add``
+with every batch they commit; ``add`` only queues the batch, and a
+background task inserts the queue in one transaction per ``max_batch``
+through a worker thread. When ``catch_up_path`` is set (the JSONL audit
+file), events in that file and its rotated segments that the index has not
+seen are imported when the task starts. Progress is recorded per file, so
+only new data is read.
+
+The queue holds at most ``max_pending`` events. A batch that fails to
+insert goes back to the front of the queue and is retried on the next
+flush. Once the queue is full, the oldest events are dropped and counted.
+With ``catch_up_path`` set, the index then forgets its progress for the
+files written since the oldest dropped event and imports them again, so
+nothing stays missing. Without a catch-up file (the database backend),
+dropped events stay missing from the index; ``stats()["dropped"]`` counts
+them.
+
+Inserts are idempotent (``INSERT OR IGNORE`` on the event id), so the
+catch-up and the live feed may overlap. Pages are keyset-paginated on
+(timestamp, sequence): ``next_cursor`` continues strictly after the last
+row returned, even while new events arrive.
+"""
+import asyncio
+import glob
+import gzip
+import json
+import os
+import re
+import sqlite3
+import threading
+from collections import deque
+from datetime import datetime, timezone
+from typing import Deque, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from ...core.entities import AuditLog
+from ...core.logging import logger
+
+# Filterable columns, most selective first; each gets a (column, ts) index.
+FILTER_COLUMNS = ("source", "severity", "result", "component", "event")
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS events (
+        seq INTEGER PRIMARY KEY,
+        id TEXT NOT NULL UNIQUE,
+        ts TEXT NOT NULL,
+        component TEXT,
+        event TEXT,
+        source TEXT,
+        severity TEXT,
+        result TEXT,
+        message TEXT,
+        body TEXT NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_events_ts ON events (ts)",
+    *(f"CREATE INDEX IF NOT EXISTS ix_events_{column}_ts ON events ({column}, ts)" for column in FILTER_COLUMNS),
+    # Catch-up progress: bytes of each audit file already imported (-1: segment done).
+    "CREATE TABLE IF NOT EXISTS sources (name TEXT PRIMARY KEY, inode INTEGER, offset INTEGER NOT NULL)",
+)
+
+# AuditWriter's rotated segments: <file_path>.<UTC stamp>[.gz]
+_SEGMENT_SUFFIX = re.compile(r"\d{8}T\d{12}Z(\.gz)?")
+_SEGMENT_STAMP = "%Y%m%dT%H%M%S%fZ"
+
+_Row = Tuple[str, str, Optional[str], Optional[str], Optional[str], Optional[str], Optional[str], Optional[str], str]
+
+
+class AuditQueryPage(NamedTuple):
+    entries: List[dict]  # Newest first.
+    next_cursor: Optional[str]  # None on the last page.
+
+
+def _utc(moment: datetime) -> datetime:
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(timezone.utc)
+
+
+def _ts(moment: datetime) -> str:
+    """Fixed-width UTC text, so string order is time order."""
+    return _utc(moment).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+def _row(event_id: str, moment: datetime, component, event, details, body: str) -> _Row:
+    details = details if isinstance(details, dict) else {}
+    alert = details.get("alert") if isinstance(details.get("alert"), dict) else {}
+    result = details.get("result")
+    return (
+        event_id, _ts(moment), component, event,
+        alert.get("source"), alert.get("severity"), None if result is None else str(result),
+        alert.get("message"), body,
+    )
+
+
+def _row_from_log(log: AuditLog) -> _Row:
+    return _row(log.id, log.timestamp, log.component, log.event, log.details, log.model_dump_json())
+
+
+def _row_from_line(line: str) -> Optional[_Row]:
+    try:
+        entry = json.loads(line)
+        return _row(
+            entry["id"], datetime.fromisoformat(entry["timestamp"]), entry.get("component"),
+            entry.get("event"), entry.get("details"), line,
+        )
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+class AuditIndex:
+    """SQLite index of audit events with filtered, cursor-paginated queries."""
+
+    def __init__(
+        self,
+        db_path: str,
+        max_batch: int = 5000,
+        flush_interval_seconds: float = 0.5,
+        catch_up_path: Optional[str] = None,
+        max_pending: int = 100_000,
+    ) -> None:
+        self.db_path = db_path
+        self.max_batch = max_batch
+        self.max_pending = max_pending
+        self.flush_interval_seconds = flush_interval_seconds
+        self.catch_up_path = catch_up_path
+        # One connection and lock each for inserts and queries, which run in worker threads.
+        self._writer: Optional[sqlite3.Connection] = None
+        self._reader: Optional[sqlite3.Connection] = None
+        self._write_lock = threading.Lock()
+        self._read_lock = threading.Lock()
+        self._pending: Deque[AuditLog] = deque()
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+        # Timestamp of the oldest dropped event not yet re-imported from the files.
+        self._resync_from: Optional[datetime] = None
+        self.indexed = 0
+        self.imported = 0
+        self.dropped = 0
+        self.errors = 0
+
+    def open(self) -> None:
+        """Create or open the database (done by ``start`` and the first insert or query)."""
+        with self._write_lock:
+            if self._writer is not None:
+                return
+            writer = self._connect()
+            for statement in _SCHEMA:
+                writer.execute(statement)
+            writer.commit()
+            self._reader = self._connect()
+            self._writer = writer
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    # -- feeding -------------------------------------------------------------
+
+    def add(self, batch: Sequence[AuditLog]) -> None:
+        """Queue a written batch for indexing (the audit services' ``on_committed`` hook)."""
+        self._pending.extend(batch)
+        self._trim()
+        if len(self._pending) >= self.max_batch:
+            self._wake.set()
+
+    def _trim(self) -> None:
+        while len(self._pending) > self.max_pending:
+            moment = _utc(self._pending.popleft().timestamp)
+            self.dropped += 1
+            if self._resync_from is None or moment < self._resync_from:
+                self._resync_from = moment
+
+    def start(self) -> None:
+        self.open()
+        if self._task is None:
+            self._closing = False
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        """Index everything queued, then close the database."""
+        if self._task is not None:
+            self._closing = True
+            self._wake.set()
+            await self._task
+            self._task = None
+        await self._flush_and_resync()
+        if self._writer is not None:
+            self._writer.close()
+            self._reader.close()
+            self._writer = self._reader = None
+
+    async def flush(self) -> bool:
+        """Index the queue; False if an insert failed (the batch is queued again)."""
+        while self._pending:
+            count = min(self.max_batch, len(self._pending))
+            batch = [self._pending.popleft() for _ in range(count)]
+            try:
+                self.indexed += await asyncio.to_thread(self.insert, map(_row_from_log, batch))
+            except Exception as exc:
+                self.errors += 1
+                logger.error("Audit index insert failed", extra={"events": count, "error": str(exc)[:200]})
+                self._pending.extendleft(reversed(batch))
+                self._trim()
+                return False
+        return True
+
+    async def _run(self) -> None:
+        if self.catch_up_path:
+            try:
+                self.imported += await asyncio.to_thread(self.catch_up, self.catch_up_path)
+            except Exception as exc:
+                self.errors += 1
+                logger.error("Audit index catch-up failed", extra={"error": str(exc)[:200]})
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.flush_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            await self._flush_and_resync()
+
+    async def _flush_and_resync(self) -> None:
+        if await self.flush() and self._resync_from is not None and self.catch_up_path:
+            await self._resync()
+
+    async def _resync(self) -> None:
+        """Re-import the files written since the oldest dropped event."""
+        since = self._resync_from
+        try:
+            await asyncio.to_thread(self._forget_progress, since)
+            self.imported += await asyncio.to_thread(self.catch_up, self.catch_up_path)
+        except Exception as exc:
+            self.errors += 1
+            logger.error("Audit index resync failed", extra={"error": str(exc)[:200]})
+            return
+        if self._resync_from == since:
+            self._resync_from = None
+
+    def _forget_progress(self, since: datetime) -> None:
+        """Mark the active file and segments rotated at or after ``since`` as not imported."""
+        stamp = since.strftime(_SEGMENT_STAMP)
+        self.open()
+        with self._write_lock:
+            names = [row[0] for row in self._writer.execute("SELECT name FROM sources")]
+            for name in names:
+                if name == "active" or name.rpartition(".")[2] >= stamp:
+                    self._writer.execute("DELETE FROM sources WHERE name = ?", (name,))
+            self._writer.commit()
+
+    def insert(self, rows: Iterable[_Row]) -> int:
+        """Store rows, skipping event ids already indexed; returns how many were new."""
+        self.open()
+        with self._write_lock:
+            before = self._writer.total_changes
+            self._writer.executemany(
+                "INSERT OR IGNORE INTO events "
+                "(id, ts, component, event, source, severity, result, message, body) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._writer.commit()
+            return self._writer.total_changes - before
+
+    # -- catch-up from the JSONL files ---------------------------------------
+
+    def catch_up(self, file_path: str) -> int:
+        """Import rotated segments and the active file past what was imported before."""
+        imported = 0
+        for segment in sorted(glob.glob(glob.escape(file_path) + ".*")):
+            if not _SEGMENT_SUFFIX.fullmatch(segment[len(file_path) + 1:]):
+                continue  # Sidecar index, temp files.
+            name = os.path.basename(segment).removesuffix(".gz")
+            if self._progress(name) == (None, -1):
+                continue
+            opener = gzip.open if segment.endswith(".gz") else open
+            with opener(segment, "rt", encoding="utf-8") as f:
+                imported += self._import_lines(f)
+            self._set_progress(name, None, -1)
+        try:
+            stat = os.stat(file_path)
+        except FileNotFoundError:
+            return imported
+        inode, offset = self._progress("active")
+        if inode != stat.st_ino or offset is None or offset > stat.st_size:
+            offset = 0
+        with open(file_path, "rb") as f:
+            f.seek(offset)
+            for lines, offset in _complete_lines(f, offset, self.max_batch):
+                imported += self._import_lines(lines)
+                self._set_progress("active", stat.st_ino, offset)
+        return imported
+
+    def _import_lines(self, lines: Iterable[str]) -> int:
+        imported, rows = 0, []
+        for line in lines:
+            row = _row_from_line(line.strip()) if line.strip() else None
+            if row is not None:
+                rows.append(row)
+            if len(rows) >= self.max_batch:
+                imported += self.insert(rows)
+                rows = []
+        return imported + (self.insert(rows) if rows else 0)
+
+    def _progress(self, name: str) -> Tuple[Optional[int], Optional[int]]:
+        self.open()
+        with self._write_lock:
+            found = self._writer.execute("SELECT inode, offset FROM sources WHERE name = ?", (name,)).fetchone()
+        return (found[0], found[1]) if found else (None, None)
+
+    def _set_progress(self, name: str, inode: Optional[int], offset: int) -> None:
+        with self._write_lock:
+            self._writer.execute(
+                "INSERT OR REPLACE INTO sources (name, inode, offset) VALUES (?, ?, ?)", (name, inode, offset)
+            )
+            self._writer.commit()
+
+    # -- queries -------------------------------------------------------------
+
+    def query(
+        self,
+        source: Optional[str] = None,
+        severity: Optional[str] = None,
+        result: Optional[str] = None,
+        component: Optional[str] = None,
+        event: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+    ) -> AuditQueryPage:
+        """Newest-first events matching every given filter; ``since`` inclusive, ``until`` exclusive."""
+        conditions, params, index = [], [], None
+        for column, value in zip(FILTER_COLUMNS, (source, severity, result, component, event)):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+                # FILTER_COLUMNS runs from most to least selective; without ANALYZE
+                # statistics SQLite may pick e.g. the 4-valued severity index instead.
+                index = index or f"ix_events_{column}_ts"
+        if since is not None:
+            conditions.append("ts >= ?")
+            params.append(_ts(since))
+        if until is not None:
+            conditions.append("ts < ?")
+            params.append(_ts(until))
+        if cursor:
+            ts, _, seq = cursor.rpartition("|")
+            conditions.append("(ts < ? OR (ts = ? AND seq < ?))")
+            params += [ts, ts, int(seq)]
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        self.open()
+        with self._read_lock:
+            rows = self._reader.execute(
+                f"SELECT seq, ts, body FROM events INDEXED BY {index or 'ix_events_ts'} {where} "
+                "ORDER BY ts DESC, seq DESC LIMIT ?",
+                (*params, limit + 1),
+            ).fetchall()
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = f"{rows[-1][1]}|{rows[-1][0]}"
+        return AuditQueryPage([json.loads(body) for _, _, body in rows], next_cursor)
+
+    def stats(self) -> dict:
+        return {
+            "pending": len(self._pending),
+            "indexed": self.indexed,
+            "imported": self.imported,
+            "dropped": self.dropped,
+            "errors": self.errors,
+        }
+
+
+def _complete_lines(f, offset: int, size: int) -> Iterator[Tuple[List[str], int]]:
+    """Chunks of up to ``size`` complete lines and the offset after each chunk; stops at a partial line."""
+    lines: List[str] = []
+    for raw in f:
+        if not raw.endswith(b"\n"):
+            break
+        lines.append(raw.decode("utf-8", "replace"))
+        offset += len(raw)
+        if len(lines) >= size:
+            yield lines, offset
+            lines = []
+    if lines:
+        yield lines, offset
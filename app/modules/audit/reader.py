@@ -0,0 +1,185 @@
+"""
+AuditLogReader: paged reads of the JSONL audit log without loading it.
+
+The /audit dashboard used to ``readlines()`` the whole file to show its last
+50 lines. Here a page is read backwards from an end offset in ``block_size``
+blocks until it holds ``limit`` complete lines. The cost depends on the page
+size, not the file size. Each page returns the byte offset of its oldest
+line, and passing that offset back as ``before`` yields the next older page.
+
+Time jumps (``before`` given as a timestamp) go through a sparse sidecar
+index at ``<file_path>.idx``. It records the byte offset and timestamp of
+every ``index_every``-th line. A lookup bisects the checkpoints and then
+scans at most ``index_every`` lines. The index is brought up to date
+incrementally on each lookup: scanning resumes from the last checkpoint, so
+only newly appended lines are read. A rotated or truncated file, detected
+through its inode and size, starts a fresh index.
+
+All methods are blocking; call them through ``asyncio.to_thread``. Only the
+active file is paged. AuditWriter's rotated segments are gzip-compressed
+and not seekable.
+"""
+import bisect
+import json
+import os
+import threading
+from datetime import datetime, timezone
+from typing import List, NamedTuple, Optional, Tuple
+
+from ...core.logging import logger
+
+
+class AuditPage(NamedTuple):
+    entries: List[dict]  # Newest first.
+    older: Optional[int]  # ``before`` cursor for the next older page; None at the start of the file.
+
+
+def _timestamp(line: bytes) -> Optional[datetime]:
+    try:
+        moment = datetime.fromisoformat(json.loads(line)["timestamp"])
+    except (ValueError, KeyError, TypeError):
+        return None
+    return moment if moment.tzinfo else moment.replace(tzinfo=timezone.utc)
+
+
+class AuditLogReader:
+    """Reads pages of the audit log from its end, by offset cursor or by time."""
+
+    def __init__(self, file_path: str, index_every: int = 1000, block_size: int = 64 * 1024) -> None:
+        self.file_path = file_path
+        self.index_path = file_path + ".idx"
+        self.index_every = index_every
+        self.block_size = block_size
+        self._lock = threading.Lock()
+        self._inode: Optional[int] = None
+        # Sparse checkpoints, ordered by offset: (offset, timestamp), one per index_every lines.
+        self._offsets: List[int] = []
+        self._times: List[datetime] = []
+        self._scanned_offset = 0
+        self._scanned_lines = 0
+
+    def page(self, limit: int = 50, before: Optional[str] = None) -> AuditPage:
+        """Last ``limit`` entries before ``before``: a cursor offset, an ISO timestamp, or None (EOF)."""
+        end: Optional[int] = None
+        if before:
+            end = int(before) if before.isdigit() else self.offset_at(datetime.fromisoformat(before))
+        lines, start = self.tail(limit, end)
+        entries = []
+        for line in reversed(lines):
+            if not line.strip():
+                continue
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError:
+                entries.append({"raw": line.decode("utf-8", "replace")})
+        return AuditPage(entries, start if start > 0 else None)
+
+    def tail(self, limit: int, end: Optional[int] = None) -> Tuple[List[bytes], int]:
+        """The last ``limit`` complete lines ending at or before ``end``, and the offset of the first."""
+        try:
+            f = open(self.file_path, "rb")
+        except FileNotFoundError:
+            return [], 0
+        with f:
+            size = os.fstat(f.fileno()).st_size
+            end = size if end is None else min(end, size)
+            position, buffer = end, b""
+            # One newline more than needed marks where the oldest wanted line starts.
+            while position > 0 and buffer.count(b"\n") <= limit:
+                step = min(self.block_size, position)
+                position -= step
+                f.seek(position)
+                buffer = f.read(step) + buffer
+        # Drop a trailing line still being written, and a leading partial line.
+        buffer = buffer[: buffer.rfind(b"\n") + 1]
+        lines = buffer.split(b"\n")[:-1]
+        if position > 0 and lines:
+            lines = lines[1:]
+        lines = lines[-limit:] if limit > 0 else []
+        start = position + len(buffer) - sum(len(line) + 1 for line in lines)
+        return lines, start
+
+    def offset_at(self, moment: datetime) -> int:
+        """Offset of the first line stamped at or after ``moment`` (end of the indexed file if none)."""
+        if moment.tzinfo is None:
+            moment = moment.replace(tzinfo=timezone.utc)
+        with self._lock:
+            self.refresh()
+            index = bisect.bisect_left(self._times, moment)
+            if index == 0:
+                return 0
+            start = self._offsets[index - 1]
+            stop = self._offsets[index] if index < len(self._offsets) else self._scanned_offset
+        with open(self.file_path, "rb") as f:
+            f.seek(start)
+            offset = start
+            while offset < stop:
+                line = f.readline()
+                stamp = _timestamp(line)
+                if stamp is not None and stamp >= moment:
+                    return offset
+                offset += len(line)
+        return stop
+
+    def refresh(self) -> None:
+        """Extend the sidecar index over lines appended since the last refresh."""
+        try:
+            stat = os.stat(self.file_path)
+        except FileNotFoundError:
+            return
+        if self._inode is None:
+            self._load(stat.st_ino)
+        if stat.st_ino != self._inode or stat.st_size < self._scanned_offset:
+            self._reset(stat.st_ino)
+        if stat.st_size == self._scanned_offset:
+            return
+        added = []
+        last = (self._offsets[-1], self._times[-1]) if self._offsets else None
+        with open(self.file_path, "rb") as f:
+            f.seek(self._scanned_offset)
+            offset, count = self._scanned_offset, self._scanned_lines
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # Still being written.
+                if count % self.index_every == 0:
+                    stamp = _timestamp(line)
+                    # Checkpoints stay ordered by offset and time, so they can be bisected.
+                    if stamp is not None and (last is None or (offset > last[0] and stamp >= last[1])):
+                        added.append((count, offset, stamp))
+                        last = (offset, stamp)
+                offset += len(line)
+                count += 1
+        self._scanned_offset, self._scanned_lines = offset, count
+        if added:
+            with open(self.index_path, "a") as f:
+                f.write("".join(f"{count} {offset} {stamp.isoformat()}\n" for count, offset, stamp in added))
+            for _, offset, stamp in added:
+                self._offsets.append(offset)
+                self._times.append(stamp)
+
+    def _load(self, inode: int) -> None:
+        """Resume from the sidecar written by an earlier process, if it is for this file."""
+        self._reset(inode, truncate=False)
+        try:
+            with open(self.index_path) as f:
+                if f.readline().split() != ["#", str(inode)]:
+                    raise ValueError("index belongs to another file")
+                for line in f:
+                    count, offset, stamp = line.split()
+                    self._offsets.append(int(offset))
+                    self._times.append(datetime.fromisoformat(stamp))
+                    # Scanning resumes at the last checkpoint: at most index_every lines again.
+                    self._scanned_lines, self._scanned_offset = int(count), int(offset)
+        except FileNotFoundError:
+            self._reset(inode)
+        except ValueError as exc:
+            logger.warning("Rebuilding audit index", extra={"path": self.index_path, "error": str(exc)[:200]})
+            self._reset(inode)
+
+    def _reset(self, inode: int, truncate: bool = True) -> None:
+        self._inode = inode
+        self._offsets, self._times = [], []
+        self._scanned_offset = self._scanned_lines = 0
+        if truncate:
+            with open(self.index_path, "w") as f:
+                f.write(f"# {inode}\n")
@@ -0,0 +1,239 @@
+"""
+AuditWriter: group-commit JSONL audit log with rotation and compression.
+
+AuditService opened, appended to and closed ``audit.log`` through aiofiles for
+every event: a thread-pool hop plus an open/close pair per alert. Here
+``log_event`` only puts the event on a bounded in-memory queue. One
+long-lived task drains whatever has accumulated (up to ``max_batch``),
+serializes it and appends it to a file that stays open, with one thread hop
+per group commit. Under load, batches grow by themselves while the previous
+write is in progress. When the system is idle, each event is written
+immediately.
+
+Durability is set by ``fsync``:
+
+    "none"      flush to the OS after each commit; the OS decides when to sync;
+    "batch"     fsync after every group commit;
+    "interval"  fsync at most every ``fsync_interval_seconds`` (and on close).
+
+The active file keeps its name (``file_path``). Once it reaches
+``rotate_bytes`` or ``rotate_seconds`` of age, it is renamed to
+``<file_path>.<UTC timestamp>`` and a fresh file is opened. Closed segments
+are gzip-compressed in the background (``.gz``, original removed).
+Segments that a crash left uncompressed are picked up on start.
+
+A full queue makes ``log_event`` wait, so audit events are never dropped to
+save memory.
+"""
+import asyncio
+import glob
+import gzip
+import os
+import shutil
+import time
+from datetime import datetime, timezone
+from typing import Callable, List, Optional, Set
+
+from ...core.entities import AuditLog
+from ...core.interfaces import IAuditModule
+from ...core.logging import logger
+from ...core.metrics import registry
+
+FSYNC_POLICIES = ("none", "batch", "interval")
+
+COMMIT_SIZE = registry.histogram(
+    "sentinel_audit_commit_events",
+    "Audit events written per group commit.",
+    buckets=(1, 2, 5, 10, 25, 50, 100, 250, 500, 1000),
+)
+COMMIT_SECONDS = registry.histogram(
+    "sentinel_audit_commit_seconds", "Time to write (and fsync) one audit group commit."
+)
+
+
+class AuditWriter(IAuditModule):
+    """IAuditModule appending JSONL through a single background group-commit task."""
+
+    def __init__(
+        self,
+        file_path: str,
+        max_batch: int = 1000,
+        queue_maxsize: int = 10_000,
+        fsync: str = "interval",
+        fsync_interval_seconds: float = 1.0,
+        rotate_bytes: int = 64 * 1024 * 1024,
+        rotate_seconds: float = 0.0,
+        compress: bool = True,
+        on_committed: Optional[Callable[[List[AuditLog]], None]] = None,
+    ) -> None:
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"fsync must be one of {FSYNC_POLICIES}, got {fsync!r}")
+        self.file_path = file_path
+        self.max_batch = max_batch
+        self.fsync = fsync
+        self.fsync_interval_seconds = fsync_interval_seconds
+        self.rotate_bytes = rotate_bytes
+        self.rotate_seconds = rotate_seconds
+        self.compress = compress
+        # Called with each batch once it is in the file (e.g. AuditIndex.add).
+        self.on_committed = on_committed
+        self._queue: "asyncio.Queue[Optional[AuditLog]]" = asyncio.Queue(maxsize=queue_maxsize)
+        self._task: Optional[asyncio.Task] = None
+        self._compressions: Set[asyncio.Task] = set()
+        self._file = None
+        self._size = 0
+        self._opened_at = 0.0
+        self._last_fsync = 0.0
+        self.events = 0
+        self.commits = 0
+        self.bytes = 0
+        self.fsyncs = 0
+        self.rotations = 0
+        self.errors = 0
+
+    async def log_event(self, log: AuditLog) -> None:
+        if self._task is None:
+            self.start()
+        await self._queue.put(log)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            if self.compress:
+                for segment in self._rotated_segments():
+                    self._compress_later(segment)
+
+    async def close(self) -> None:
+        """Write everything queued, sync, close the file and finish compressions."""
+        if self._task is not None:
+            await self._queue.put(None)
+            await self._task
+            self._task = None
+        if self._file is not None:
+            await asyncio.to_thread(self._close_file)
+        if self._compressions:
+            await asyncio.gather(*self._compressions, return_exceptions=True)
+
+    async def _run(self) -> None:
+        closing = False
+        while not closing:
+            batch: List[AuditLog] = []
+            item = await self._queue.get()
+            while True:
+                if item is None:
+                    closing = True
+                    break
+                batch.append(item)
+                if len(batch) >= self.max_batch or self._queue.empty():
+                    break
+                item = self._queue.get_nowait()
+            if batch:
+                await self._commit(batch)
+
+    async def _commit(self, batch: List[AuditLog]) -> None:
+        started = time.perf_counter()
+        payload = "".join(log.model_dump_json() + "\n" for log in batch).encode("utf-8")
+        try:
+            rotated = await asyncio.to_thread(self._write, payload)
+        except Exception as exc:
+            # As AuditService: report through the system logger and keep going.
+            self.errors += 1
+            logger.error(
+                f"Failed to write audit log: {exc}",
+                extra={"events": len(batch), "first_audit_id": batch[0].id},
+            )
+            return
+        self.events += len(batch)
+        self.commits += 1
+        self.bytes += len(payload)
+        COMMIT_SIZE.observe(len(batch))
+        COMMIT_SECONDS.observe(time.perf_counter() - started)
+        if rotated is not None and self.compress:
+            self._compress_later(rotated)
+        if self.on_committed is not None:
+            try:
+                self.on_committed(batch)
+            except Exception as exc:
+                logger.error("Audit commit callback failed", extra={"error": str(exc)[:200]})
+
+    # -- file handling (runs in a worker thread) ----------------------------
+
+    def _write(self, payload: bytes) -> Optional[str]:
+        """Append one group commit; returns the path of a segment it rotated out, if any."""
+        if self._file is None:
+            self._open()
+        self._file.write(payload)
+        self._file.flush()
+        self._size += len(payload)
+        now = time.monotonic()
+        if self.fsync == "batch" or (
+            self.fsync == "interval" and now - self._last_fsync >= self.fsync_interval_seconds
+        ):
+            os.fsync(self._file.fileno())
+            self._last_fsync = now
+            self.fsyncs += 1
+        if (self.rotate_bytes and self._size >= self.rotate_bytes) or (
+            self.rotate_seconds and now - self._opened_at >= self.rotate_seconds
+        ):
+            return self._rotate()
+        return None
+
+    def _open(self) -> None:
+        self._file = open(self.file_path, "ab")
+        self._size = self._file.tell()
+        self._opened_at = time.monotonic()
+
+    def _close_file(self) -> None:
+        if self.fsync != "none":
+            os.fsync(self._file.fileno())
+            self.fsyncs += 1
+        self._file.close()
+        self._file = None
+
+    def _rotate(self) -> str:
+        self._close_file()
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+        segment = f"{self.file_path}.{stamp}"
+        os.replace(self.file_path, segment)
+        self.rotations += 1
+        self._open()
+        return segment
+
+    def _rotated_segments(self) -> List[str]:
+        return sorted(
+            path
+            for path in glob.glob(glob.escape(self.file_path) + ".*")
+            if not path.endswith((".gz", ".tmp", ".idx"))
+        )
+
+    # -- compression -------------------------------------------------------
+
+    def _compress_later(self, segment: str) -> None:
+        task = asyncio.ensure_future(asyncio.to_thread(_gzip_file, segment))
+        self._compressions.add(task)
+        task.add_done_callback(self._on_compressed)
+
+    def _on_compressed(self, task: asyncio.Task) -> None:
+        self._compressions.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Audit segment compression failed", extra={"error": str(task.exception())[:200]})
+
+    def stats(self) -> dict:
+        return {
+            "queued": self._queue.qsize(),
+            "events": self.events,
+            "commits": self.commits,
+            "avg_events_per_commit": round(self.events / self.commits, 2) if self.commits else 0.0,
+            "bytes": self.bytes,
+            "fsyncs": self.fsyncs,
+            "rotations": self.rotations,
+            "compressing": len(self._compressions),
+            "errors": self.errors,
+        }
+
+
+def _gzip_file(path: str) -> None:
+    with open(path, "rb") as source, gzip.open(path + ".gz.tmp", "wb") as target:
+        shutil.copyfileobj(source, target)
+    os.replace(path + ".gz.tmp", path + ".gz")
+    os.remove(path)
@@ -1,3 +1,5 @@
 from .builder import ContextBuilderService
+from .cache import HistoryCache
+from .history_store import IncidentHistoryStore
 
-__all__ = ["ContextBuilderService"]
+__all__ = ["ContextBuilderService", "HistoryCache", "IncidentHistoryStore"]
@@ -4,12 +4,22 @@ before passing it to the analysis module.
 
 Gracefully degrades: if the database is unavailable, returns minimal EnrichedContext
 with empty history so the rest of the pipeline is unaffected.
+
+With a HistoryCache, history is read through it per source and per
+severity, so a storm from one source costs one load of each per TTL instead
+of two queries per alert. With a warmed IncidentHistoryStore, history comes from memory and
+the database is only touched for the sampled consistency checks
+(``verify_rate``).
 """
-from typing import Callable, Optional
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Callable, List, Optional
 
-from app.core.entities import Alert, EnrichedContext
+from app.core.entities import Alert, AlertSeverity, EnrichedContext, Incident
 from app.core.logging import logger
 from app.infrastructure.database.repositories import IncidentRepository, PlanRepository
+from app.modules.context.cache import History, HistoryCache, SourceHistory, merge_recent
+from app.modules.context.history_store import IncidentHistoryStore
 
 
 class ContextBuilderService:
@@ -21,38 +31,95 @@ class ContextBuilderService:
     it returns a minimal context containing only the alert.
     """
 
-    def __init__(self, session_factory: Optional[Callable] = None) -> None:
+    def __init__(
+        self,
+        session_factory: Optional[Callable] = None,
+        history_cache: Optional[HistoryCache] = None,
+        history_store: Optional[IncidentHistoryStore] = None,
+        verify_rate: float = 0.0,
+        plan_lookback_days: float = 0.0,
+    ) -> None:
         self._session_factory = session_factory
+        self.history_cache = history_cache
+        self.history_store = history_store
+        self.verify_rate = verify_rate
+        # Past remediations only from incidents this recent (0 = all of them).
+        self.plan_lookback_days = plan_lookback_days
 
     async def build(self, alert: Alert) -> EnrichedContext:
         """Build an EnrichedContext for the given alert.
 
         Returns EnrichedContext with empty history if the DB is unavailable.
         """
+        store = self.history_store
+        if store is not None and store.warm:
+            if self.verify_rate > 0 and self._session_factory is not None and random.random() < self.verify_rate:
+                try:
+                    await store.verify(self._session_factory, alert.source, alert.severity)
+                except Exception as exc:
+                    logger.warning("History consistency check failed", extra={"error": str(exc)[:200]})
+            return EnrichedContext(
+                alert=alert,
+                recent_similar_incidents=store.get_recent_similar(alert.source, alert.severity),
+                past_remediations_for_source=store.get_past_executed_for_source(alert.source),
+            )
+
         if self._session_factory is None:
             return EnrichedContext(alert=alert)
 
         try:
-            async with self._session_factory() as session:
-                incident_repo = IncidentRepository(session)
-                plan_repo = PlanRepository(session)
-
-                recent = await incident_repo.get_recent_similar(
-                    source=alert.source,
-                    severity=alert.severity,
+            cache = self.history_cache
+            if cache is None:
+                recent, past = await self._load_history(alert)
+            else:
+                by_source, past = await cache.source_history(
+                    alert.source, lambda: self._load_source_history(alert.source)
                 )
-                past = await plan_repo.get_past_executed_for_source(
-                    source=alert.source,
-                )
-
-                return EnrichedContext(
-                    alert=alert,
-                    recent_similar_incidents=recent,
-                    past_remediations_for_source=past,
+                by_severity = await cache.severity_history(
+                    alert.severity, lambda: self._load_severity_history(alert.severity)
                 )
+                recent = merge_recent(by_source, by_severity)
+            return EnrichedContext(
+                alert=alert,
+                recent_similar_incidents=list(recent),
+                past_remediations_for_source=list(past),
+            )
         except Exception as exc:
             logger.warning(
                 "ContextBuilder could not reach DB — using minimal context",
                 extra={"error": str(exc)[:200]},
             )
             return EnrichedContext(alert=alert)
+
+    async def _load_history(self, alert: Alert) -> History:
+        async with self._session_factory() as session:
+            incident_repo = IncidentRepository(session)
+            plan_repo = PlanRepository(session)
+
+            recent = await incident_repo.get_recent_similar(
+                source=alert.source,
+                severity=alert.severity,
+            )
+            past = await plan_repo.get_past_executed_for_source(
+                source=alert.source,
+                since=self._plan_since(),
+            )
+            return recent, past
+
+    async def _load_source_history(self, source: str) -> SourceHistory:
+        async with self._session_factory() as session:
+            recent = await IncidentRepository(session).get_recent(source=source)
+            past = await PlanRepository(session).get_past_executed_for_source(
+                source=source,
+                since=self._plan_since(),
+            )
+            return recent, past
+
+    async def _load_severity_history(self, severity: AlertSeverity) -> List[Incident]:
+        async with self._session_factory() as session:
+            return await IncidentRepository(session).get_recent(severity=severity)
+
+    def _plan_since(self) -> Optional[datetime]:
+        if self.plan_lookback_days > 0:
+            return datetime.now(timezone.utc) - timedelta(days=self.plan_lookback_days)
+        return None
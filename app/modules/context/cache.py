@@ -0,0 +1,144 @@
+"""
+HistoryCache: read-through cache of alert history, per source and per severity.
+
+ContextBuilderService used to run two history queries for every alert, even
+though under an alert storm from one source the answers barely change.
+``get_recent_similar`` matches source OR severity, so its result is the
+newest ``limit`` of two independent halves: the source's recent incidents
+and the severity's recent incidents. Each half is cached under its own key:
+
+    source key    the source's recent incidents and past remediations;
+    severity key  the severity's recent incidents;
+
+and ``merge_recent`` combines them exactly as the UNION query does. Each
+key is loaded once, kept for ``ttl_seconds`` and shared by every alert
+that needs it; concurrent misses for the same key wait on a single load.
+
+Writers call ``invalidate_incident`` / ``invalidate_source`` after persisting
+incidents or plans. A new incident drops exactly two keys, its source's and
+its severity's; a plan drops its source's. Nothing else is touched. A load
+for a key that was invalidated while it ran is returned to its waiters but
+not stored, so stale history never outlives the write. Loads of other keys
+are unaffected.
+
+Cached entities are shared between contexts and must be treated as read-only.
+"""
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Tuple
+
+from app.core.entities import AlertSeverity, Incident, RemediationPlan
+
+History = Tuple[List[Incident], List[RemediationPlan]]
+# A source's recent incidents and its past executed remediations.
+SourceHistory = Tuple[List[Incident], List[RemediationPlan]]
+
+
+def merge_recent(*halves: List[Incident], limit: int = 10) -> List[Incident]:
+    """Newest ``limit`` incidents of several newest-first lists, each incident once."""
+    seen = set()
+    merged = []
+    for incident in sorted((i for half in halves for i in half), key=lambda i: i.created_at, reverse=True):
+        if incident.id not in seen:
+            seen.add(incident.id)
+            merged.append(incident)
+            if len(merged) >= limit:
+                break
+    return merged
+
+
+class HistoryCache:
+    """TTL + LRU bounded, single-flight cache of per-source and per-severity history."""
+
+    def __init__(
+        self,
+        ttl_seconds: float = 5.0,
+        max_entries: int = 1024,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._ttl = ttl_seconds
+        self._max_entries = max_entries
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        # Loads in flight per key; a load only stores its result while it is still registered.
+        self._loading: Dict[Hashable, asyncio.Task] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.invalidations = 0
+
+    async def source_history(
+        self, source: str, loader: Callable[[], Awaitable[SourceHistory]]
+    ) -> SourceHistory:
+        return await self._get_or_load(("source", source), loader)
+
+    async def severity_history(
+        self, severity: AlertSeverity, loader: Callable[[], Awaitable[List[Incident]]]
+    ) -> List[Incident]:
+        return await self._get_or_load(("severity", severity), loader)
+
+    async def _get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] > self._clock():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            del self._entries[key]
+
+        task = self._loading.get(key)
+        if task is not None:
+            self.coalesced += 1
+            return await asyncio.shield(task)
+
+        self.misses += 1
+        task = asyncio.ensure_future(self._load(key, loader))
+        self._loading[key] = task
+        task.add_done_callback(lambda t, k=key: self._on_load_done(k, t))
+        return await asyncio.shield(task)
+
+    def _on_load_done(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._loading.get(key) is task:
+            del self._loading[key]
+        # Mark the exception retrieved even if every waiter was cancelled.
+        if not task.cancelled():
+            task.exception()
+
+    async def _load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        value = await loader()
+        # Invalidating the key unregisters this load: its result may predate the write.
+        if self._loading.get(key) is asyncio.current_task():
+            self._entries[key] = (self._clock() + self._ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def invalidate_incident(self, source: str, severity: AlertSeverity) -> None:
+        """An incident was written: drop its source's and its severity's history."""
+        self._drop(("source", source))
+        self._drop(("severity", severity))
+
+    def invalidate_source(self, source: str) -> None:
+        """A remediation plan for ``source`` was written."""
+        self._drop(("source", source))
+
+    def clear(self) -> None:
+        for key in set(self._entries) | set(self._loading):
+            self._drop(key)
+
+    def _drop(self, key: Hashable) -> None:
+        self.invalidations += 1
+        self._entries.pop(key, None)
+        # Later callers must not join a load that started before the write.
+        self._loading.pop(key, None)
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "invalidations": self.invalidations,
+        }
@@ -0,0 +1,231 @@
+"""
+IncidentHistoryStore: in-process sliding-window history of incidents and plans.
+
+Keeps the last ``window_seconds`` (24 h by default, as get_recent_similar) of
+incidents in time-bucketed rings, one ring per source and one per severity,
+plus the latest executed plans per source. ContextBuilderService can answer
+"recent incidents with this source OR this severity" and "past executed plans
+for this source" from memory instead of Postgres.
+
+Retrieval of the newest ``limit`` matches walks the two rings newest-first
+and merges them, stopping after ``limit`` distinct incidents: O(limit), not
+O(history). Because the newest N of a union are always among the newest N of
+each side, each ring only ever needs its newest ``max_per_key`` incidents,
+which together with the ``max_sources`` LRU bound caps memory at roughly
+``(max_sources + 4) * max_per_key`` incidents.
+
+The store is fed by AlertPipeline as alerts complete and pre-warmed from the
+database at startup (``warm_from``). ``verify`` compares its answers with the
+repositories for a consistency-check mode.
+"""
+import heapq
+import itertools
+from bisect import insort
+from collections import OrderedDict, deque
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Deque, Dict, Iterator, List, Tuple
+
+from app.core.entities import AlertSeverity, Incident, RemediationPlan
+from app.core.logging import logger
+from app.infrastructure.database.repositories import IncidentRepository, PlanRepository
+
+
+def _aware(moment: datetime) -> datetime:
+    # SQLite hands back naive datetimes for timezone-aware columns.
+    return moment if moment.tzinfo is not None else moment.replace(tzinfo=timezone.utc)
+
+
+class _Ring:
+    """Time-bucketed incidents for one key, oldest bucket first."""
+
+    __slots__ = ("buckets", "size")
+
+    def __init__(self) -> None:
+        self.buckets: Deque[Tuple[int, List[Tuple[datetime, str, Incident]]]] = deque()
+        self.size = 0
+
+    def add(self, bucket: int, incident: Incident, created_at: datetime, max_size: int) -> None:
+        item = (created_at, incident.id, incident)
+        buckets = self.buckets
+        if not buckets or buckets[-1][0] < bucket:
+            buckets.append((bucket, [item]))
+        else:
+            # Late arrival: find its bucket from the newest end (usually the last one).
+            for index in range(len(buckets) - 1, -1, -1):
+                if buckets[index][0] == bucket:
+                    insort(buckets[index][1], item, key=lambda entry: entry[0])
+                    break
+                if buckets[index][0] < bucket:
+                    buckets.insert(index + 1, (bucket, [item]))
+                    break
+            else:
+                buckets.appendleft((bucket, [item]))
+        self.size += 1
+        while self.size > max_size:
+            self._pop_oldest()
+
+    def expire(self, oldest_bucket: int) -> None:
+        while self.buckets and self.buckets[0][0] < oldest_bucket:
+            self.size -= len(self.buckets.popleft()[1])
+
+    def newest_first(self, cutoff: datetime) -> Iterator[Tuple[datetime, str, Incident]]:
+        for _, items in reversed(self.buckets):
+            for item in reversed(items):
+                if item[0] < cutoff:
+                    return
+                yield item
+
+    def _pop_oldest(self) -> None:
+        items = self.buckets[0][1]
+        items.pop(0)
+        self.size -= 1
+        if not items:
+            self.buckets.popleft()
+
+
+class IncidentHistoryStore:
+    """Bounded in-memory incident/plan history answering the context-builder queries."""
+
+    def __init__(
+        self,
+        window_seconds: float = 24 * 3600,
+        bucket_seconds: float = 300,
+        max_per_key: int = 50,
+        max_sources: int = 10_000,
+        max_plans_per_source: int = 20,
+        now: Callable[[], datetime] = lambda: datetime.now(timezone.utc),
+    ) -> None:
+        self.window = timedelta(seconds=window_seconds)
+        self.bucket_seconds = bucket_seconds
+        self.max_per_key = max_per_key
+        self.max_sources = max_sources
+        self.max_plans_per_source = max_plans_per_source
+        self._now = now
+        self._by_source: "OrderedDict[str, _Ring]" = OrderedDict()
+        self._by_severity: Dict[AlertSeverity, _Ring] = {}
+        self._plans: "OrderedDict[str, Deque[RemediationPlan]]" = OrderedDict()
+        self.warm = False
+        self.mismatches = 0
+        self.checks = 0
+
+    # -- writes ------------------------------------------------------------
+
+    def record_incident(self, incident: Incident) -> None:
+        created_at = _aware(incident.created_at)
+        if created_at < self._now() - self.window:
+            return
+        bucket = self._bucket(created_at)
+        ring = self._by_source.get(incident.source)
+        if ring is None:
+            ring = self._by_source[incident.source] = _Ring()
+            if len(self._by_source) > self.max_sources:
+                self._by_source.popitem(last=False)
+        else:
+            self._by_source.move_to_end(incident.source)
+        ring.add(bucket, incident, created_at, self.max_per_key)
+        self._by_severity.setdefault(incident.severity, _Ring()).add(
+            bucket, incident, created_at, self.max_per_key
+        )
+
+    def record_plan(self, source: str, plan: RemediationPlan) -> None:
+        """Record a plan for ``source``; only EXECUTED plans are kept, as the repository query."""
+        if plan.status != "EXECUTED":
+            return
+        plans = self._plans.get(source)
+        if plans is None:
+            plans = self._plans[source] = deque(maxlen=self.max_plans_per_source)
+            if len(self._plans) > self.max_sources:
+                self._plans.popitem(last=False)
+        else:
+            self._plans.move_to_end(source)
+        plans.append(plan)
+
+    # -- reads -------------------------------------------------------------
+
+    def get_recent_similar(
+        self, source: str, severity: AlertSeverity, limit: int = 10
+    ) -> List[Incident]:
+        """Newest incidents with this source OR this severity inside the window."""
+        cutoff = self._now() - self.window
+        oldest_bucket = self._bucket(cutoff)
+        streams = []
+        for ring in (self._by_source.get(source), self._by_severity.get(severity)):
+            if ring is not None:
+                ring.expire(oldest_bucket)
+                streams.append(ring.newest_first(cutoff))
+        result: List[Incident] = []
+        seen = set()
+        for _, incident_id, incident in heapq.merge(*streams, key=lambda item: item[0], reverse=True):
+            if incident_id in seen:  # Same incident reached through both rings.
+                continue
+            seen.add(incident_id)
+            result.append(incident)
+            if len(result) >= limit:
+                break
+        return result
+
+    def get_past_executed_for_source(self, source: str, limit: int = 5) -> List[RemediationPlan]:
+        plans = self._plans.get(source)
+        if not plans:
+            return []
+        return list(itertools.islice(reversed(plans), limit))
+
+    def stats(self) -> dict:
+        return {
+            "warm": self.warm,
+            "sources": len(self._by_source),
+            "incidents_by_severity": {
+                severity.value: ring.size for severity, ring in self._by_severity.items()
+            },
+            "plan_sources": len(self._plans),
+            "checks": self.checks,
+            "mismatches": self.mismatches,
+        }
+
+    # -- database sync -----------------------------------------------------
+
+    async def warm_from(self, session_factory: Callable, plan_limit: int = 10_000) -> None:
+        """Pre-load the window's incidents and the latest executed plans from the DB."""
+        cutoff = self._now() - self.window
+        async with session_factory() as session:
+            incidents = await IncidentRepository(session).get_since(cutoff)
+            plans = await PlanRepository(session).get_executed_with_source(limit=plan_limit)
+        for incident in incidents:
+            self.record_incident(incident)
+        for source, plan in reversed(plans):  # Oldest first so the newest end up last.
+            self.record_plan(source, plan)
+        self.warm = True
+        logger.info(
+            "Incident history store warmed",
+            extra={"incidents": len(incidents), "plans": len(plans)},
+        )
+
+    async def verify(self, session_factory: Callable, source: str, severity: AlertSeverity) -> bool:
+        """Compare this store's answers for one key with the repositories'. Logs mismatches."""
+        async with session_factory() as session:
+            db_incidents = await IncidentRepository(session).get_recent_similar(source, severity)
+            db_plans = await PlanRepository(session).get_past_executed_for_source(source)
+        mem_incidents = self.get_recent_similar(source, severity)
+        mem_plans = self.get_past_executed_for_source(source)
+        # Compare as sets: rows with equal timestamps may legitimately come back in either order.
+        consistent = {i.id for i in db_incidents} == {i.id for i in mem_incidents} and {
+            p.id for p in db_plans
+        } == {p.id for p in mem_plans}
+        self.checks += 1
+        if not consistent:
+            self.mismatches += 1
+            logger.warning(
+                "Incident history store disagrees with database",
+                extra={
+                    "source": source,
+                    "severity": severity.value,
+                    "db_incidents": len(db_incidents),
+                    "store_incidents": len(mem_incidents),
+                    "db_plans": len(db_plans),
+                    "store_plans": len(mem_plans),
+                },
+            )
+        return consistent
+
+    def _bucket(self, moment: datetime) -> int:
+        return int(moment.timestamp() // self.bucket_seconds)
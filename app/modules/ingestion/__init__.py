@@ -1,3 +1,5 @@
 from .simulator import AlertSimulator
+from .queue import AlertQueue, AdmissionResult
+from .dedup import AlertDeduplicator, ExpiredRepeats
 
-__all__ = ["AlertSimulator"]
+__all__ = ["AlertSimulator", "AlertQueue", "AdmissionResult", "AlertDeduplicator", "ExpiredRepeats"]
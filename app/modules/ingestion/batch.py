@@ -0,0 +1,123 @@
+"""
+Bulk alert ingestion helpers for the batch (JSON array) and streaming (NDJSON)
+endpoints.
+
+Per-alert HTTP requests made upstream emitters pay one round-trip plus one
+pydantic validation per alert. These helpers validate a whole batch with a
+single TypeAdapter pass (falling back to per-item validation only to report
+which items are bad) and parse NDJSON incrementally from the request body so
+large streams never have to be buffered in memory.
+"""
+import json
+from typing import Any, AsyncIterator, List, Literal, Optional, Tuple
+
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+from ...core.entities import Alert
+from .queue import AdmissionResult, AlertQueue
+
+_ALERT_LIST = TypeAdapter(List[Alert])
+
+_STATUS_BY_RESULT = {
+    AdmissionResult.ACCEPTED: "queued",
+    AdmissionResult.SHED: "shed",
+    AdmissionResult.REJECTED: "rejected",
+}
+
+
+class BatchItemResult(BaseModel):
+    """Outcome of one item of a batch or stream, reported back to the emitter."""
+
+    index: int
+    alert_id: Optional[str] = None
+    status: Literal["queued", "shed", "rejected", "invalid"]
+    error: Optional[str] = None
+
+
+def validate_alerts(
+    items: List[Any], start_index: int = 0
+) -> Tuple[List[Tuple[int, Alert]], List[BatchItemResult]]:
+    """
+    Validate raw items into Alerts.
+
+    Returns ``(valid, invalid)`` where ``valid`` pairs each Alert with its index
+    in the original payload and ``invalid`` holds one result per bad item.
+    """
+    try:
+        alerts = _ALERT_LIST.validate_python(items)
+        return [(start_index + i, a) for i, a in enumerate(alerts)], []
+    except ValidationError:
+        pass
+
+    # Slow path: at least one item is bad — validate individually to attribute errors.
+    valid: List[Tuple[int, Alert]] = []
+    invalid: List[BatchItemResult] = []
+    for offset, item in enumerate(items):
+        index = start_index + offset
+        try:
+            valid.append((index, Alert.model_validate(item)))
+        except ValidationError as exc:
+            invalid.append(
+                BatchItemResult(index=index, status="invalid", error=_summarize(exc))
+            )
+    return valid, invalid
+
+
+def enqueue_alerts(
+    queue: AlertQueue, valid: List[Tuple[int, Alert]]
+) -> List[BatchItemResult]:
+    """Offer all validated alerts to the queue in one step and report each outcome."""
+    outcomes = queue.offer_many([alert for _, alert in valid])
+    return [
+        BatchItemResult(index=index, alert_id=alert.id, status=_STATUS_BY_RESULT[outcome])
+        for (index, alert), outcome in zip(valid, outcomes)
+    ]
+
+
+async def iter_ndjson(
+    chunks: AsyncIterator[bytes], max_line_bytes: int = 1_048_576
+) -> AsyncIterator[Tuple[int, Any, Optional[str]]]:
+    """
+    Incrementally split an NDJSON byte stream into parsed objects.
+
+    Yields ``(index, obj, error)`` per non-blank line; ``error`` is set (and
+    ``obj`` is None) when the line is not valid JSON or exceeds ``max_line_bytes``.
+    """
+    buffer = b""
+    index = 0
+    skipping = False  # Discarding the tail of an oversized line.
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if skipping:
+                skipping = False
+                continue
+            if not line.strip():
+                continue
+            yield (index, *_parse_line(line, max_line_bytes))
+            index += 1
+        if len(buffer) > max_line_bytes:
+            if not skipping:
+                yield index, None, f"line exceeds {max_line_bytes} bytes"
+                index += 1
+                skipping = True
+            buffer = b""
+    if buffer.strip() and not skipping:
+        yield (index, *_parse_line(buffer, max_line_bytes))
+
+
+def _parse_line(line: bytes, max_line_bytes: int) -> Tuple[Any, Optional[str]]:
+    if len(line) > max_line_bytes:
+        return None, f"line exceeds {max_line_bytes} bytes"
+    try:
+        return json.loads(line), None
+    except ValueError as exc:
+        return None, f"invalid JSON: {exc}"
+
+
+def _summarize(exc: ValidationError) -> str:
+    """Compact, single-line description of a pydantic validation error."""
+    return "; ".join(
+        f"{'.'.join(str(p) for p in err['loc']) or 'item'}: {err['msg']}" for err in exc.errors()
+    )
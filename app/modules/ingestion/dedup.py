@@ -0,0 +1,150 @@
+"""
+AlertDeduplicator: sliding coalescing window keyed on alert fingerprint.
+
+Flapping emitters repeat the same alert many times a minute, and each repeat
+used to pay for context building, LLM analysis, policy and action again. The
+deduplicator lets the first occurrence of a fingerprint through and folds every
+repeat within ``window_seconds`` into it as an occurrence count. The first
+repeat after the window expires passes through again, carrying the number of
+occurrences folded since the previous analysis in ``Alert.occurrences`` — at
+most one alert per fingerprint per window reaches the analyzer.
+
+When flapping stops, no later alert carries the folded count. A window with
+repeats that is pruned (idle for a full window, or evicted at
+``max_entries``) is queued as an ``ExpiredRepeats`` record instead; the
+pipeline drains them with ``expire`` and writes them to the audit trail.
+"""
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, NamedTuple
+
+from ...core.entities import Alert
+from ...core.fingerprint import alert_fingerprint
+from ...core.logging import logger
+
+
+class DedupDecision(NamedTuple):
+    fingerprint: str
+    is_duplicate: bool
+    first_alert_id: str   # Alert that opened the current window.
+    occurrences: int      # Occurrences seen in the current window, including this one.
+
+
+class ExpiredRepeats(NamedTuple):
+    fingerprint: str
+    first_alert_id: str
+    source: str
+    severity: str
+    occurrences: int      # Occurrences in the expired window, including the analyzed first one.
+
+
+class _Window:
+    __slots__ = ("first_alert_id", "source", "severity", "started_at", "last_seen", "count")
+
+    def __init__(self, alert: Alert, now: float) -> None:
+        self.first_alert_id = alert.id
+        self.source = alert.source
+        self.severity = alert.severity.value
+        self.started_at = now
+        self.last_seen = now
+        self.count = 1
+
+
+class AlertDeduplicator:
+    """
+    In-process dedup window. Memory is bounded by ``max_entries``; fingerprints
+    idle for a full window are pruned in O(1) amortized time per observation.
+    """
+
+    def __init__(
+        self,
+        window_seconds: float = 60.0,
+        max_entries: int = 10_000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._window = window_seconds
+        self._max_entries = max_entries
+        self._clock = clock
+        # Ordered by last_seen (oldest first) so pruning only looks at the front.
+        self._entries: "OrderedDict[str, _Window]" = OrderedDict()
+        # Folded windows pruned without a pass-through alert, until ``expire`` drains them.
+        self._expired: List[ExpiredRepeats] = []
+        self._seen = 0
+        self._suppressed = 0
+        self._expired_repeats = 0
+
+    def observe(self, alert: Alert) -> DedupDecision:
+        """
+        Record an alert and decide whether it should be processed.
+
+        Pass-through alerts that close a window with folded repeats get
+        ``alert.occurrences`` set to the size of that window.
+        """
+        now = self._clock()
+        self._seen += 1
+        self._prune(now)
+        fp = alert_fingerprint(alert)
+
+        entry = self._entries.get(fp)
+        if entry is not None and now - entry.started_at < self._window:
+            entry.count += 1
+            entry.last_seen = now
+            self._entries.move_to_end(fp)
+            self._suppressed += 1
+            return DedupDecision(fp, True, entry.first_alert_id, entry.count)
+
+        if entry is not None and entry.count > 1:
+            # Window rolled over while still flapping: report what was folded.
+            alert.occurrences = entry.count
+            logger.info(
+                "Coalesced repeated alerts",
+                extra={
+                    "fingerprint": fp,
+                    "first_alert_id": entry.first_alert_id,
+                    "occurrences": entry.count,
+                },
+            )
+        self._entries[fp] = _Window(alert, now)
+        self._entries.move_to_end(fp)
+        return DedupDecision(fp, False, alert.id, 1)
+
+    def expire(self, everything: bool = False) -> List[ExpiredRepeats]:
+        """
+        Prune idle windows and return the folded ones not yet reported.
+
+        ``everything`` also closes windows that are still open (at shutdown).
+        """
+        if everything:
+            for fp, entry in self._entries.items():
+                self._report(fp, entry)
+            self._entries.clear()
+        else:
+            self._prune(self._clock())
+        expired, self._expired = self._expired, []
+        return expired
+
+    def stats(self) -> Dict:
+        return {
+            "window_seconds": self._window,
+            "active_fingerprints": len(self._entries),
+            "seen": self._seen,
+            "suppressed": self._suppressed,
+            "expired_repeats": self._expired_repeats,
+        }
+
+    def _prune(self, now: float) -> None:
+        entries = self._entries
+        while entries:
+            fp, entry = next(iter(entries.items()))
+            if now - entry.last_seen >= self._window or len(entries) >= self._max_entries:
+                del entries[fp]
+                self._report(fp, entry)
+            else:
+                break
+
+    def _report(self, fp: str, entry: _Window) -> None:
+        if entry.count > 1:
+            self._expired_repeats += 1
+            self._expired.append(
+                ExpiredRepeats(fp, entry.first_alert_id, entry.source, entry.severity, entry.count)
+            )
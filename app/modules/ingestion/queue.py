@@ -0,0 +1,244 @@
+"""
+AlertQueue: bounded, severity-aware ingestion queue in front of the pipeline.
+
+Every producer (simulator loop, /simulate, batch endpoints) feeds this queue and
+the worker pool drains it, so the number of in-flight process_alert coroutines,
+DB sessions and LLM calls is capped by the worker count no matter how hard
+upstream pushes.
+
+Load shedding is severity-aware:
+  * Each severity has an admission watermark (fraction of capacity). Low
+    severities stop being admitted first — by default INFO is shed once the
+    queue is 70% full while CRITICAL/FATAL may use the whole queue.
+  * An alert arriving above its watermark may instead evict the oldest queued
+    alert of a strictly lower severity; if there is none it is shed (429) or,
+    when the queue is completely full, rejected (503).
+  * Consumers always receive the highest-severity alert first (FIFO within a
+    severity), so FATAL alerts do not wait behind an INFO backlog.
+"""
+import asyncio
+from collections import deque
+from enum import Enum
+from typing import Deque, Dict, List, Optional, Tuple
+
+from ...core.entities import Alert, AlertSeverity
+from ...core.logging import logger
+
+# Lowest → highest priority. Eviction and shedding walk this order.
+SEVERITY_ORDER = [
+    AlertSeverity.INFO,
+    AlertSeverity.WARNING,
+    AlertSeverity.CRITICAL,
+    AlertSeverity.FATAL,
+]
+_RANK = {sev: rank for rank, sev in enumerate(SEVERITY_ORDER)}
+
+DEFAULT_WATERMARKS: Dict[AlertSeverity, float] = {
+    AlertSeverity.INFO: 0.7,
+    AlertSeverity.WARNING: 0.9,
+    AlertSeverity.CRITICAL: 1.0,
+    AlertSeverity.FATAL: 1.0,
+}
+
+
+class AdmissionResult(str, Enum):
+    ACCEPTED = "ACCEPTED"
+    SHED = "SHED"            # Rejected by load shedding: severity above its watermark.
+    REJECTED = "REJECTED"    # Queue full and nothing of lower severity to evict.
+
+
+class AlertQueue:
+    """
+    Bounded priority queue of Alerts with asyncio.Queue-compatible consumer API
+    (get / task_done / join / qsize) so AlertWorkerPool can consume it directly.
+
+    ``offer()`` is the non-blocking, load-shedding entry point for HTTP producers.
+    ``put()`` blocks until there is room and is meant for internal producers such
+    as the simulator, where backpressure is preferable to dropping.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1000,
+        watermarks: Optional[Dict[AlertSeverity, float]] = None,
+    ) -> None:
+        if maxsize < 1:
+            raise ValueError("maxsize must be >= 1")
+        self._maxsize = maxsize
+        merged = dict(DEFAULT_WATERMARKS)
+        for sev, fraction in (watermarks or {}).items():
+            merged[AlertSeverity(sev)] = fraction
+        # Absolute depth limits per severity, computed once.
+        self._limits = {
+            sev: max(1, min(maxsize, int(maxsize * fraction))) for sev, fraction in merged.items()
+        }
+        self._queues: Dict[AlertSeverity, Deque[Alert]] = {sev: deque() for sev in SEVERITY_ORDER}
+        self._size = 0
+        self._getters: Deque[asyncio.Future] = deque()
+        self._putters: Deque[asyncio.Future] = deque()
+        self._unfinished = 0
+        self._finished = asyncio.Event()
+        self._finished.set()
+
+        self._accepted = {sev.value: 0 for sev in SEVERITY_ORDER}
+        self._shed = {sev.value: 0 for sev in SEVERITY_ORDER}
+        self._evicted = {sev.value: 0 for sev in SEVERITY_ORDER}
+        self._rejected = {sev.value: 0 for sev in SEVERITY_ORDER}
+
+    # ------------------------------------------------------------------
+    # Producer API
+    # ------------------------------------------------------------------
+
+    def offer(self, alert: Alert) -> AdmissionResult:
+        """Try to enqueue without waiting, shedding or evicting as configured."""
+        return self._offer(alert)[0]
+
+    def offer_many(self, alerts: List[Alert]) -> List[AdmissionResult]:
+        """
+        Offer a batch in one step; returns each alert's final AdmissionResult, in order.
+
+        An alert of the batch that a later, higher-severity alert of the same
+        batch evicted again is reported as SHED, not ACCEPTED.
+        """
+        results: List[AdmissionResult] = []
+        queued: Dict[int, int] = {}  # id(alert) -> position, for this batch's queued alerts.
+        for alert in alerts:
+            result, victim = self._offer(alert)
+            if victim is not None and id(victim) in queued:
+                results[queued.pop(id(victim))] = AdmissionResult.SHED
+            if result is AdmissionResult.ACCEPTED:
+                queued[id(alert)] = len(results)
+            results.append(result)
+        return results
+
+    def _offer(self, alert: Alert) -> Tuple[AdmissionResult, Optional[Alert]]:
+        """``offer`` plus the alert evicted to make room, if any."""
+        severity = alert.severity
+        victim = None
+        # Above this severity's watermark, only make room at the expense of
+        # lower-severity alerts; otherwise shed (or reject when truly full).
+        if self._size >= self._limits[severity]:
+            victim = self._evict_below(severity)
+            if victim is None:
+                if self._size < self._maxsize:
+                    self._shed[severity.value] += 1
+                    return AdmissionResult.SHED, None
+                self._rejected[severity.value] += 1
+                return AdmissionResult.REJECTED, None
+        self._push(alert)
+        return AdmissionResult.ACCEPTED, victim
+
+    async def put(self, alert: Alert) -> None:
+        """Enqueue, waiting for free capacity instead of shedding."""
+        while self._size >= self._maxsize:
+            putter = asyncio.get_running_loop().create_future()
+            self._putters.append(putter)
+            try:
+                await putter
+            except BaseException:
+                putter.cancel()
+                if putter in self._putters:
+                    self._putters.remove(putter)
+                # Pass the wakeup on if we were signalled but are being cancelled.
+                if self._size < self._maxsize and not putter.cancelled():
+                    self._wakeup(self._putters)
+                raise
+        self._push(alert)
+
+    # ------------------------------------------------------------------
+    # Consumer API (asyncio.Queue compatible)
+    # ------------------------------------------------------------------
+
+    async def get(self) -> Alert:
+        """Remove and return the highest-severity alert, waiting if empty."""
+        while self._size == 0:
+            getter = asyncio.get_running_loop().create_future()
+            self._getters.append(getter)
+            try:
+                await getter
+            except BaseException:
+                getter.cancel()
+                if getter in self._getters:
+                    self._getters.remove(getter)
+                # Pass the wakeup on if we were signalled but are being cancelled.
+                if self._size and not getter.cancelled():
+                    self._wakeup(self._getters)
+                raise
+        return self._pop()
+
+    def task_done(self) -> None:
+        if self._unfinished <= 0:
+            raise ValueError("task_done() called too many times")
+        self._unfinished -= 1
+        if self._unfinished == 0:
+            self._finished.set()
+
+    async def join(self) -> None:
+        """Block until every dequeued alert has been marked done."""
+        if self._unfinished > 0:
+            await self._finished.wait()
+
+    def qsize(self) -> int:
+        return self._size
+
+    @property
+    def maxsize(self) -> int:
+        return self._maxsize
+
+    def stats(self) -> Dict:
+        """Queue depth and admission/drop counters, per severity."""
+        return {
+            "depth": self._size,
+            "maxsize": self._maxsize,
+            "depth_by_severity": {sev.value: len(q) for sev, q in self._queues.items()},
+            "accepted": dict(self._accepted),
+            "shed": dict(self._shed),
+            "evicted": dict(self._evicted),
+            "rejected": dict(self._rejected),
+        }
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _push(self, alert: Alert) -> None:
+        self._queues[alert.severity].append(alert)
+        self._size += 1
+        self._unfinished += 1
+        self._finished.clear()
+        self._accepted[alert.severity.value] += 1
+        self._wakeup(self._getters)
+
+    def _pop(self) -> Alert:
+        for sev in reversed(SEVERITY_ORDER):
+            queue = self._queues[sev]
+            if queue:
+                self._size -= 1
+                self._wakeup(self._putters)
+                return queue.popleft()
+        raise RuntimeError("AlertQueue size accounting out of sync")
+
+    def _evict_below(self, severity: AlertSeverity) -> Optional[Alert]:
+        """Drop and return the oldest queued alert of the lowest severity strictly below ``severity``."""
+        for sev in SEVERITY_ORDER[: _RANK[severity]]:
+            queue = self._queues[sev]
+            if queue:
+                victim = queue.popleft()
+                self._size -= 1
+                # The evicted alert will never reach task_done().
+                self.task_done()
+                self._evicted[sev.value] += 1
+                logger.warning(
+                    "Queue full — evicted lower-severity alert",
+                    extra={"alert_id": victim.id, "severity": sev.value, "for": severity.value},
+                )
+                return victim
+        return None
+
+    @staticmethod
+    def _wakeup(waiters: Deque[asyncio.Future]) -> None:
+        while waiters:
+            waiter = waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                break
@@ -1,7 +1,7 @@
 import asyncio
 import random
 import uuid
-from typing import AsyncIterator
+from typing import AsyncIterator, Optional
 from ...core.interfaces import IIngestionModule
 from ...core.entities import Alert, AlertSeverity
 
@@ -11,9 +11,11 @@ class AlertSimulator(IIngestionModule):
     Generates random CPU, Memory, and Disk events.
     """
     
-    def __init__(self, interval: float = 5.0):
+    def __init__(self, interval: float = 5.0, seed: Optional[int] = None):
         self.interval = interval
         self._running = True
+        # A seeded generator makes the alert stream reproducible (benchmarks, tests).
+        self._rng = random.Random(seed)
 
     async def get_alerts(self) -> AsyncIterator[Alert]:
         """Yields simulated alerts at a defined interval."""
@@ -21,7 +23,7 @@ class AlertSimulator(IIngestionModule):
             await asyncio.sleep(self.interval)
             
             # Simulate occasional alerts
-            if random.random() < 0.7:  # 70% chance of alert each interval
+            if self._rng.random() < 0.7:  # 70% chance of alert each interval
                 yield self._generate_random_alert()
 
     def _generate_random_alert(self) -> Alert:
@@ -58,10 +60,10 @@ class AlertSimulator(IIngestionModule):
             }
         ]
         
-        scenario = random.choice(scenarios)
+        scenario = self._rng.choice(scenarios)
         
         return Alert(
-            id=str(uuid.uuid4()),
+            id=str(uuid.UUID(int=self._rng.getrandbits(128), version=4)),
             source=scenario["source"],
             severity=scenario["severity"],
             message=scenario["message"],
@@ -0,0 +1,4 @@
+from .orchestrator import AlertPipeline
+from .workers import AlertWorkerPool
+
+__all__ = ["AlertPipeline", "AlertWorkerPool"]
@@ -0,0 +1,217 @@
+"""
+AlertPipeline: the main orchestration flow for a single alert.
+
+    Ingest → Dedup → EnrichContext → Analyze → Policy → Action → Audit
+
+Holds its collaborators by interface so main.py wires the production modules
+while benchmarks and tests can assemble the same flow around stand-ins.
+
+Each stage is timed into the ``sentinel_stage_duration_seconds`` histogram;
+counters track received / deduplicated / processed alerts and which analysis
+path produced each diagnosis (LLM vs. rule fallback). Label children are
+bound once in __init__ so the per-alert overhead is a few perf_counter()
+calls and histogram bucket increments.
+"""
+from time import perf_counter
+from typing import Optional
+
+from ...core.entities import Alert, AuditLog, Incident
+from ...core.interfaces import IActionModule, IAnalysisModule, IAuditModule, IPolicyModule
+from ...core.logging import logger
+from ...core.metrics import registry
+from ...infrastructure.database.write_behind import WriteBehindPersister
+from ..context import ContextBuilderService, IncidentHistoryStore
+from ..ingestion.dedup import AlertDeduplicator
+
+STAGES = ("context", "analyze", "policy", "action", "audit")
+
+ALERTS_RECEIVED = registry.counter(
+    "sentinel_alerts_received_total", "Alerts that entered the pipeline."
+)
+ALERTS_DEDUPLICATED = registry.counter(
+    "sentinel_alerts_deduplicated_total", "Alerts folded into an earlier occurrence by the dedup window."
+)
+ALERTS_PROCESSED = registry.counter(
+    "sentinel_alerts_processed_total", "Alerts that completed the pipeline, by outcome.", ["result"]
+)
+ALERTS_FAILED = registry.counter(
+    "sentinel_alerts_failed_total", "Alerts whose processing raised an unhandled error."
+)
+ALERTS_IN_FLIGHT = registry.gauge(
+    "sentinel_alerts_in_flight", "Alerts currently being processed."
+)
+STAGE_SECONDS = registry.histogram(
+    "sentinel_stage_duration_seconds", "Time spent in each pipeline stage.", ["stage"]
+)
+ANALYSIS_TOTAL = registry.counter(
+    "sentinel_analysis_total", "Diagnoses by the analysis path that produced them.", ["path"]
+)
+
+
+class _NullObserver:
+    """Stand-in for a histogram child when instrumentation is disabled."""
+
+    def observe(self, value: float) -> None:
+        pass
+
+
+class AlertPipeline:
+    """Runs one alert through every stage. Never raises: errors are logged."""
+
+    def __init__(
+        self,
+        context_builder: ContextBuilderService,
+        analyzer: IAnalysisModule,
+        risk_evaluator: IPolicyModule,
+        executor: IActionModule,
+        audit_service: IAuditModule,
+        deduplicator: Optional[AlertDeduplicator] = None,
+        instrument: bool = True,
+        history_store: Optional[IncidentHistoryStore] = None,
+        persister: Optional[WriteBehindPersister] = None,
+    ) -> None:
+        self.context_builder = context_builder
+        self.analyzer = analyzer
+        self.risk_evaluator = risk_evaluator
+        self.executor = executor
+        self.audit_service = audit_service
+        self.deduplicator = deduplicator
+        # Fed with every processed alert so later contexts see it as history.
+        self.history_store = history_store
+        # Incidents and plans are persisted write-behind: no DB round trip here.
+        self.persister = persister
+        self._instrument = instrument
+        if instrument:
+            self._stage = {stage: STAGE_SECONDS.labels(stage=stage) for stage in STAGES}
+        else:
+            self._stage = {stage: _NullObserver() for stage in STAGES}
+
+    async def process(self, alert: Alert) -> None:
+        """
+        Main orchestration flow: Ingest → EnrichContext → Analyze → Policy → Action → Audit.
+        Any unhandled exception is caught and logged so the worker stays alive.
+        """
+        instrument = self._instrument
+        stage = self._stage
+        if instrument:
+            ALERTS_RECEIVED.inc()
+            ALERTS_IN_FLIGHT.inc()
+        try:
+            # 0. Log Ingestion
+            logger.info(f"Received alert: {alert.source}", extra={"alert_id": alert.id})
+
+            # 0.25 Dedup: fold repeats within the window into the first occurrence
+            if self.deduplicator is not None:
+                decision = self.deduplicator.observe(alert)
+                await self.report_expired_repeats()
+                if decision.is_duplicate:
+                    if instrument:
+                        ALERTS_DEDUPLICATED.inc()
+                    logger.info(
+                        "Duplicate alert folded",
+                        extra={
+                            "alert_id": alert.id,
+                            "first_alert_id": decision.first_alert_id,
+                            "occurrences": decision.occurrences,
+                        },
+                    )
+                    return
+
+            # 0.5 Build enriched context (queries DB for historical incidents/plans)
+            started = perf_counter()
+            context = await self.context_builder.build(alert)
+            now = perf_counter()
+            stage["context"].observe(now - started)
+
+            # 1. Analyze
+            started = now
+            diagnosis = await self.analyzer.analyze(context)
+            now = perf_counter()
+            stage["analyze"].observe(now - started)
+            if instrument:
+                ANALYSIS_TOTAL.labels(path=diagnosis.analysis_path or "unknown").inc()
+
+            # 2. Policy / Risk
+            started = now
+            plan = await self.risk_evaluator.evaluate_risk(diagnosis)
+            now = perf_counter()
+            stage["policy"].observe(now - started)
+
+            # 3. Action (if auto-approved)
+            if not plan.requires_approval:
+                started = now
+                success = await self.executor.execute_action(plan)
+                now = perf_counter()
+                stage["action"].observe(now - started)
+                result = "EXECUTED" if success else "FAILED"
+            else:
+                result = "PENDING_APPROVAL"
+                logger.info("Action requires approval", extra={"plan_id": plan.id})
+
+            if self.history_store is not None or self.persister is not None:
+                incident = Incident(
+                    alert_id=alert.id,
+                    source=alert.source,
+                    severity=alert.severity,
+                    message=alert.message,
+                    metadata=alert.metadata,
+                    status="CLOSED" if result == "EXECUTED" else "OPEN",
+                    created_at=alert.timestamp,
+                )
+                if self.history_store is not None:
+                    self.history_store.record_incident(incident)
+                    self.history_store.record_plan(alert.source, plan)
+                if self.persister is not None:
+                    await self.persister.add_incident(incident)
+                    await self.persister.add_plan(plan, incident.id, alert.source)
+
+            # 4. Audit
+            started = now
+            log_entry = AuditLog(
+                component="Orchestrator",
+                event="AlertProcessed",
+                details={
+                    "alert": alert.model_dump(mode="json"),
+                    "diagnosis": diagnosis.model_dump(mode="json"),
+                    "plan": plan.model_dump(mode="json"),
+                    "escalation_reason": context.escalation_reason,
+                    "result": result,
+                },
+            )
+            await self.audit_service.log_event(log_entry)
+            stage["audit"].observe(perf_counter() - started)
+            if instrument:
+                ALERTS_PROCESSED.labels(result=result).inc()
+
+        except Exception as e:
+            if instrument:
+                ALERTS_FAILED.inc()
+            logger.error(f"Error processing alert: {e}", exc_info=True)
+        finally:
+            if instrument:
+                ALERTS_IN_FLIGHT.dec()
+
+    async def report_expired_repeats(self, everything: bool = False) -> int:
+        """
+        Audit dedup windows that expired with folded repeats no later alert carried.
+
+        Called on every alert and periodically (flapping may stop with no further
+        traffic); ``everything`` closes the open windows too, at shutdown.
+        """
+        if self.deduplicator is None:
+            return 0
+        expired = self.deduplicator.expire(everything)
+        for repeats in expired:
+            await self.audit_service.log_event(
+                AuditLog(
+                    component="Orchestrator",
+                    event="AlertRepeatsExpired",
+                    details={
+                        "alert": {"source": repeats.source, "severity": repeats.severity},
+                        "fingerprint": repeats.fingerprint,
+                        "first_alert_id": repeats.first_alert_id,
+                        "occurrences": repeats.occurrences,
+                    },
+                )
+            )
+        return len(expired)
@@ -0,0 +1,163 @@
+"""
+AlertWorkerPool: N concurrent async workers consuming a shared bounded alert queue.
+
+Replaces the strictly sequential ``await process_alert(alert)`` loop, where one
+slow LLM round-trip or action stalled every alert queued behind it. Producers
+(the simulator loop, HTTP endpoints) put alerts on the queue; each worker pulls
+the next alert and hands it to the injected handler.
+
+The queue is bounded, so producers awaiting ``submit()`` are naturally slowed
+down when all workers are busy instead of piling up unbounded coroutines.
+"""
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from ...core.entities import Alert
+from ...core.logging import logger
+
+AlertHandler = Callable[[Alert], Awaitable[None]]
+
+
+class WorkerStats:
+    """Busy-time accounting for a single worker, used for utilization reporting."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.processed = 0
+        self.failed = 0
+        self.busy_seconds = 0.0
+        self.started_at = time.monotonic()
+        self.current_alert_id: Optional[str] = None
+        self._busy_since: Optional[float] = None
+
+    def begin(self, alert_id: str) -> None:
+        self.current_alert_id = alert_id
+        self._busy_since = time.monotonic()
+
+    def end(self) -> None:
+        if self._busy_since is not None:
+            self.busy_seconds += time.monotonic() - self._busy_since
+        self._busy_since = None
+        self.current_alert_id = None
+
+    def utilization(self) -> float:
+        """Fraction of wall-clock time since start spent processing alerts."""
+        now = time.monotonic()
+        busy = self.busy_seconds
+        if self._busy_since is not None:
+            busy += now - self._busy_since
+        elapsed = now - self.started_at
+        return busy / elapsed if elapsed > 0 else 0.0
+
+    def as_dict(self) -> Dict:
+        return {
+            "name": self.name,
+            "processed": self.processed,
+            "failed": self.failed,
+            "busy_seconds": round(self.busy_seconds, 3),
+            "utilization": round(self.utilization(), 4),
+            "current_alert_id": self.current_alert_id,
+        }
+
+
+class AlertWorkerPool:
+    """
+    Runs ``concurrency`` worker tasks that pull alerts from a shared queue.
+
+    ``queue`` may be any object with the asyncio.Queue consumer API
+    (put / get / task_done / join / qsize), e.g. the severity-aware AlertQueue.
+    The handler is expected to swallow its own errors (process_alert does);
+    anything that escapes is logged and counted so a worker never dies.
+    """
+
+    def __init__(
+        self,
+        handler: AlertHandler,
+        concurrency: int = 4,
+        maxsize: int = 1000,
+        queue=None,
+    ) -> None:
+        if concurrency < 1:
+            raise ValueError("concurrency must be >= 1")
+        self._handler = handler
+        self._concurrency = concurrency
+        self._queue = queue if queue is not None else asyncio.Queue(maxsize=maxsize)
+        self._workers: List[asyncio.Task] = []
+        self._stats: List[WorkerStats] = []
+
+    @property
+    def queue(self):
+        return self._queue
+
+    @property
+    def running(self) -> bool:
+        return bool(self._workers)
+
+    def start(self) -> None:
+        """Spawn the worker tasks. Must be called from within a running event loop."""
+        if self._workers:
+            return
+        self._stats = [WorkerStats(f"worker-{i}") for i in range(self._concurrency)]
+        self._workers = [
+            asyncio.create_task(self._run(stats), name=stats.name) for stats in self._stats
+        ]
+        logger.info("Worker pool started", extra={"workers": self._concurrency})
+
+    async def submit(self, alert: Alert) -> None:
+        """Enqueue an alert, waiting for free space if the queue is full."""
+        await self._queue.put(alert)
+
+    async def drain(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for every queued alert to be processed, then stop the workers.
+
+        Returns True if the queue drained fully, False if the timeout expired
+        first (remaining alerts are abandoned and the workers cancelled).
+        """
+        drained = True
+        if self._workers:
+            try:
+                await asyncio.wait_for(self._queue.join(), timeout=timeout)
+            except asyncio.TimeoutError:
+                drained = False
+                logger.warning(
+                    "Worker pool drain timed out — abandoning queued alerts",
+                    extra={"remaining": self._queue.qsize()},
+                )
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        logger.info("Worker pool stopped", extra={"drained": drained})
+        return drained
+
+    def stats(self) -> Dict:
+        """Snapshot of queue depth and per-worker utilization."""
+        workers = [s.as_dict() for s in self._stats]
+        return {
+            "concurrency": self._concurrency,
+            "queue_depth": self._queue.qsize(),
+            "busy": sum(1 for s in self._stats if s.current_alert_id is not None),
+            "processed": sum(s.processed for s in self._stats),
+            "failed": sum(s.failed for s in self._stats),
+            "workers": workers,
+        }
+
+    async def _run(self, stats: WorkerStats) -> None:
+        while True:
+            alert = await self._queue.get()
+            stats.begin(alert.id)
+            try:
+                await self._handler(alert)
+                stats.processed += 1
+            except Exception as exc:
+                stats.failed += 1
+                logger.error(
+                    f"Worker handler raised: {exc}",
+                    extra={"worker": stats.name, "alert_id": alert.id},
+                    exc_info=True,
+                )
+            finally:
+                stats.end()
+                self._queue.task_done()
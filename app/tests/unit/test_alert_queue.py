@@ -0,0 +1,89 @@
+import asyncio
+
+import pytest
+
+from app.core.entities import Alert, AlertSeverity
+from app.modules.ingestion.queue import AdmissionResult, AlertQueue
+
+
+def _alert(severity: AlertSeverity, message: str = "alert") -> Alert:
+    return Alert(source="server-01", severity=severity, message=message)
+
+
+def test_info_shed_before_critical():
+    queue = AlertQueue(maxsize=10)  # INFO watermark 0.7 → 7 slots
+    results = [queue.offer(_alert(AlertSeverity.INFO)) for _ in range(8)]
+
+    assert results[:7] == [AdmissionResult.ACCEPTED] * 7
+    assert results[7] is AdmissionResult.SHED
+    assert queue.offer(_alert(AlertSeverity.CRITICAL)) is AdmissionResult.ACCEPTED
+    stats = queue.stats()
+    assert stats["shed"]["INFO"] == 1
+    assert stats["depth"] == 8
+
+
+def test_full_queue_evicts_lower_severity_then_rejects():
+    queue = AlertQueue(maxsize=2, watermarks={"INFO": 1.0})
+    queue.offer(_alert(AlertSeverity.INFO))
+    queue.offer(_alert(AlertSeverity.FATAL))
+
+    assert queue.offer(_alert(AlertSeverity.FATAL)) is AdmissionResult.ACCEPTED
+    assert queue.stats()["evicted"]["INFO"] == 1
+    assert queue.offer(_alert(AlertSeverity.FATAL)) is AdmissionResult.REJECTED
+    assert queue.stats()["rejected"]["FATAL"] == 1
+
+
+@pytest.mark.asyncio
+async def test_get_returns_highest_severity_first_and_join_completes():
+    queue = AlertQueue(maxsize=10)
+    queue.offer(_alert(AlertSeverity.INFO, "first"))
+    queue.offer(_alert(AlertSeverity.FATAL, "second"))
+    queue.offer(_alert(AlertSeverity.INFO, "third"))
+
+    order = []
+    for _ in range(3):
+        alert = await queue.get()
+        order.append(alert.message)
+        queue.task_done()
+
+    assert order == ["second", "first", "third"]
+    await asyncio.wait_for(queue.join(), timeout=1)
+
+
+@pytest.mark.asyncio
+async def test_put_waits_for_capacity():
+    queue = AlertQueue(maxsize=1)
+    await queue.put(_alert(AlertSeverity.INFO))
+    blocked = asyncio.create_task(queue.put(_alert(AlertSeverity.INFO)))
+    await asyncio.sleep(0.01)
+    assert not blocked.done()
+
+    await queue.get()
+    await asyncio.wait_for(blocked, timeout=1)
+    assert queue.qsize() == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_putter_passes_its_wakeup_on():
+    queue = AlertQueue(maxsize=1)
+    await queue.put(_alert(AlertSeverity.INFO))
+    first = asyncio.create_task(queue.put(_alert(AlertSeverity.INFO, "first")))
+    second = asyncio.create_task(queue.put(_alert(AlertSeverity.INFO, "second")))
+    await asyncio.sleep(0.01)
+
+    await queue.get()  # Wakes ``first``...
+    first.cancel()  # ...which is cancelled before it runs.
+    await asyncio.wait_for(second, timeout=1)
+
+    assert first.cancelled()
+    assert (await queue.get()).message == "second"
+
+
+def test_offer_many_reports_alerts_evicted_by_their_own_batch():
+    queue = AlertQueue(maxsize=2, watermarks={"INFO": 1.0})
+    batch = [_alert(AlertSeverity.INFO), _alert(AlertSeverity.INFO), _alert(AlertSeverity.FATAL)]
+
+    results = queue.offer_many(batch)
+
+    assert results == [AdmissionResult.SHED, AdmissionResult.ACCEPTED, AdmissionResult.ACCEPTED]
+    assert queue.stats()["evicted"]["INFO"] == 1
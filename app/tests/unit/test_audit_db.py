@@ -0,0 +1,142 @@
+import asyncio
+import os
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.entities import AuditLog
+from app.infrastructure.database.models import AuditLogModel, Base
+from app.modules.audit.db_service import BufferedPostgresAuditService
+
+
+@pytest_asyncio.fixture
+async def session_factory():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    await engine.dispose()
+
+
+async def _count(session_factory):
+    async with session_factory() as session:
+        return (await session.execute(select(func.count()).select_from(AuditLogModel))).scalar_one()
+
+
+def _event(index=0):
+    return AuditLog(component="Test", event="E", details={"i": index})
+
+
+@pytest.mark.asyncio
+async def test_events_are_bulk_written_in_batches(session_factory, tmp_path):
+    service = BufferedPostgresAuditService(session_factory, spool_path=str(tmp_path / "spool"), max_batch=10)
+    for index in range(25):
+        await service.log_event(_event(index))
+    assert await _count(session_factory) == 0
+
+    await service.flush()
+
+    assert await _count(session_factory) == 25
+    assert service.stats()["batches"] == 3
+    assert service.use_copy is False  # aiosqlite: multi-row INSERT.
+
+
+@pytest.mark.asyncio
+async def test_outage_spools_to_file_and_replays(session_factory, tmp_path):
+    spool = str(tmp_path / "spool")
+    database = {"up": False}
+
+    def factory():
+        if not database["up"]:
+            raise ConnectionError("db down")
+        return session_factory()
+
+    service = BufferedPostgresAuditService(factory, spool_path=spool, max_batch=4)
+    for index in range(6):
+        await service.log_event(_event(index))
+    await service.flush()
+    await service.log_event(_event(6))
+    await service.flush()  # Degraded: straight to the spool, no DB attempt.
+
+    assert service.stats()["degraded"] is True
+    assert service.stats()["spooled"] == 7
+    with open(spool) as f:
+        assert len(f.readlines()) == 7
+
+    await service.replay()  # Still down: spool kept for the next attempt.
+    assert service.stats()["degraded"] is True and await _count(session_factory) == 0
+
+    database["up"] = True
+    await service.replay()
+    assert await _count(session_factory) == 7
+    assert service.stats()["degraded"] is False
+    assert not os.path.exists(spool) and not os.path.exists(spool + ".replaying")
+
+
+@pytest.mark.asyncio
+async def test_interrupted_replay_can_run_again(session_factory, tmp_path):
+    spool = str(tmp_path / "spool")
+    events = [_event(index) for index in range(5)]
+    service = BufferedPostgresAuditService(session_factory, spool_path=spool, max_batch=3)
+    for event in events[:3]:
+        await service.log_event(event)
+    await service.flush()
+    # A crash left every event in the spool although the first three were stored.
+    with open(spool + ".replaying", "w") as f:
+        f.write("".join(event.model_dump_json() + "\n" for event in events))
+
+    await service.replay()
+
+    assert await _count(session_factory) == 5
+    assert service.stats()["replayed"] == 5
+
+
+@pytest.mark.asyncio
+async def test_poison_events_are_quarantined_instead_of_blocking_replay(session_factory, tmp_path):
+    spool = str(tmp_path / "spool")
+    events = [_event(index) for index in range(5)]
+    poison = events[2]
+    with open(spool, "w") as f:
+        f.write("".join(event.model_dump_json() + "\n" for event in events[:3]))
+        f.write("{not json\n")
+        f.write("".join(event.model_dump_json() + "\n" for event in events[3:]))
+    service = BufferedPostgresAuditService(session_factory, spool_path=spool, max_batch=2)
+    service.degraded = True
+    write = service._write
+
+    async def rejecting_write(batch, skip_existing=False):
+        if any(event.id == poison.id for event in batch):
+            raise ValueError("value too long for type")
+        await write(batch, skip_existing)
+
+    service._write = rejecting_write
+    await service.replay()
+
+    assert await _count(session_factory) == 4
+    assert service.stats()["degraded"] is False
+    assert service.stats()["replayed"] == 4
+    assert service.stats()["quarantined"] == 2
+    with open(spool + ".quarantine") as f:
+        quarantined = f.read().splitlines()
+    assert sorted(quarantined) == sorted([poison.model_dump_json(), "{not json"])
+
+
+@pytest.mark.asyncio
+async def test_full_buffer_waits_for_the_flusher(session_factory, tmp_path):
+    service = BufferedPostgresAuditService(
+        session_factory, spool_path=str(tmp_path / "spool"), max_batch=2, max_buffer=2,
+        flush_interval_seconds=60,
+    )
+    await service.log_event(_event())
+    await service.log_event(_event())
+    blocked = asyncio.ensure_future(service.log_event(_event()))
+    await asyncio.sleep(0.01)
+    assert not blocked.done()
+
+    service.start()
+    await asyncio.wait_for(blocked, 1.0)
+    await service.close()
+    assert await _count(session_factory) == 3
+    assert service.stats()["producer_waits"] >= 1
@@ -0,0 +1,104 @@
+import gzip
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.core.entities import AuditLog
+from app.modules.audit import AuditIndex, AuditWriter
+
+START = datetime(2026, 10, 1, tzinfo=timezone.utc)
+
+
+def _event(index, source="web-01", severity="WARNING", result="EXECUTED"):
+    return AuditLog(
+        component="Orchestrator",
+        event="AlertProcessed",
+        timestamp=START + timedelta(minutes=index),
+        details={"alert": {"source": source, "severity": severity, "message": f"m{index}"}, "result": result},
+    )
+
+
+def _minutes(page):
+    return [int(entry["details"]["alert"]["message"][1:]) for entry in page.entries]
+
+
+@pytest.mark.asyncio
+async def test_written_batches_are_indexed_and_filtered(tmp_path):
+    index = AuditIndex(str(tmp_path / "index.db"))
+    writer = AuditWriter(file_path=str(tmp_path / "audit.log"), on_committed=index.add)
+    index.start()
+    for minute in range(60):
+        source = "db-01" if minute % 3 == 0 else "web-01"
+        severity = "CRITICAL" if minute % 2 == 0 else "WARNING"
+        await writer.log_event(_event(minute, source=source, severity=severity))
+    await writer.close()
+    await index.close()
+
+    assert index.stats()["indexed"] == 60
+    page = index.query(source="db-01", severity="CRITICAL", limit=100)
+    assert _minutes(page) == list(range(54, -1, -6))
+    page = index.query(since=START + timedelta(minutes=10), until=START + timedelta(minutes=20))
+    assert _minutes(page) == list(range(19, 9, -1))
+    assert index.query(result="BLOCKED").entries == []
+
+
+@pytest.mark.asyncio
+async def test_cursor_pages_do_not_overlap_or_skip(tmp_path):
+    index = AuditIndex(str(tmp_path / "index.db"))
+    index.add([_event(minute // 2) for minute in range(25)])  # Pairs share a timestamp.
+    await index.flush()
+
+    seen, cursor = [], None
+    while True:
+        page = index.query(limit=4, cursor=cursor)
+        seen += [entry["id"] for entry in page.entries]
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+    assert len(seen) == len(set(seen)) == 25
+    with pytest.raises(ValueError):
+        index.query(cursor="garbage")
+
+
+def test_catch_up_imports_segments_and_resumes(tmp_path):
+    path = str(tmp_path / "audit.log")
+    with gzip.open(path + ".20261001T000000000000Z.gz", "wt") as f:
+        f.write("".join(_event(minute).model_dump_json() + "\n" for minute in range(10)))
+    with open(path, "w") as f:
+        f.write("".join(_event(minute).model_dump_json() + "\n" for minute in range(10, 15)))
+        f.write('{"id": "partial')
+    with open(path + ".idx", "w") as f:
+        f.write("# 1\n")  # The /audit sidecar is not a segment.
+
+    index = AuditIndex(str(tmp_path / "index.db"))
+    assert index.catch_up(path) == 15
+    with open(path, "a") as f:
+        f.write('"}\n' + _event(15).model_dump_json() + "\n")
+    assert index.catch_up(path) == 1  # Only the appended event; the broken line is skipped.
+    assert _minutes(index.query(limit=3)) == [15, 14, 13]
+
+
+
+@pytest.mark.asyncio
+async def test_dropped_and_failed_events_are_recovered_from_the_file(tmp_path):
+    path = str(tmp_path / "audit.log")
+    events = [_event(minute) for minute in range(10)]
+    with open(path, "w") as f:
+        f.write("".join(event.model_dump_json() + "\n" for event in events))
+    index = AuditIndex(str(tmp_path / "index.db"), catch_up_path=path, max_pending=4, flush_interval_seconds=0.01)
+    index.catch_up(path)  # Progress now covers the whole file.
+    insert = index.insert
+    index.insert = lambda rows: (_ for _ in ()).throw(OSError("disk full"))
+
+    index.add(events[:6])  # Over max_pending: the two oldest are dropped.
+    assert await index.flush() is False  # Failed batch is queued again, not lost.
+    assert index.stats()["pending"] == 4 and index.stats()["dropped"] == 2
+
+    index.insert = insert
+    with index._writer:
+        index._writer.execute("DELETE FROM events")
+    index.start()
+    await index.close()
+
+    assert index.stats()["pending"] == 0
+    assert _minutes(index.query(limit=20)) == list(range(9, -1, -1))  # Resync re-read the file.
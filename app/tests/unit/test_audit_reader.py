@@ -0,0 +1,78 @@
+import os
+from datetime import datetime, timedelta, timezone
+
+from app.core.entities import AuditLog
+from app.modules.audit import AuditLogReader
+
+START = datetime(2026, 10, 17, tzinfo=timezone.utc)
+
+
+def _write(path, first, count, mode="a"):
+    with open(path, mode) as f:
+        for index in range(first, first + count):
+            event = AuditLog(
+                component="Test", event="E", details={"i": index}, timestamp=START + timedelta(seconds=index)
+            )
+            f.write(event.model_dump_json() + "\n")
+
+
+def _indices(page):
+    return [entry["details"]["i"] for entry in page.entries]
+
+
+def test_pages_walk_backwards_with_the_cursor(tmp_path):
+    path = str(tmp_path / "audit.log")
+    _write(path, 0, 120)
+    reader = AuditLogReader(path, block_size=256)  # Several blocks per page.
+
+    page = reader.page(limit=50)
+    assert _indices(page) == list(range(119, 69, -1))
+    page = reader.page(limit=50, before=str(page.older))
+    assert _indices(page) == list(range(69, 19, -1))
+    page = reader.page(limit=50, before=str(page.older))
+    assert _indices(page) == list(range(19, -1, -1))
+    assert page.older is None
+
+
+def test_partial_trailing_line_is_skipped(tmp_path):
+    path = str(tmp_path / "audit.log")
+    _write(path, 0, 3)
+    with open(path, "a") as f:
+        f.write('{"id": "half-writ')
+    assert _indices(AuditLogReader(path).page(limit=10)) == [2, 1, 0]
+    assert AuditLogReader(str(tmp_path / "missing.log")).page().entries == []
+
+
+def test_time_jump_uses_the_sidecar_index(tmp_path):
+    path = str(tmp_path / "audit.log")
+    _write(path, 0, 1000)
+    reader = AuditLogReader(path, index_every=100)
+
+    page = reader.page(limit=5, before=(START + timedelta(seconds=450.5)).isoformat())
+    assert _indices(page) == [450, 449, 448, 447, 446]
+    with open(path + ".idx") as f:
+        assert len(f.read().splitlines()) == 1 + 10  # Header and one checkpoint per 100 lines.
+
+    # Appended lines are indexed incrementally, and a new reader resumes from the sidecar.
+    _write(path, 1000, 500)
+    page = reader.page(limit=2, before=(START + timedelta(seconds=1300)).isoformat())
+    assert _indices(page) == [1299, 1298]
+    resumed = AuditLogReader(path, index_every=100)
+    assert _indices(resumed.page(limit=1, before=(START + timedelta(seconds=1450)).isoformat())) == [1449]
+    with open(path + ".idx") as f:
+        assert len(f.read().splitlines()) == 1 + 15
+
+
+def test_rotated_file_gets_a_fresh_index(tmp_path):
+    path = str(tmp_path / "audit.log")
+    _write(path, 0, 300)
+    reader = AuditLogReader(path, index_every=100)
+    reader.page(limit=1, before=START.isoformat())
+
+    os.replace(path, path + ".20261017T000000Z")
+    _write(path, 500, 50)
+    page = reader.page(limit=3, before=(START + timedelta(seconds=520)).isoformat())
+    assert _indices(page) == [519, 518, 517]
+    with open(path + ".idx") as f:
+        assert f.readline().split() == ["#", str(os.stat(path).st_ino)]
+        assert [line.split()[0] for line in f] == ["0"]
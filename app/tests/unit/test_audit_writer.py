@@ -0,0 +1,71 @@
+import asyncio
+import glob
+import gzip
+import json
+
+import pytest
+
+from app.core.entities import AuditLog
+from app.modules.audit import AuditWriter
+
+
+def _read_all(path):
+    """Every event in rotated (gzip) segments, oldest first, then the active file."""
+    lines = []
+    for segment in sorted(glob.glob(path + ".*.gz")):
+        with gzip.open(segment, "rt") as f:
+            lines.extend(f.read().splitlines())
+    with open(path) as f:
+        lines.extend(f.read().splitlines())
+    return [json.loads(line) for line in lines]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_events_are_group_committed_in_order(tmp_path):
+    path = str(tmp_path / "audit.log")
+    writer = AuditWriter(file_path=path, max_batch=50, fsync="batch")
+
+    async def produce(worker):
+        for index in range(100):
+            await writer.log_event(AuditLog(component=f"w{worker}", event="E", details={"i": index}))
+
+    await asyncio.gather(*(produce(worker) for worker in range(4)))
+    await writer.close()
+
+    events = _read_all(path)
+    assert len(events) == 400
+    for worker in range(4):
+        assert [e["details"]["i"] for e in events if e["component"] == f"w{worker}"] == list(range(100))
+    stats = writer.stats()
+    assert stats["commits"] < 400 and stats["avg_events_per_commit"] > 1
+    assert stats["fsyncs"] >= stats["commits"]
+
+
+@pytest.mark.asyncio
+async def test_rotates_by_size_and_compresses_closed_segments(tmp_path):
+    path = str(tmp_path / "audit.log")
+    writer = AuditWriter(file_path=path, max_batch=10, rotate_bytes=2000, fsync="none")
+    for index in range(100):
+        await writer.log_event(AuditLog(component="c", event="E", details={"i": index}))
+    await writer.close()
+
+    assert writer.stats()["rotations"] >= 2
+    assert not [p for p in glob.glob(path + ".*") if not p.endswith(".gz")]
+    assert [e["details"]["i"] for e in _read_all(path)] == list(range(100))
+
+
+@pytest.mark.asyncio
+async def test_leftover_uncompressed_segment_is_compressed_on_start(tmp_path):
+    path = str(tmp_path / "audit.log")
+    with open(path + ".20260101T000000000000Z", "w") as f:
+        f.write('{"event": "old"}\n')
+    writer = AuditWriter(file_path=path)
+    writer.start()
+    await writer.close()
+
+    assert glob.glob(path + ".*") == [path + ".20260101T000000000000Z.gz"]
+
+
+def test_rejects_unknown_fsync_policy(tmp_path):
+    with pytest.raises(ValueError):
+        AuditWriter(file_path=str(tmp_path / "audit.log"), fsync="sometimes")
@@ -0,0 +1,68 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import app.main as main
+from app.modules.ingestion.batch import iter_ndjson, validate_alerts
+from app.modules.ingestion.queue import AlertQueue
+
+
+def _item(**overrides):
+    item = {"source": "web-01", "severity": "CRITICAL", "message": "High CPU"}
+    item.update(overrides)
+    return item
+
+
+def test_validate_alerts_reports_bad_items_by_index():
+    valid, invalid = validate_alerts([_item(), _item(severity="BOGUS"), _item()])
+
+    assert [index for index, _ in valid] == [0, 2]
+    assert len(invalid) == 1
+    assert invalid[0].index == 1
+    assert "severity" in invalid[0].error
+
+
+@pytest.mark.asyncio
+async def test_iter_ndjson_handles_split_chunks_and_bad_lines():
+    async def chunks():
+        yield b'{"a": 1}\n{"a"'
+        yield b': 2}\n\nnot json\n'
+        yield b'{"a": 3}'
+
+    parsed = [item async for item in iter_ndjson(chunks())]
+
+    assert [(i, obj) for i, obj, err in parsed if err is None] == [
+        (0, {"a": 1}),
+        (1, {"a": 2}),
+        (3, {"a": 3}),
+    ]
+    assert parsed[2][0] == 2 and parsed[2][2].startswith("invalid JSON")
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(main, "alert_queue", AlertQueue(maxsize=100))
+    return TestClient(main.app)
+
+
+def test_batch_endpoint_returns_per_item_ids_and_errors(client):
+    response = client.post("/alerts/batch", json=[_item(), {"source": "x"}, _item(id="abc")])
+
+    body = response.json()
+    assert response.status_code == 200
+    assert body["queued"] == 2 and body["invalid"] == 1
+    assert body["items"][1]["status"] == "invalid"
+    assert body["items"][2]["alert_id"] == "abc"
+    assert main.alert_queue.qsize() == 2
+
+
+def test_stream_endpoint_enqueues_ndjson(client):
+    lines = b"\n".join([b'{"source": "a", "severity": "INFO", "message": "m"}'] * 3 + [b"{bad"])
+
+    response = client.post(
+        "/alerts/stream", content=lines, headers={"Content-Type": "application/x-ndjson"}
+    )
+
+    body = response.json()
+    assert body["queued"] == 3
+    assert body["items"][3]["status"] == "invalid"
+    assert main.alert_queue.qsize() == 3
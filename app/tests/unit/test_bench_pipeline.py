@@ -0,0 +1,27 @@
+"""Smoke test for the end-to-end pipeline benchmark (SQLite + fake LLM, no network)."""
+import pytest
+
+from app.bench.pipeline import build_parser, percentiles, run
+
+
+def test_percentiles_in_milliseconds():
+    result = percentiles([0.001 * i for i in range(1, 101)])
+
+    assert result["count"] == 100
+    assert result["p50"] == pytest.approx(51.0)
+    assert result["p99"] == pytest.approx(100.0)
+
+
+@pytest.mark.asyncio
+async def test_pipeline_benchmark_reports_every_stage():
+    args = build_parser().parse_args(
+        ["--alerts", "20", "--workers", "4", "--llm-median-ms", "1", "--history-per-source", "2"]
+    )
+
+    result = await run(args)
+
+    assert result["alerts"] == 20
+    assert result["alerts_per_sec"] > 0
+    assert set(result["latency_ms"]["stages"]) == {"context", "analyze", "policy", "action", "audit"}
+    assert result["latency_ms"]["end_to_end"]["count"] == 20
+    assert result["memory"]["rss_high_water_mb"] > 0
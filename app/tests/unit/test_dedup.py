@@ -0,0 +1,115 @@
+import pytest
+
+from app.core.entities import Alert, AlertSeverity
+from app.core.fingerprint import alert_fingerprint
+from app.modules.ingestion.dedup import AlertDeduplicator
+from app.modules.pipeline.orchestrator import AlertPipeline
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _cpu_alert(cpu: int = 95, source: str = "web-01") -> Alert:
+    return Alert(
+        source=source,
+        severity=AlertSeverity.CRITICAL,
+        message="High  CPU usage",
+        metadata={"cpu_usage": cpu, "component": "cpu"},
+    )
+
+
+def test_fingerprint_ignores_metadata_values_and_whitespace():
+    a = _cpu_alert(95)
+    b = _cpu_alert(97)
+    b.message = "high cpu usage"
+
+    assert alert_fingerprint(a) == alert_fingerprint(b)
+    assert alert_fingerprint(a) != alert_fingerprint(_cpu_alert(source="web-02"))
+
+
+def test_repeats_within_window_are_folded():
+    clock = _Clock()
+    dedup = AlertDeduplicator(window_seconds=60, clock=clock)
+    first = _cpu_alert()
+
+    assert dedup.observe(first).is_duplicate is False
+    for i in range(4):
+        clock.now += 5
+        decision = dedup.observe(_cpu_alert())
+        assert decision.is_duplicate is True
+        assert decision.first_alert_id == first.id
+    assert decision.occurrences == 5
+    assert dedup.stats()["suppressed"] == 4
+
+
+def test_window_rollover_passes_one_alert_with_occurrence_count():
+    clock = _Clock()
+    dedup = AlertDeduplicator(window_seconds=60, clock=clock)
+    dedup.observe(_cpu_alert())
+    clock.now = 30
+    dedup.observe(_cpu_alert())
+    clock.now = 61
+    nxt = _cpu_alert()
+
+    assert dedup.observe(nxt).is_duplicate is False
+    assert nxt.occurrences == 2
+
+
+def test_idle_fingerprints_are_pruned():
+    clock = _Clock()
+    dedup = AlertDeduplicator(window_seconds=10, clock=clock)
+    dedup.observe(_cpu_alert(source="a"))
+    clock.now = 20
+    dedup.observe(_cpu_alert(source="b"))
+
+    assert dedup.stats()["active_fingerprints"] == 1
+
+
+def test_folded_count_is_reported_when_flapping_stops():
+    clock = _Clock()
+    dedup = AlertDeduplicator(window_seconds=60, clock=clock)
+    first = _cpu_alert()
+    dedup.observe(first)
+    for _ in range(3):
+        clock.now += 5
+        dedup.observe(_cpu_alert())
+    dedup.observe(_cpu_alert(source="quiet"))  # Never repeats: nothing to report.
+
+    assert dedup.expire() == []  # Window still open.
+    clock.now += 61
+    [expired] = dedup.expire()
+
+    assert expired.first_alert_id == first.id
+    assert expired.occurrences == 4
+    assert expired.source == "web-01"
+    assert dedup.expire() == []
+    assert dedup.stats()["expired_repeats"] == 1
+
+
+class _Audit:
+    def __init__(self):
+        self.events = []
+
+    async def log_event(self, log):
+        self.events.append(log)
+
+
+@pytest.mark.asyncio
+async def test_pipeline_audits_open_windows_at_shutdown():
+    dedup = AlertDeduplicator(window_seconds=60, clock=_Clock())
+    audit = _Audit()
+    pipeline = AlertPipeline(None, None, None, None, audit, deduplicator=dedup, instrument=False)
+    dedup.observe(_cpu_alert())
+    dedup.observe(_cpu_alert())
+
+    assert await pipeline.report_expired_repeats() == 0
+    assert await pipeline.report_expired_repeats(everything=True) == 1
+    [event] = audit.events
+    assert event.event == "AlertRepeatsExpired"
+    assert event.details["occurrences"] == 2
+    assert event.details["alert"]["source"] == "web-01"
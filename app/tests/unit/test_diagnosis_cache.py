@@ -0,0 +1,104 @@
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from app.core.entities import ActionType, Alert, AlertSeverity, Diagnosis, EnrichedContext
+from app.modules.analysis.cache import DiagnosisCache, diagnosis_cache_key
+from app.modules.analysis.llm_analyzer import LLMAnalyzer
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _context(cpu: int = 95) -> EnrichedContext:
+    alert = Alert(
+        source="web-01",
+        severity=AlertSeverity.CRITICAL,
+        message="High CPU usage",
+        metadata={"cpu_usage": cpu},
+    )
+    return EnrichedContext(alert=alert)
+
+
+def _diagnosis(alert_id: str, root_cause: str = "CPU saturation") -> Diagnosis:
+    return Diagnosis(
+        alert_id=alert_id,
+        root_cause=root_cause,
+        confidence=0.9,
+        suggested_actions=[ActionType.SCALE_UP],
+    )
+
+
+def test_key_is_stable_for_recurring_alerts():
+    assert diagnosis_cache_key(_context(95)) == diagnosis_cache_key(_context(97))
+
+
+def test_hit_returns_copy_with_callers_alert_id():
+    cache = DiagnosisCache()
+    cache.put("k", _diagnosis("first"))
+
+    hit = cache.get("k", "second")
+
+    assert hit.alert_id == "second"
+    assert hit.root_cause == "CPU saturation"
+    assert cache.get("k", "third").alert_id == "third"
+    assert cache.stats()["hits"] == 2
+
+
+def test_ttl_and_lru_eviction():
+    clock = _Clock()
+    cache = DiagnosisCache(max_entries=2, ttl_seconds=10, clock=clock)
+    cache.put("a", _diagnosis("a"))
+    cache.put("b", _diagnosis("b"))
+    cache.get("a", "x")          # "a" becomes most recently used
+    cache.put("c", _diagnosis("c"))
+
+    assert cache.get("b", "x") is None
+    assert cache.stats()["evictions"] == 1
+    clock.now += 11
+    assert cache.get("a", "x") is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_byte_budget_evicts_oldest():
+    one_entry = len(_diagnosis("a").model_dump_json())
+    cache = DiagnosisCache(max_bytes=one_entry * 2 + 1)
+    for key in "abc":
+        cache.put(key, _diagnosis(key))
+
+    assert len(cache) == 2
+    assert cache.stats()["bytes"] <= one_entry * 2 + 1
+
+
+def test_persist_round_trip(tmp_path):
+    path = str(tmp_path / "cache.json")
+    cache = DiagnosisCache(persist_path=path)
+    cache.put("k", _diagnosis("a"))
+    cache.save()
+
+    restored = DiagnosisCache(persist_path=path)
+    assert restored.load() == 1
+    assert restored.get("k", "b").root_cause == "CPU saturation"
+
+
+@pytest.mark.asyncio
+async def test_llm_analyzer_serves_recurring_alert_from_cache():
+    analyzer = LLMAnalyzer(
+        api_key="test-key-not-real",
+        model="claude-sonnet-4-6",
+        fallback_analyzer=AsyncMock(),
+        cache=DiagnosisCache(),
+    )
+    first, second = _context(95), _context(96)
+    llm = AsyncMock(return_value=_diagnosis(first.alert.id))
+
+    with patch.object(analyzer, "_call_llm", llm):
+        await analyzer.analyze(first)
+        result = await analyzer.analyze(second)
+
+    assert llm.await_count == 1
+    assert result.alert_id == second.alert.id
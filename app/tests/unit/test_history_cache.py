@@ -0,0 +1,126 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.entities import Alert, AlertSeverity, Incident
+from app.infrastructure.database.models import Base
+from app.infrastructure.database.repositories import IncidentRepository
+from app.modules.context import ContextBuilderService, HistoryCache
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class _Loader:
+    def __init__(self, delay=0.0):
+        self.calls = 0
+        self.delay = delay
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        incident = Incident(alert_id=str(self.calls), source="web-01", severity=AlertSeverity.CRITICAL, message="m")
+        return [incident], []
+
+
+@pytest.mark.asyncio
+async def test_read_through_with_ttl_and_single_flight():
+    clock = _Clock()
+    cache = HistoryCache(ttl_seconds=5, clock=clock)
+    loader = _Loader(delay=0.01)
+
+    results = await asyncio.gather(*(cache.source_history("web-01", loader) for _ in range(10)))
+    await cache.source_history("web-01", loader)
+
+    assert loader.calls == 1
+    assert all(r is results[0] for r in results)
+    assert cache.stats()["coalesced"] == 9 and cache.stats()["hits"] == 1
+
+    clock.now = 6
+    await cache.source_history("web-01", loader)
+    assert loader.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_writes_invalidate_only_their_source_and_severity():
+    cache = HistoryCache()
+    loader = _Loader()
+    for source in ("web-01", "db-01"):
+        await cache.source_history(source, loader)
+    for severity in (AlertSeverity.INFO, AlertSeverity.CRITICAL):
+        await cache.severity_history(severity, loader)
+
+    cache.invalidate_incident("web-01", AlertSeverity.CRITICAL)
+    assert cache.stats()["entries"] == 2  # db-01 and INFO are untouched.
+
+    cache.invalidate_source("db-01")
+    assert cache.stats()["entries"] == 1
+
+
+@pytest.mark.asyncio
+async def test_load_straddling_a_write_is_not_stored_but_others_are():
+    cache = HistoryCache()
+    loader = _Loader(delay=0.02)
+
+    pending = asyncio.ensure_future(cache.source_history("web-01", loader))
+    unrelated = asyncio.ensure_future(cache.source_history("db-01", loader))
+    await asyncio.sleep(0)
+    cache.invalidate_source("web-01")
+    await cache.source_history("web-01", loader)  # Must not join the stale load.
+    await pending
+    await unrelated
+
+    assert loader.calls == 3
+    await cache.source_history("db-01", loader)
+    assert loader.calls == 3  # The unrelated load was stored.
+
+
+@pytest.mark.asyncio
+async def test_builder_reads_history_through_cache(monkeypatch):
+    builder = ContextBuilderService(session_factory=object(), history_cache=HistoryCache())
+    loader = _Loader()
+
+    async def by_severity():
+        return (await loader())[0]
+
+    monkeypatch.setattr(builder, "_load_source_history", lambda source: loader())
+    monkeypatch.setattr(builder, "_load_severity_history", lambda severity: by_severity())
+
+    for _ in range(5):
+        context = await builder.build(Alert(source="web-01", severity=AlertSeverity.CRITICAL, message="m"))
+
+    assert loader.calls == 2  # One load per key.
+    assert len(context.recent_similar_incidents) == 2
+
+
+@pytest.mark.asyncio
+async def test_cached_halves_match_the_union_query():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    now = datetime.now(timezone.utc)
+    async with session_factory() as session:
+        repo = IncidentRepository(session)
+        for minute in range(30):
+            await repo.save(Incident(
+                alert_id="a", source=f"web-{minute % 3:02d}", message="m",
+                severity=[AlertSeverity.INFO, AlertSeverity.CRITICAL][minute % 2],
+                created_at=now - timedelta(minutes=minute),
+            ))
+        await session.commit()
+
+    alert = Alert(source="web-01", severity=AlertSeverity.CRITICAL, message="m")
+    direct = await ContextBuilderService(session_factory).build(alert)
+    cached = await ContextBuilderService(session_factory, history_cache=HistoryCache()).build(alert)
+
+    assert [i.id for i in cached.recent_similar_incidents] == [i.id for i in direct.recent_similar_incidents]
+    assert len(direct.recent_similar_incidents) == 10
+    await engine.dispose()
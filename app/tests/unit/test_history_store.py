@@ -0,0 +1,94 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.entities import ActionType, AlertSeverity, Diagnosis, Incident, RemediationPlan, RiskLevel
+from app.infrastructure.database.models import Base
+from app.infrastructure.database.repositories import IncidentRepository, PlanRepository
+from app.modules.context import IncidentHistoryStore
+
+_NOW = datetime(2026, 1, 2, tzinfo=timezone.utc)
+
+
+def _incident(source, severity, minutes_ago):
+    return Incident(
+        alert_id="a", source=source, severity=severity, message="m",
+        created_at=_NOW - timedelta(minutes=minutes_ago),
+    )
+
+
+def _plan(status="EXECUTED"):
+    diagnosis = Diagnosis(alert_id="a", root_cause="r", confidence=1.0, suggested_actions=[])
+    return RemediationPlan(
+        diagnosis=diagnosis, action_type=ActionType.RESTART_SERVICE,
+        risk_level=RiskLevel.SAFE, requires_approval=False, status=status,
+    )
+
+
+def test_recent_similar_merges_source_and_severity_newest_first():
+    store = IncidentHistoryStore(bucket_seconds=600, now=lambda: _NOW)
+    web_crit = _incident("web-01", AlertSeverity.CRITICAL, 5)
+    db_crit = _incident("db-01", AlertSeverity.CRITICAL, 1)
+    web_info = _incident("web-01", AlertSeverity.INFO, 30)
+    late = _incident("web-01", AlertSeverity.INFO, 200)  # Arrives out of order.
+    stale = _incident("web-01", AlertSeverity.CRITICAL, 25 * 60)
+    unrelated = _incident("db-02", AlertSeverity.INFO, 2)
+    for incident in (web_crit, db_crit, web_info, unrelated, late, stale):
+        store.record_incident(incident)
+
+    result = store.get_recent_similar("web-01", AlertSeverity.CRITICAL, limit=10)
+
+    assert [i.id for i in result] == [db_crit.id, web_crit.id, web_info.id, late.id]
+    assert store.get_recent_similar("web-01", AlertSeverity.CRITICAL, limit=2) == result[:2]
+
+
+def test_memory_is_bounded_per_key_and_by_source_count():
+    store = IncidentHistoryStore(max_per_key=3, max_sources=2, now=lambda: _NOW)
+    for minutes in range(10):
+        store.record_incident(_incident("web-01", AlertSeverity.INFO, minutes))
+    store.record_incident(_incident("web-02", AlertSeverity.FATAL, 0))
+    store.record_incident(_incident("web-03", AlertSeverity.FATAL, 0))
+
+    stats = store.stats()
+    assert stats["incidents_by_severity"]["INFO"] == 3
+    assert stats["sources"] == 2
+    assert [i.created_at for i in store.get_recent_similar("web-01", AlertSeverity.INFO)] == [
+        _NOW - timedelta(minutes=m) for m in range(3)
+    ]
+
+    store.record_plan("web-01", _plan("FAILED"))
+    store.record_plan("web-01", _plan())
+    assert len(store.get_past_executed_for_source("web-01")) == 1
+
+
+@pytest.mark.asyncio
+async def test_warm_from_database_and_verify():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    now = datetime.now(timezone.utc)
+    async with session_factory() as session:
+        for minutes, source in enumerate(["web-01", "web-02", "web-01"]):
+            incident = Incident(
+                alert_id="a", source=source, severity=AlertSeverity.CRITICAL, message="m",
+                created_at=now - timedelta(minutes=minutes),
+            )
+            await IncidentRepository(session).save(incident)
+            await PlanRepository(session).save(_plan(), incident_id=incident.id)
+        await session.commit()
+
+    store = IncidentHistoryStore()
+    await store.warm_from(session_factory)
+
+    assert store.warm
+    assert len(store.get_recent_similar("web-01", AlertSeverity.CRITICAL)) == 3
+    assert await store.verify(session_factory, "web-01", AlertSeverity.CRITICAL)
+
+    store.record_incident(
+        Incident(alert_id="b", source="web-01", severity=AlertSeverity.INFO, message="memory only")
+    )
+    assert not await store.verify(session_factory, "web-01", AlertSeverity.INFO)
+    assert store.stats()["mismatches"] == 1
+    await engine.dispose()
@@ -0,0 +1,88 @@
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.bench.incident_query import build_parser, legacy_recent_similar_query, run
+from app.core.entities import ActionType, AlertSeverity, Diagnosis, Incident, RemediationPlan, RiskLevel
+from app.infrastructure.database.models import Base
+from app.infrastructure.database.repositories import IncidentRepository, PlanRepository, recent_similar_query
+
+_NOW = datetime.now(timezone.utc)
+
+
+@pytest.mark.asyncio
+async def test_union_query_matches_or_query():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    rng = random.Random(7)
+    async with session_factory() as session:
+        repo = IncidentRepository(session)
+        for i in range(300):
+            await repo.save(
+                Incident(
+                    alert_id="a",
+                    source=f"svc-{rng.randrange(5)}",
+                    severity=rng.choice(list(AlertSeverity)),
+                    message="m",
+                    # Distinct timestamps so the top-N is unambiguous; some fall outside 24 h.
+                    created_at=_NOW - timedelta(minutes=i * 7),
+                )
+            )
+        await session.commit()
+
+        cutoff = _NOW - timedelta(hours=24)
+        for source in ("svc-0", "svc-3", "missing"):
+            for severity in AlertSeverity:
+                for limit in (1, 10, 50):
+                    legacy = await session.execute(
+                        legacy_recent_similar_query(source, severity, cutoff, limit)
+                    )
+                    union = await session.execute(recent_similar_query(source, severity, cutoff, limit))
+                    assert [row.id for row in union] == [m.id for m in legacy.scalars()]
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_incident_query_benchmark_reports_both_phases():
+    args = build_parser().parse_args(["--rows", "2000", "--sources", "20", "--queries", "10"])
+
+    result = await run(args)
+
+    assert result["latency_ms"]["before"]["count"] == 10
+    assert result["latency_ms"]["after"]["count"] == 10
+    assert result["result_mismatches"] == 0
+    assert any("ix_incidents_source_created_at" in line for line in result["plans"]["after"])
+
+
+@pytest.mark.asyncio
+async def test_history_reads_project_only_context_columns():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    async with session_factory() as session:
+        incident = await IncidentRepository(session).save(
+            Incident(alert_id="a", source="web-01", severity=AlertSeverity.CRITICAL,
+                     message="m", metadata={"region": "eu"}, status="CLOSED")
+        )
+        diagnosis = Diagnosis(alert_id="a", root_cause="pool exhausted", confidence=0.7, suggested_actions=[])
+        plan = RemediationPlan(diagnosis=diagnosis, action_type=ActionType.RESTART_SERVICE,
+                               risk_level=RiskLevel.MODERATE, requires_approval=False, status="EXECUTED")
+        await PlanRepository(session).save(plan, incident_id=incident.id)
+        await session.commit()
+
+        [recent] = await IncidentRepository(session).get_recent_similar("web-01", AlertSeverity.INFO)
+        [past] = await PlanRepository(session).get_past_executed_for_source("web-01")
+        [(source, latest)] = await PlanRepository(session).get_executed_with_source()
+        full = await IncidentRepository(session).get_by_id(incident.id)
+
+    assert recent.model_dump(exclude={"metadata"}) == full.model_dump(exclude={"metadata"})
+    assert recent.metadata == {} and full.metadata == {"region": "eu"}
+    assert past.id == plan.id and past.diagnosis.root_cause == "pool exhausted"
+    assert past.action_type is ActionType.RESTART_SERVICE and past.risk_level is RiskLevel.MODERATE
+    assert (source, latest.id) == ("web-01", plan.id)
+    await engine.dispose()
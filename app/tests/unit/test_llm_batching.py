@@ -0,0 +1,106 @@
+"""Tests for micro-batched LLM analysis (no network: FakeChatModel stand-in)."""
+import asyncio
+
+import pytest
+from langchain_core.messages import AIMessage
+
+from app.bench.fakes import FakeChatModel, LatencyModel
+from app.core.entities import Alert, AlertSeverity, EnrichedContext
+from app.modules.analysis import LLMAnalyzer, RuleBasedAnalyzer
+from app.modules.analysis.batching import MicroBatcher
+
+
+def _context(source: str, message: str = "High CPU usage") -> EnrichedContext:
+    return EnrichedContext(
+        alert=Alert(source=source, severity=AlertSeverity.CRITICAL, message=message)
+    )
+
+
+@pytest.mark.asyncio
+async def test_micro_batcher_flushes_on_size_and_window():
+    batches = []
+
+    async def handler(items):
+        batches.append(list(items))
+        return [item * 10 for item in items]
+
+    batcher = MicroBatcher(handler, window_seconds=0.02, max_batch_size=3)
+    results = await asyncio.gather(*(batcher.submit(i) for i in range(5)))
+
+    assert results == [0, 10, 20, 30, 40]
+    assert [len(b) for b in batches] == [3, 2]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_batch_cancels_its_waiting_callers():
+    started = asyncio.Event()
+
+    async def handler(items):
+        started.set()
+        await asyncio.Event().wait()
+
+    batcher = MicroBatcher(handler, window_seconds=60, max_batch_size=2)
+    callers = [asyncio.ensure_future(batcher.submit(i)) for i in range(2)]
+    await started.wait()
+    for task in list(batcher._running):
+        task.cancel()
+
+    results = await asyncio.wait_for(asyncio.gather(*callers, return_exceptions=True), timeout=1)
+    assert all(isinstance(result, asyncio.CancelledError) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_analyzer_batches_alerts_into_one_call():
+    fake = FakeChatModel(latency=LatencyModel(median_ms=0))
+    analyzer = LLMAnalyzer(
+        api_key="test",
+        model="test",
+        fallback_analyzer=RuleBasedAnalyzer(),
+        batch_window_seconds=0.02,
+        batch_max_size=4,
+        llm=fake,
+    )
+    contexts = [_context(f"web-{i}", f"msg {i}") for i in range(4)]
+
+    results = await asyncio.gather(*(analyzer.analyze(c) for c in contexts))
+
+    assert fake.calls == 1
+    assert [r.alert_id for r in results] == [c.alert.id for c in contexts]
+    assert results[2].root_cause == "Fake diagnosis for: msg 2"
+
+
+class _PartiallyInvalidBatchModel:
+    """Returns a batch where item 1 has an out-of-range confidence."""
+
+    def with_structured_output(self, schema, include_raw=False):
+        return self
+
+    async def ainvoke(self, messages):
+        item = {
+            "root_cause": "LLM cause",
+            "confidence": 0.5,
+            "alternative_hypotheses": [],
+            "reasoning_trace": "",
+            "suggested_actions": ["NOTIFICATION"],
+        }
+        args = {"diagnoses": [dict(item, alert_index=0), dict(item, alert_index=1, confidence=7)]}
+        raw = AIMessage(content="", tool_calls=[{"name": "x", "args": args, "id": "1"}])
+        return {"raw": raw, "parsed": None, "parsing_error": ValueError("bad item")}
+
+
+@pytest.mark.asyncio
+async def test_invalid_batch_item_falls_back_individually():
+    analyzer = LLMAnalyzer(
+        api_key="test",
+        model="test",
+        fallback_analyzer=RuleBasedAnalyzer(),
+        batch_window_seconds=0.02,
+        batch_max_size=2,
+        llm=_PartiallyInvalidBatchModel(),
+    )
+    ok, bad = _context("web-1"), _context("web-2")
+
+    results = await asyncio.gather(analyzer.analyze(ok), analyzer.analyze(bad))
+
+    assert results[0].root_cause == "LLM cause"
+    assert results[1].root_cause.startswith("CPU saturation")  # Rule engine fallback.
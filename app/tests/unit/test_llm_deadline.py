@@ -0,0 +1,77 @@
+"""Tests for the deadline-bounded race between the LLM and the rule engine."""
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from app.core.entities import ActionType, Alert, AlertSeverity, Diagnosis, EnrichedContext
+from app.modules.analysis import LLMAnalyzer, RuleBasedAnalyzer
+
+
+def _context(severity: AlertSeverity = AlertSeverity.FATAL) -> EnrichedContext:
+    return EnrichedContext(
+        alert=Alert(source="inventory-db", severity=severity, message="Database connection refused")
+    )
+
+
+def _llm_answer(delay: float):
+    async def call(context):
+        await asyncio.sleep(delay)
+        return Diagnosis(
+            alert_id=context.alert.id,
+            root_cause="Connection pool exhausted",
+            confidence=0.8,
+            suggested_actions=[ActionType.SCALE_UP],
+            analysis_path="llm",
+        )
+
+    return call
+
+
+def _analyzer(audit=None) -> LLMAnalyzer:
+    return LLMAnalyzer(
+        api_key="test-key-not-real",
+        model="claude-sonnet-4-6",
+        fallback_analyzer=RuleBasedAnalyzer(),
+        deadlines={"FATAL": 0.05},
+        audit=audit,
+    )
+
+
+@pytest.mark.asyncio
+async def test_llm_within_deadline_wins():
+    analyzer = _analyzer()
+    with patch.object(analyzer, "_call_llm", side_effect=_llm_answer(0.0)):
+        result = await analyzer.analyze(_context())
+
+    assert result.analysis_path == "llm"
+    assert result.root_cause == "Connection pool exhausted"
+
+
+@pytest.mark.asyncio
+async def test_deadline_miss_returns_rule_result_and_audits_late_answer():
+    audit = AsyncMock()
+    analyzer = _analyzer(audit)
+    context = _context()
+
+    with patch.object(analyzer, "_call_llm", side_effect=_llm_answer(0.2)):
+        result = await analyzer.analyze(context)
+        assert result.analysis_path == "rule_deadline"
+        assert result.root_cause.startswith("Database unavailable")
+        audit.log_event.assert_not_awaited()
+        await asyncio.sleep(0.3)
+
+    entry = audit.log_event.await_args.args[0]
+    assert entry.event == "LateLLMDiagnosis"
+    assert entry.details["winner"] == "rule_deadline"
+    assert entry.details["alert_id"] == context.alert.id
+    assert entry.details["llm_diagnosis"]["root_cause"] == "Connection pool exhausted"
+
+
+@pytest.mark.asyncio
+async def test_severity_without_budget_waits_for_llm():
+    analyzer = _analyzer()
+    with patch.object(analyzer, "_call_llm", side_effect=_llm_answer(0.1)):
+        result = await analyzer.analyze(_context(AlertSeverity.INFO))
+
+    assert result.analysis_path == "llm"
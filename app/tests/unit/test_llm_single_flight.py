@@ -0,0 +1,78 @@
+"""Tests for single-flight coalescing of concurrent identical LLM analyses."""
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from app.core.entities import ActionType, Alert, AlertSeverity, Diagnosis, EnrichedContext
+from app.modules.analysis.llm_analyzer import LLMAnalyzer
+
+
+def _context() -> EnrichedContext:
+    return EnrichedContext(
+        alert=Alert(source="db-01", severity=AlertSeverity.FATAL, message="Database connection refused")
+    )
+
+
+def _analyzer(fallback) -> LLMAnalyzer:
+    return LLMAnalyzer(
+        api_key="test-key-not-real",
+        model="claude-sonnet-4-6",
+        fallback_analyzer=fallback,
+    )
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_alerts_share_one_llm_call():
+    analyzer = _analyzer(AsyncMock())
+    calls = 0
+
+    async def slow_llm(context):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return Diagnosis(
+            alert_id=context.alert.id,
+            root_cause="DB down",
+            confidence=0.8,
+            suggested_actions=[ActionType.MANUAL_INTERVENTION],
+        )
+
+    contexts = [_context() for _ in range(5)]
+    with patch.object(analyzer, "_call_llm", side_effect=slow_llm):
+        results = await asyncio.gather(*(analyzer.analyze(c) for c in contexts))
+
+    assert calls == 1
+    assert [r.alert_id for r in results] == [c.alert.id for c in contexts]
+    assert all(r.root_cause == "DB down" for r in results)
+    stats = analyzer.stats()
+    assert stats["inflight"] == 0
+    assert stats["coalesced"] == 4
+
+
+@pytest.mark.asyncio
+async def test_failure_sends_every_waiter_to_its_own_fallback():
+    async def fallback_analyze(context):
+        return Diagnosis(
+            alert_id=context.alert.id,
+            root_cause="Rule fallback",
+            confidence=1.0,
+            suggested_actions=[ActionType.RESTART_SERVICE],
+        )
+
+    fallback = AsyncMock()
+    fallback.analyze.side_effect = fallback_analyze
+    analyzer = _analyzer(fallback)
+
+    async def failing_llm(context):
+        await asyncio.sleep(0.05)
+        raise RuntimeError("API timeout")
+
+    contexts = [_context() for _ in range(3)]
+    with patch.object(analyzer, "_call_llm", side_effect=failing_llm) as llm:
+        results = await asyncio.gather(*(analyzer.analyze(c) for c in contexts))
+
+    assert llm.await_count == 1
+    assert fallback.analyze.await_count == 3
+    assert [r.alert_id for r in results] == [c.alert.id for c in contexts]
+    assert all(r.root_cause == "Rule fallback" for r in results)
@@ -0,0 +1,68 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import app.main as main
+from app.bench.metrics_overhead import _Stubs
+from app.core.entities import Alert, AlertSeverity
+from app.core.metrics import MetricsRegistry
+from app.modules.pipeline import AlertPipeline
+from app.modules.pipeline.orchestrator import STAGE_SECONDS
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    latency = registry.histogram("op_seconds", "Op latency.", ["stage"], buckets=(0.1, 1.0))
+    latency.labels(stage="a").observe(0.05)
+    latency.labels(stage="a").observe(0.1)
+    latency.labels(stage="a").observe(3)
+
+    text = registry.render()
+
+    assert "# TYPE op_seconds histogram" in text
+    assert 'op_seconds_bucket{stage="a",le="0.1"} 2' in text
+    assert 'op_seconds_bucket{stage="a",le="1"} 2' in text
+    assert 'op_seconds_bucket{stage="a",le="+Inf"} 3' in text
+    assert 'op_seconds_count{stage="a"} 3' in text
+
+
+def test_registry_returns_existing_metric_and_rejects_shape_change():
+    registry = MetricsRegistry()
+    first = registry.counter("events_total", "Events.", ["kind"])
+
+    assert registry.counter("events_total", "Events.", ["kind"]) is first
+    with pytest.raises(ValueError):
+        registry.gauge("events_total", "Events.")
+
+
+def test_callback_metric_is_read_at_scrape_time():
+    registry = MetricsRegistry()
+    depth = {"value": 1}
+    registry.callback("depth", "Depth.", "gauge", lambda: depth["value"])
+    registry.callback("by_kind", "By kind.", "counter", lambda: {("x",): 2}, ["kind"])
+    depth["value"] = 7
+
+    text = registry.render()
+
+    assert "depth 7" in text
+    assert 'by_kind{kind="x"} 2' in text
+
+
+@pytest.mark.asyncio
+async def test_pipeline_observes_every_stage():
+    alert = Alert(source="web-01", severity=AlertSeverity.INFO, message="m")
+    stubs = _Stubs(alert)
+    before = STAGE_SECONDS.labels(stage="analyze").count
+
+    await AlertPipeline(stubs, stubs, stubs, stubs, stubs).process(alert)
+    await AlertPipeline(stubs, stubs, stubs, stubs, stubs, instrument=False).process(alert)
+
+    assert STAGE_SECONDS.labels(stage="analyze").count == before + 1
+
+
+def test_metrics_endpoint_serves_prometheus_text():
+    response = TestClient(main.app).get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "# TYPE sentinel_stage_duration_seconds histogram" in response.text
+    assert "sentinel_queue_depth" in response.text
@@ -0,0 +1,79 @@
+"""Tests for severity/source/rule-miss model routing (no network: FakeChatModel per route)."""
+import pytest
+
+from app.bench.fakes import FakeChatModel, LatencyModel
+from app.core.entities import Alert, AlertSeverity, EnrichedContext
+from app.modules.analysis import LLMAnalyzer, RuleBasedAnalyzer
+from app.modules.analysis.routing import ModelRoute, ModelRouter
+
+
+def _context(severity, source="web-01", escalation_reason=None):
+    alert = Alert(source=source, severity=severity, message=f"{severity.value} on {source}")
+    return EnrichedContext(alert=alert, escalation_reason=escalation_reason)
+
+
+def _router():
+    clients = {}
+
+    def factory(route):
+        clients[route.name] = FakeChatModel(latency=LatencyModel(median_ms=0))
+        return clients[route.name]
+
+    router = ModelRouter(
+        routes=[
+            ModelRoute("payments", "large", sources=["payments-*"]),
+            ModelRoute("unknown", "medium", rule_miss=True, severities=["WARNING", "CRITICAL"]),
+            ModelRoute(
+                "bulk", "small", max_tokens=256, severities=["INFO", "WARNING"],
+                input_cost_per_mtok=1.0, output_cost_per_mtok=5.0,
+            ),
+        ],
+        default=ModelRoute("default", "large"),
+        client_factory=factory,
+    )
+    return router, clients
+
+
+def test_first_matching_route_wins():
+    router, _ = _router()
+
+    assert router.route(_context(AlertSeverity.INFO)).name == "bulk"
+    assert router.route(_context(AlertSeverity.INFO, source="payments-api")).name == "payments"
+    assert router.route(_context(AlertSeverity.WARNING, escalation_reason="no_rule_match")).name == "unknown"
+    assert router.route(_context(AlertSeverity.WARNING, escalation_reason="low_confidence")).name == "bulk"
+    assert router.route(_context(AlertSeverity.FATAL)).name == "default"
+
+
+@pytest.mark.asyncio
+async def test_analyzer_uses_pooled_client_per_route_and_tracks_cost():
+    router, clients = _router()
+    analyzer = LLMAnalyzer(
+        api_key="test", model="unused", fallback_analyzer=RuleBasedAnalyzer(), router=router
+    )
+
+    for i in range(3):
+        await analyzer.analyze(_context(AlertSeverity.INFO, source=f"web-{i}"))
+    fatal = await analyzer.analyze(_context(AlertSeverity.FATAL))
+
+    assert fatal.analysis_path == "llm"
+    assert sorted(clients) == ["bulk", "default"]
+    assert clients["bulk"].calls == 3 and clients["default"].calls == 1
+    stats = analyzer.stats()["routes"]
+    assert stats["bulk"]["calls"] == 3 and stats["bulk"]["model"] == "small"
+    assert stats["bulk"]["output_tokens"] == 450
+    assert stats["bulk"]["cost_usd"] > 0
+    assert stats["default"]["cost_usd"] == 0  # No prices configured.
+
+
+def test_route_stats_report_recent_latency_p95(monkeypatch):
+    router, _ = _router()
+    route = router.default
+    now = [100.0]
+    monkeypatch.setattr("app.modules.analysis.routing.time.monotonic", lambda: now[0])
+    for latency in range(1, 101):  # 1..100 seconds, successful.
+        router.record(route, now[0] - latency, ok=True)
+    router.record(route, now[0] - 500, ok=False)  # Failures do not count toward the p95.
+
+    stats = router.stats()["default"]
+    assert stats["latency_p95_seconds"] == 95
+    assert stats["latency_max_seconds"] == 500
@@ -0,0 +1,222 @@
+import asyncio
+import contextlib
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.entities import ActionType, AlertSeverity, Diagnosis, Incident, RemediationPlan, RiskLevel
+from app.infrastructure.database import partitions
+from app.infrastructure.database.models import Base
+from app.infrastructure.database.partitions import (
+    PartitionMaintainer,
+    create_partition_sql,
+    floor_bound,
+    next_bound,
+    parse_partition_bound,
+    partition_name,
+    partition_ranges,
+)
+from app.infrastructure.database.repositories import IncidentRepository, PlanRepository
+
+POSTGRES_URL = os.environ.get("SENTINEL_TEST_POSTGRES_URL")
+requires_postgres = pytest.mark.skipif(
+    not POSTGRES_URL, reason="set SENTINEL_TEST_POSTGRES_URL to a disposable PostgreSQL database"
+)
+
+NOW = datetime(2026, 12, 17, 15, 30, tzinfo=timezone.utc)
+
+
+def test_bounds_roll_over_month_and_year():
+    assert floor_bound(NOW, "month") == datetime(2026, 12, 1, tzinfo=timezone.utc)
+    assert next_bound(floor_bound(NOW, "month"), "month") == datetime(2027, 1, 1, tzinfo=timezone.utc)
+    assert floor_bound(NOW, "day") == datetime(2026, 12, 17, tzinfo=timezone.utc)
+    assert [lower.month for lower, _ in partition_ranges(NOW, NOW + timedelta(days=60), "month")] == [12, 1, 2]
+    with pytest.raises(ValueError):
+        floor_bound(NOW, "week")
+
+
+def test_partition_names_round_trip():
+    month, day = floor_bound(NOW, "month"), floor_bound(NOW, "day")
+    assert partition_name("incidents", month, "month") == "incidents_p202612"
+    assert partition_name("audit_logs", day, "day") == "audit_logs_p20261217"
+    assert create_partition_sql("incidents", month, next_bound(month, "month"), "month") == (
+        "CREATE TABLE IF NOT EXISTS incidents_p202612 PARTITION OF incidents "
+        "FOR VALUES FROM ('2026-12-01T00:00:00+00:00') TO ('2027-01-01T00:00:00+00:00')"
+    )
+
+
+def test_partition_bounds_are_parsed_from_pg_get_expr():
+    bound = parse_partition_bound(
+        "incidents_p202612", "FOR VALUES FROM ('2026-12-01 01:00:00+01') TO ('2027-01-01 01:00:00+01')"
+    )
+    assert (bound.lower, bound.upper) == (
+        datetime(2026, 12, 1, tzinfo=timezone.utc), datetime(2027, 1, 1, tzinfo=timezone.utc)
+    )
+    day = floor_bound(NOW, "day")
+    assert bound.overlaps(day, next_bound(day, "day"))  # A day partition would collide.
+    assert not bound.overlaps(datetime(2027, 1, 1, tzinfo=timezone.utc), datetime(2027, 2, 1, tzinfo=timezone.utc))
+
+    default = parse_partition_bound("incidents_default", "DEFAULT")
+    assert default.is_default and not default.overlaps(day, next_bound(day, "day"))
+    open_ended = parse_partition_bound("incidents_old", "FOR VALUES FROM (MINVALUE) TO ('2020-01-01 00:00:00+00')")
+    assert open_ended.lower is None and open_ended.overlaps(datetime(2000, 1, 1, tzinfo=timezone.utc), NOW)
+    with pytest.raises(ValueError):
+        parse_partition_bound("incidents_x", "FOR VALUES IN ('a')")
+
+
+def test_maintainer_rejects_unknown_interval():
+    with pytest.raises(ValueError):
+        PartitionMaintainer(engine=None, interval="week")
+
+
+class _StubEngine:
+    """Just enough AsyncEngine for run_once: begin() yields a dummy connection."""
+
+    def __init__(self):
+        self.transactions = 0
+
+    @contextlib.asynccontextmanager
+    async def begin(self):
+        self.transactions += 1
+        yield object()
+
+
+@pytest.mark.asyncio
+async def test_run_once_reports_and_survives_one_table_failing(monkeypatch, caplog):
+    async def ensure(conn, table, interval, now, horizon):
+        if table == "audit_logs":
+            raise RuntimeError("lock timeout")
+        return [f"{table}_p202701"]
+
+    async def expire(conn, table, cutoff, detach_only):
+        assert cutoff == NOW - timedelta(days=365) and detach_only
+        return [f"{table}_p202511"]
+
+    monkeypatch.setattr(partitions, "ensure_partitions", ensure)
+    monkeypatch.setattr(partitions, "expire_partitions", expire)
+    caplog.set_level(logging.INFO)  # The summary line must be emitted, not filtered out.
+    engine = _StubEngine()
+    maintainer = PartitionMaintainer(engine, retention_days={"incidents": 365, "audit_logs": 30})
+
+    report = await maintainer.run_once(NOW)
+
+    assert report == {"created": ["incidents_p202701"], "expired": ["incidents_p202511"], "failed": ["audit_logs"]}
+    assert engine.transactions == 2
+    assert maintainer.failures == 1
+    assert maintainer.last_run == {"at": NOW.isoformat(), **report}
+    assert maintainer.stats()["last_run"] == maintainer.last_run
+    summary = next(r for r in caplog.records if r.getMessage() == "Partition maintenance")
+    assert summary.partitions_created == ["incidents_p202701"] and summary.tables_failed == ["audit_logs"]
+
+
+def _plan(status="EXECUTED"):
+    diagnosis = Diagnosis(alert_id="a", root_cause="r", confidence=0.9, suggested_actions=[])
+    return RemediationPlan(
+        diagnosis=diagnosis, action_type=ActionType.RESTART_SERVICE,
+        risk_level=RiskLevel.SAFE, requires_approval=False, status=status,
+    )
+
+
+async def _seed(session_factory, ages_days):
+    """One incident from web-01 with one executed plan per age."""
+    async with session_factory() as session:
+        for age in ages_days:
+            incident = Incident(
+                alert_id="a", source="web-01", severity=AlertSeverity.WARNING, message="m",
+                created_at=datetime.now(timezone.utc) - timedelta(days=age),
+            )
+            await IncidentRepository(session).save(incident)
+            await PlanRepository(session).save(_plan(), incident.id)
+        await session.commit()
+
+
+@pytest.mark.asyncio
+async def test_plan_history_is_bounded_by_since():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    await _seed(session_factory, [1, 10, 200])
+    since = datetime.now(timezone.utc) - timedelta(days=30)
+
+    async with session_factory() as session:
+        repo = PlanRepository(session)
+        assert len(await repo.get_past_executed_for_source("web-01")) == 3
+        assert len(await repo.get_past_executed_for_source("web-01", since=since)) == 2
+        assert len(await repo.get_executed_with_source(since=since)) == 2
+    await engine.dispose()
+
+
+# -- PostgreSQL: migration, pruning and expiry -----------------------------
+
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+
+
+def _migrate(revision: str) -> None:
+    from alembic import command
+    from alembic.config import Config
+
+    config = Config(os.path.join(ROOT, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(ROOT, "alembic"))
+    config.set_main_option("sqlalchemy.url", POSTGRES_URL)
+    if revision == "head":
+        command.upgrade(config, "head")
+    else:
+        command.downgrade(config, revision)
+
+
+@requires_postgres
+def test_postgres_partitioning_prunes_and_expires():
+    _migrate("base")
+    _migrate("head")
+    asyncio.run(_check_postgres())
+    _migrate("base")
+
+
+async def _check_postgres():
+    engine = create_async_engine(POSTGRES_URL)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    now = datetime.now(timezone.utc)
+    maintainer = PartitionMaintainer(engine, interval="month", precreate=2)
+    await maintainer.run_once(now)
+    await maintainer.run_once(now - timedelta(days=400))  # Partitions for old rows.
+    assert maintainer.failures == 0 and maintainer.last_run["at"] == (now - timedelta(days=400)).isoformat()
+    await _seed(session_factory, [1, 400])
+
+    async with engine.connect() as conn:
+        plan = (await conn.execute(
+            text("EXPLAIN SELECT id FROM incidents WHERE created_at >= :cutoff"),
+            {"cutoff": now - timedelta(days=7)},
+        )).scalars().all()
+    current = partition_name("incidents", floor_bound(now, "month"), "month")
+    assert any(current in line for line in plan)
+    old = partition_name("incidents", floor_bound(now - timedelta(days=400), "month"), "month")
+    assert not any(old in line for line in plan), plan
+
+    async with session_factory() as session:
+        assert len(await IncidentRepository(session).get_since(now - timedelta(days=7))) == 1
+
+    # A row beyond the pre-created range lands in DEFAULT; its partition takes it over.
+    future = now + timedelta(days=400)
+    await _seed(session_factory, [-400])
+    await maintainer.run_once(future)
+    async with engine.connect() as conn:
+        homes = (await conn.execute(
+            text("SELECT tableoid::regclass::text FROM incidents WHERE created_at >= :start"),
+            {"start": floor_bound(future, "month")},
+        )).scalars().all()
+    assert homes == [partition_name("incidents", floor_bound(future, "month"), "month")]
+
+    maintainer = PartitionMaintainer(
+        engine, interval="month", precreate=2, retention_days={"incidents": 365}, detach_only=False
+    )
+    report = await maintainer.run_once(now)
+    assert old in report["expired"]
+    async with session_factory() as session:
+        assert len(await PlanRepository(session).get_past_executed_for_source("web-01")) == 2
+    await engine.dispose()
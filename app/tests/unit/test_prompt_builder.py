@@ -0,0 +1,88 @@
+from datetime import datetime, timedelta, timezone
+
+from app.core.entities import (
+    ActionType, Alert, AlertSeverity, Diagnosis, EnrichedContext, Incident, RemediationPlan, RiskLevel,
+)
+from app.modules.analysis.prompt import PromptBuilder, estimate_tokens
+
+_NOW = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _incident(source, message, minutes_ago=0, severity=AlertSeverity.CRITICAL):
+    return Incident(
+        alert_id="x", source=source, severity=severity, message=message,
+        status="CLOSED", created_at=_NOW - timedelta(minutes=minutes_ago),
+    )
+
+
+def _plan(root_cause, action=ActionType.RESTART_SERVICE):
+    diagnosis = Diagnosis(alert_id="x", root_cause=root_cause, confidence=0.9, suggested_actions=[action])
+    return RemediationPlan(
+        diagnosis=diagnosis, action_type=action, risk_level=RiskLevel.SAFE,
+        requires_approval=False, status="EXECUTED",
+    )
+
+
+def _context(incidents=(), plans=()):
+    alert = Alert(
+        source="web-01", severity=AlertSeverity.CRITICAL, message="High CPU usage",
+        metadata={"region": "eu", "cpu_usage": 97},
+    )
+    return EnrichedContext(
+        alert=alert, recent_similar_incidents=list(incidents), past_remediations_for_source=list(plans)
+    )
+
+
+def test_repeated_history_is_collapsed_and_ranked():
+    incidents = [_incident("web-01", "High CPU usage", i) for i in range(5)]
+    incidents += [_incident("db-01", "Disk full"), _incident("web-01", "High  cpu usage spike", 1)]
+    plans = [_plan("CPU saturation")] * 3 + [_plan("Cache bloat", ActionType.CLEAR_CACHE)]
+
+    section, omitted = PromptBuilder().alert_section(_context(incidents, plans))
+
+    assert omitted == 0
+    assert "Metadata: cpu_usage=97, region=eu" in section
+    lines = [line.strip() for line in section.splitlines() if line.strip().startswith("- ")]
+    assert lines[0] == "- 5x [CLOSED] web-01: High CPU usage (severity=CRITICAL)"
+    assert lines[-3].endswith("db-01: Disk full (severity=CRITICAL)")
+    assert lines[-2] == "- 3x [EXECUTED] RESTART_SERVICE: CPU saturation"
+
+
+def test_budget_truncates_deterministically():
+    incidents = [_incident(f"web-{i:02d}", f"High CPU usage variant {i}", i) for i in range(200)]
+    builder = PromptBuilder(section_token_budget=300)
+
+    first, omitted = builder.alert_section(_context(incidents, [_plan("CPU saturation")]))
+    again, _ = builder.alert_section(_context(list(reversed(incidents)), [_plan("CPU saturation")]))
+
+    assert estimate_tokens(first) <= 300
+    assert omitted > 150
+    assert f"(+{omitted} more omitted)" in first
+    assert "RESTART_SERVICE: CPU saturation" in first  # Remediations keep their share.
+    assert first == again
+
+
+def test_large_alert_metadata_stays_within_budget():
+    context = _context([_incident("web-01", "High CPU usage")], [_plan("CPU saturation")])
+    context.alert.metadata = {f"label_{i:04d}": "x" * 500 for i in range(2000)}
+    context.alert.message = "High CPU usage " * 1000
+    builder = PromptBuilder(section_token_budget=400)
+
+    section, _ = builder.alert_section(context)
+
+    assert estimate_tokens(section) <= 400
+    assert "Metadata: label_0000=" in section
+    assert "more keys)" in section
+    assert "RESTART_SERVICE: CPU saturation" in section  # History still gets its share.
+
+
+def test_static_prefix_is_identical_across_calls():
+    builder = PromptBuilder()
+
+    single = builder.build(_context())
+    batch = builder.build_batch([_context(), _context([_incident("web-01", "x")])])
+
+    assert single.messages[0] is batch.messages[0]
+    assert single.messages[0].content[0]["cache_control"] == {"type": "ephemeral"}
+    assert "=== ALERT [1] ===" in batch.messages[1].content
+    assert single.tokens > 0 and single.build_seconds >= 0
@@ -0,0 +1,150 @@
+"""Tests for the LLM circuit breaker and adaptive rate limiter."""
+import asyncio
+
+import pytest
+
+from app.core.entities import Alert, AlertSeverity, EnrichedContext
+from app.modules.analysis import LLMAnalyzer, RuleBasedAnalyzer
+from app.modules.analysis.resilience import AdaptiveRateLimiter, CircuitBreaker, CircuitState
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_breaker_opens_on_error_rate_and_recovers_through_half_open():
+    clock = _Clock()
+    breaker = CircuitBreaker(window_size=4, min_calls=4, failure_rate_threshold=0.5, open_seconds=30, clock=clock)
+    for failed in (False, True, False, True):
+        assert breaker.allow()
+        (breaker.record_failure if failed else breaker.record_success)(0.1)
+
+    assert breaker.state is CircuitState.OPEN
+    assert breaker.allow() is False
+
+    clock.now = 31
+    assert breaker.state is CircuitState.HALF_OPEN
+    assert breaker.allow() is True
+    assert breaker.allow() is False  # Only one probe at a time.
+    breaker.record_success(0.1)
+    assert breaker.state is CircuitState.CLOSED
+
+
+def test_breaker_opens_on_slow_calls():
+    breaker = CircuitBreaker(window_size=3, min_calls=3, slow_call_seconds=1.0, slow_call_rate_threshold=0.6)
+    for _ in range(3):
+        breaker.record_success(2.0)
+
+    assert breaker.state is CircuitState.OPEN
+
+
+@pytest.mark.asyncio
+async def test_limiter_caps_concurrency_and_backs_off_on_429():
+    limiter = AdaptiveRateLimiter(max_concurrency=2, rate_per_second=1000)
+    peak = 0
+
+    async def call():
+        nonlocal peak
+        async with limiter.slot():
+            peak = max(peak, limiter.stats()["in_flight"])
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(*(call() for _ in range(6)))
+    assert peak == 2
+
+    limiter.on_throttled()
+    assert limiter.stats()["rate_per_second"] == 500
+    limiter.on_success()
+    assert limiter.stats()["rate_per_second"] == 500.1
+
+
+class _RateLimitError(Exception):
+    status_code = 429
+
+
+class _FailingModel:
+    def __init__(self):
+        self.calls = 0
+
+    def with_structured_output(self, schema, include_raw=False):
+        return self
+
+    async def ainvoke(self, messages):
+        self.calls += 1
+        raise _RateLimitError("too many requests")
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_skips_llm_and_429_slows_limiter():
+    model = _FailingModel()
+    limiter = AdaptiveRateLimiter(rate_per_second=1000)
+    analyzer = LLMAnalyzer(
+        api_key="test",
+        model="test",
+        fallback_analyzer=RuleBasedAnalyzer(),
+        llm=model,
+        breaker=CircuitBreaker(window_size=2, min_calls=2),
+        limiter=limiter,
+    )
+    for i in range(4):
+        context = EnrichedContext(
+            alert=Alert(source=f"web-{i}", severity=AlertSeverity.WARNING, message="High CPU")
+        )
+        result = await analyzer.analyze(context)
+
+    assert model.calls == 2
+    assert result.analysis_path == "rule_circuit_open"
+    assert analyzer.stats()["breaker"]["state"] == "OPEN"
+    assert limiter.stats()["throttled"] == 2
+
+
+class _HangingModel:
+    def __init__(self):
+        self.calls = 0
+        self.started = asyncio.Event()
+
+    def with_structured_output(self, schema, include_raw=False):
+        return self
+
+    async def ainvoke(self, messages):
+        self.calls += 1
+        self.started.set()
+        await asyncio.Event().wait()
+
+
+@pytest.mark.asyncio
+async def test_half_open_rejections_are_circuit_open_and_cancelled_probe_frees_its_slot():
+    clock = _Clock()
+    breaker = CircuitBreaker(window_size=2, min_calls=2, open_seconds=30, clock=clock)
+    for _ in range(2):
+        breaker.record_failure(0.1)
+    clock.now += 31
+    model = _HangingModel()
+    analyzer = LLMAnalyzer(
+        api_key="test", model="test", fallback_analyzer=RuleBasedAnalyzer(), llm=model, breaker=breaker
+    )
+
+    def context(source):
+        return EnrichedContext(alert=Alert(source=source, severity=AlertSeverity.WARNING, message="High CPU"))
+
+    probe = asyncio.ensure_future(analyzer.analyze(context("web-0")))
+    await model.started.wait()
+    assert breaker.state is CircuitState.HALF_OPEN and breaker.rejecting()
+
+    result = await analyzer.analyze(context("web-1"))
+    assert result.analysis_path == "rule_circuit_open"
+    assert model.calls == 1
+    assert analyzer.stats()["paths"].get("rule_fallback", 0) == 0
+
+    # The shared call is shielded from its callers; cancel it as shutdown would.
+    for task in list(analyzer._inflight.values()):
+        task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await probe
+    assert breaker.state is CircuitState.HALF_OPEN
+    assert not breaker.rejecting()  # The cancelled probe gave its slot back.
+    assert breaker.allow()
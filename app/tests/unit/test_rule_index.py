@@ -0,0 +1,77 @@
+import json
+
+import pytest
+
+from app.bench.rules import synthetic_rules
+from app.core.entities import ActionType, Alert, AlertSeverity, EnrichedContext
+from app.modules.analysis.compiled import CompiledRuleSet, KeywordAutomaton
+from app.modules.analysis.engine import RuleBasedAnalyzer
+from app.modules.analysis.rules import COMMON_RULES, DeclarativeRule, MetadataCondition, Rule
+
+
+def _alert(message="High CPU usage", source="web-01", severity=AlertSeverity.CRITICAL, **metadata):
+    return Alert(source=source, severity=severity, message=message, metadata=metadata)
+
+
+def test_automaton_reports_overlapping_keywords():
+    automaton = KeywordAutomaton([("he", 0), ("she", 1), ("hers", 2), ("his", 3)])
+
+    assert automaton.search("ushers") == {0, 1, 2}
+    assert automaton.search("this") == {3}
+    assert automaton.search("nothing") == set()
+
+
+def test_compiled_set_keeps_first_match_order():
+    late_keyword = DeclarativeRule("keyword", "k", [ActionType.NOTIFICATION], keywords=["cpu"])
+    early_source = DeclarativeRule(
+        "source", "s", [ActionType.NOTIFICATION],
+        sources=["web-01"], metadata=[MetadataCondition("cpu_usage", ">=", 90)],
+    )
+    opaque = Rule("lambda", lambda a: a.source.startswith("db"), "l", [ActionType.NOTIFICATION])
+    compiled = CompiledRuleSet([opaque, early_source, late_keyword])
+
+    assert compiled.match(_alert(cpu_usage=95)).name == "source"
+    assert compiled.match(_alert(cpu_usage=10)).name == "keyword"
+    assert compiled.match(_alert(source="db-01")).name == "lambda"
+    assert compiled.match(_alert(message="all good", source="web-02")) is None
+
+
+def test_compiled_set_agrees_with_linear_scan():
+    rules = synthetic_rules(500) + list(COMMON_RULES)
+    compiled = CompiledRuleSet(rules)
+    alerts = [
+        _alert("svc10-err on checkout"),
+        _alert("nothing", source="host-7", cpu_usage=99),
+        _alert("nothing", severity=AlertSeverity.WARNING, error_code=10008),
+        _alert("JOB9 failed after 3 retries"),
+        _alert("job9 failed"),
+        _alert("Disk space low", mount="/var"),
+    ]
+
+    for alert in alerts:
+        linear = next((rule for rule in rules if rule.match(alert)), None)
+        assert compiled.match(alert) is linear
+
+
+def _write_rules(path, rules):
+    path.write_text(json.dumps(rules))
+
+
+@pytest.mark.asyncio
+async def test_rules_file_hot_reload_swaps_atomically_and_survives_bad_edits(tmp_path):
+    path = tmp_path / "rules.json"
+    _write_rules(path, [{"name": "Timeouts", "keywords": ["timeout"], "root_cause": "Upstream slow", "actions": ["NOTIFICATION"]}])
+    clock = [0.0]
+    analyzer = RuleBasedAnalyzer(rules_path=str(path), reload_interval_seconds=5, clock=lambda: clock[0])
+    context = EnrichedContext(alert=_alert("Gateway timeout"))
+
+    assert (await analyzer.analyze(context)).root_cause == "Upstream slow"
+
+    _write_rules(path, [{"name": "Timeouts v2", "keywords": ["timeout"], "root_cause": "Upstream very slow", "actions": ["SCALE_UP"]}])
+    assert (await analyzer.analyze(context)).root_cause == "Upstream slow"  # Not re-checked yet.
+    clock[0] = 6.0
+    assert (await analyzer.analyze(context)).root_cause == "Upstream very slow"
+
+    path.write_text("[{not json")
+    assert analyzer.reload() is False
+    assert analyzer.rules[0].name == "Timeouts v2"
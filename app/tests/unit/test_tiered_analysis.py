@@ -0,0 +1,100 @@
+import pytest
+
+from app.core.entities import ActionType, Alert, AlertSeverity, Diagnosis, EnrichedContext, Incident
+from app.modules.analysis import EscalationPolicy, RuleBasedAnalyzer, TieredAnalyzer
+from app.modules.analysis.rules import DeclarativeRule
+
+
+class _RecordingLLM:
+    def __init__(self):
+        self.contexts = []
+
+    async def analyze(self, context):
+        self.contexts.append(context)
+        return Diagnosis(
+            alert_id=context.alert.id,
+            root_cause="llm",
+            confidence=0.8,
+            suggested_actions=[ActionType.NOTIFICATION],
+            analysis_path="llm",
+        )
+
+
+_RULES = [
+    DeclarativeRule("High CPU", "CPU saturation", [ActionType.SCALE_UP], keywords=["cpu"]),
+    DeclarativeRule("Flaky", "Maybe disk", [ActionType.NOTIFICATION], keywords=["disk"], confidence=0.6),
+]
+
+
+def _context(message, severity=AlertSeverity.CRITICAL, history=0):
+    alert = Alert(source="web-01", severity=severity, message=message)
+    incidents = [
+        Incident(alert_id=str(i), source="web-01", severity=severity, message=message) for i in range(history)
+    ]
+    return EnrichedContext(alert=alert, recent_similar_incidents=incidents)
+
+
+def _tiered(**policy):
+    llm = _RecordingLLM()
+    policy.setdefault("min_confidence", {"CRITICAL": 0.9, "INFO": 0.5})
+    return TieredAnalyzer(RuleBasedAnalyzer(rules=_RULES), llm, EscalationPolicy(**policy)), llm
+
+
+@pytest.mark.asyncio
+async def test_deterministic_match_skips_llm():
+    tiered, llm = _tiered()
+
+    diagnosis = await tiered.analyze(_context("High CPU usage"))
+
+    assert diagnosis.analysis_path == "rule_tier"
+    assert diagnosis.root_cause == "CPU saturation"
+    assert llm.contexts == []
+
+
+@pytest.mark.asyncio
+async def test_unmatched_and_low_confidence_alerts_escalate_with_reason():
+    tiered, llm = _tiered()
+
+    unmatched = await tiered.analyze(_context("Something odd"))
+    low = await tiered.analyze(_context("disk errors"))
+    info = await tiered.analyze(_context("disk errors", severity=AlertSeverity.INFO))
+
+    assert unmatched.analysis_path == "llm" and low.analysis_path == "llm"
+    assert [c.escalation_reason for c in llm.contexts] == ["no_rule_match", "low_confidence"]
+    assert info.analysis_path == "rule_tier"
+    assert tiered.stats() == {
+        "decided_by": {"llm": 2, "rule": 1},
+        "escalations": {"no_rule_match": 1, "low_confidence": 1},
+    }
+
+
+@pytest.mark.asyncio
+async def test_recurrence_and_rule_lists():
+    tiered, llm = _tiered(recurrence_threshold=2, authoritative_rules=["Flaky"])
+
+    recurring = await tiered.analyze(_context("High CPU usage", history=2))
+    trusted = await tiered.analyze(_context("disk errors", history=5))
+
+    assert recurring.analysis_path == "llm"
+    assert llm.contexts[0].escalation_reason == "recurrence"
+    assert trusted.analysis_path == "rule_tier"
+
+    tiered, llm = _tiered(escalate_rules=["High CPU"])
+    await tiered.analyze(_context("High CPU usage"))
+    assert llm.contexts[0].escalation_reason == "rule_policy"
+
+
+@pytest.mark.asyncio
+async def test_recurrence_counts_only_the_alerts_own_source():
+    tiered, llm = _tiered(recurrence_threshold=2)
+    context = _context("High CPU usage", history=1)
+    # Same severity from other sources: matched by get_recent_similar, but not a recurrence here.
+    context.recent_similar_incidents += [
+        Incident(alert_id=f"o{i}", source=f"db-0{i}", severity=AlertSeverity.CRITICAL, message="m")
+        for i in range(5)
+    ]
+
+    diagnosis = await tiered.analyze(context)
+
+    assert diagnosis.analysis_path == "rule_tier"
+    assert llm.contexts == []
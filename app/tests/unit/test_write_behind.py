@@ -0,0 +1,147 @@
+import asyncio
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.entities import (
+    ActionType,
+    AlertSeverity,
+    AuditLog,
+    Diagnosis,
+    Incident,
+    RemediationPlan,
+    RiskLevel,
+)
+from app.infrastructure.database.models import AuditLogModel, Base, IncidentModel, RemediationPlanModel
+from app.infrastructure.database.repositories import PlanRepository
+from app.infrastructure.database.write_behind import WriteBehindPersister
+
+
+@pytest_asyncio.fixture
+async def session_factory():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    await engine.dispose()
+
+
+def _incident(source="web-01"):
+    return Incident(alert_id="a", source=source, severity=AlertSeverity.CRITICAL, message="m", status="CLOSED")
+
+
+def _plan():
+    diagnosis = Diagnosis(alert_id="a", root_cause="r", confidence=0.9, suggested_actions=[])
+    return RemediationPlan(
+        diagnosis=diagnosis, action_type=ActionType.RESTART_SERVICE,
+        risk_level=RiskLevel.SAFE, requires_approval=False, status="EXECUTED",
+    )
+
+
+async def _count(session_factory, model):
+    async with session_factory() as session:
+        return (await session.execute(select(func.count()).select_from(model))).scalar_one()
+
+
+@pytest.mark.asyncio
+async def test_records_are_written_in_batched_transactions(session_factory):
+    flushed = []
+    persister = WriteBehindPersister(
+        session_factory, max_batch=4, on_flushed=lambda incidents, plans: flushed.append((incidents, plans))
+    )
+    for index in range(3):
+        incident = _incident(f"web-0{index}")
+        await persister.add_incident(incident)
+        await persister.add_plan(_plan(), incident.id, incident.source)
+    await persister.log_event(AuditLog(component="test", event="e", details={}))
+
+    assert await _count(session_factory, IncidentModel) == 0  # Nothing written on the hot path.
+    await persister.flush()
+
+    assert await _count(session_factory, IncidentModel) == 3
+    assert await _count(session_factory, RemediationPlanModel) == 3
+    assert await _count(session_factory, AuditLogModel) == 1
+    assert persister.stats()["flushes"] == 2  # 7 records, max_batch=4.
+    assert [len(incidents) for incidents, _ in flushed] == [2, 1]
+    assert [source for _, plans in flushed for source, _ in plans] == ["web-00", "web-01", "web-02"]
+    async with session_factory() as session:
+        assert len(await PlanRepository(session).get_past_executed_for_source("web-02")) == 1
+
+
+@pytest.mark.asyncio
+async def test_background_flush_on_interval_and_close(session_factory):
+    persister = WriteBehindPersister(session_factory, max_batch=100, flush_interval_seconds=0.01)
+    persister.start()
+    await persister.add_incident(_incident())
+    await asyncio.sleep(0.1)
+    assert await _count(session_factory, IncidentModel) == 1
+
+    persister.flush_interval_seconds = 60
+    await asyncio.sleep(0.02)  # Let the flusher pick up the longer interval.
+    await persister.add_incident(_incident())
+    await persister.close()
+    assert await _count(session_factory, IncidentModel) == 2
+
+
+@pytest.mark.asyncio
+async def test_unreachable_database_pauses_flushes_and_keeps_records(session_factory):
+    database = {"up": False, "attempts": 0}
+
+    def factory():
+        database["attempts"] += 1
+        if not database["up"]:
+            raise ConnectionError("db down")
+        return session_factory()
+
+    persister = WriteBehindPersister(factory, retry_backoff_seconds=60)
+    incident = _incident()
+    await persister.add_incident(incident)
+    await persister.add_plan(_plan(), incident.id, incident.source)
+    await persister.flush()
+    await persister.flush()  # Breaker open: the database is not tried again.
+
+    assert database["attempts"] == 1
+    assert persister.stats()["buffered"] == 2 and persister.stats()["breaker_open"] is True
+    assert persister.stats()["dropped"] == 0
+
+    database["up"] = True
+    await persister.close()  # Shutdown tries once more regardless of the breaker.
+    assert await _count(session_factory, IncidentModel) == 1
+    assert await _count(session_factory, RemediationPlanModel) == 1
+
+
+@pytest.mark.asyncio
+async def test_full_buffer_drops_oldest_without_waiting(session_factory):
+    persister = WriteBehindPersister(session_factory, max_batch=100, max_buffer=3, flush_interval_seconds=60)
+    first, second = _incident("web-01"), _incident("web-02")
+    await persister.add_incident(first)
+    await persister.add_plan(_plan(), first.id, first.source)
+    await persister.add_incident(second)
+    await persister.add_plan(_plan(), second.id, second.source)  # Pushes out the first incident.
+
+    await persister.flush()
+
+    stats = persister.stats()
+    assert stats["overflowed"] == 1 and stats["dropped"] == 1  # The first incident's plan goes with it.
+    assert await _count(session_factory, IncidentModel) == 1
+    assert await _count(session_factory, RemediationPlanModel) == 1
+
+
+@pytest.mark.asyncio
+async def test_rejected_table_drops_only_its_records_and_dependent_plans(session_factory):
+    persister = WriteBehindPersister(session_factory)
+    existing = _incident()
+    await persister.add_incident(existing)
+    await persister.flush()
+
+    await persister.add_incident(existing)  # Duplicate primary key: the incidents insert fails.
+    await persister.add_plan(_plan(), existing.id, existing.source)
+    await persister.log_event(AuditLog(component="test", event="e", details={}))
+    await persister.flush()
+
+    assert persister.stats()["dropped"] == 2
+    assert await _count(session_factory, IncidentModel) == 1
+    assert await _count(session_factory, RemediationPlanModel) == 0
+    assert await _count(session_factory, AuditLogModel) == 1